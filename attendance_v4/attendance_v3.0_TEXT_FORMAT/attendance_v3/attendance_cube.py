@@ -0,0 +1,218 @@
+"""
+근태 자동 입력 v3.0 - 출퇴근 큐브
+전체 이력을 [날짜, 직원] int16 배열(출근/퇴근 분)로 한 번만 펼쳐 두고,
+엔진/패턴 분석/시뮬레이션은 날짜 행·직원 열을 복사 없이(view) 읽음
+
+값은 근무일자 자정 기준 분 (야간 퇴근은 1440 이상, 전날 밤 출근은 음수), 없으면 MISSING.
+.npy 파일로 저장하고 memmap으로 불러와 여러 프로세스가 같은 파일을 공유할 수 있음.
+"""
+import os
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from models import WorkPattern, normalize_name
+from config import COL_DATE, COL_NAME, COL_IN_TIME, COL_OUT_TIME, CUBE_DIR, LOOKBACK_INCLUDE_OFF_DAYS
+
+MISSING = np.iinfo(np.int16).min  # 기록 없음
+
+# 저장 파일 (CUBE_DIR 안)
+_ARRAYS = ("check_in", "check_out", "present", "dates")
+_NAMES_FILE = "names.txt"
+
+
+class AttendanceCube:
+    """날짜 × 직원 출퇴근 큐브"""
+
+    def __init__(
+        self,
+        dates: np.ndarray,
+        names: List[str],
+        check_in: np.ndarray,
+        check_out: np.ndarray,
+        present: np.ndarray
+    ):
+        """
+        초기화
+
+        Args:
+            dates: 날짜 축 (datetime64[D], 하루 간격으로 연속)
+            names: 직원 축 (정규화 이름별 대표 이름)
+            check_in: [날짜, 직원] 출근 분 (int16, 없으면 MISSING)
+            check_out: [날짜, 직원] 퇴근 분 (int16, 없으면 MISSING)
+            present: [날짜, 직원] 원시 데이터에 행이 있는지 (bool)
+        """
+        self.dates = dates
+        self.names = list(names)
+        self.check_in = check_in
+        self.check_out = check_out
+        self.present = present
+        self.employees: Dict[str, int] = {normalize_name(name): i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def from_history(cls, history: pd.DataFrame) -> "AttendanceCube":
+        """
+        정규화된 이력으로 큐브 생성 (같은 날짜/직원이 여러 행이면 마지막 행)
+
+        Args:
+            history: DataAnalyzer.normalize_history() 결과
+        """
+        days = history[COL_DATE].to_numpy(dtype="datetime64[D]")
+        if len(days) == 0:
+            empty = np.empty((0, 0), dtype=np.int16)
+            return cls(np.empty(0, dtype="datetime64[D]"), [], empty, empty.copy(), np.empty((0, 0), dtype=bool))
+
+        first = days.min()
+        dates = np.arange(first, days.max() + 1)
+        rows = (days - first).astype(np.int64)
+
+        keys = history[COL_NAME].map(normalize_name)
+        cols, uniques = pd.factorize(keys)
+        first_names = history[COL_NAME].groupby(cols).first()
+        names = [first_names[i] for i in range(len(uniques))]
+
+        shape = (len(dates), len(names))
+        check_in = np.full(shape, MISSING, dtype=np.int16)
+        check_out = np.full(shape, MISSING, dtype=np.int16)
+        present = np.zeros(shape, dtype=bool)
+
+        # 마지막 행 우선 (뒤에서부터 처음 나온 위치만)
+        flat = rows * len(names) + cols
+        _, last = np.unique(flat[::-1], return_index=True)
+        last = len(flat) - 1 - last
+        r, c = rows[last], cols[last]
+
+        midnight = days[last].astype("datetime64[m]")
+        present[r, c] = True
+        check_in[r, c] = _offsets(history[COL_IN_TIME].to_numpy(dtype="datetime64[m]")[last], midnight)
+        check_out[r, c] = _offsets(history[COL_OUT_TIME].to_numpy(dtype="datetime64[m]")[last], midnight)
+
+        return cls(dates, names, check_in, check_out, present)
+
+    @classmethod
+    def load(cls, path: str = CUBE_DIR, mmap: bool = True) -> "AttendanceCube":
+        """
+        저장된 큐브 불러오기
+
+        Args:
+            path: save()로 저장한 폴더
+            mmap: True면 memmap (읽기 전용, 필요한 부분만 디스크에서 읽음)
+        """
+        mode = "r" if mmap else None
+        arrays = {key: np.load(os.path.join(path, key + ".npy"), mmap_mode=mode) for key in _ARRAYS}
+        with open(os.path.join(path, _NAMES_FILE), encoding="utf-8") as f:
+            names = [line.rstrip("\n") for line in f]
+
+        return cls(arrays["dates"], names, arrays["check_in"], arrays["check_out"], arrays["present"])
+
+    def save(self, path: str = CUBE_DIR):
+        """
+        .npy 파일로 저장 (폴더 단위)
+
+        Args:
+            path: 저장 폴더
+        """
+        os.makedirs(path, exist_ok=True)
+        for key in _ARRAYS:
+            np.save(os.path.join(path, key + ".npy"), getattr(self, key))
+        with open(os.path.join(path, _NAMES_FILE), "w", encoding="utf-8") as f:
+            f.writelines(name + "\n" for name in self.names)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def day_index(self, target_date: date) -> Optional[int]:
+        """날짜 → 행 번호 (범위 밖이면 None)"""
+        if len(self.dates) == 0:
+            return None
+        i = int((np.datetime64(target_date, "D") - self.dates[0]).astype(np.int64))
+        return i if 0 <= i < len(self.dates) else None
+
+    def day(self, target_date: date) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        하루치 행 (복사 없음)
+
+        Returns:
+            (present, check_in, check_out) - 범위 밖 날짜는 빈 기록
+        """
+        i = self.day_index(target_date)
+        if i is None:
+            n = len(self.names)
+            return np.zeros(n, dtype=bool), np.full(n, MISSING, dtype=np.int16), np.full(n, MISSING, dtype=np.int16)
+        return self.present[i], self.check_in[i], self.check_out[i]
+
+    def employee(self, name: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        직원 한 명의 전체 기간 열 (복사 없음)
+
+        Returns:
+            (check_in, check_out) 또는 None
+        """
+        j = self.employees.get(normalize_name(name))
+        if j is None:
+            return None
+        return self.check_in[:, j], self.check_out[:, j]
+
+    def to_datetime(self, day: int, minutes: np.ndarray) -> np.ndarray:
+        """행 번호 + 분 → datetime64[m] (MISSING은 NaT)"""
+        base = self.dates[day].astype("datetime64[m]")
+        values = base + minutes.astype("timedelta64[m]")
+        return np.where(minutes == MISSING, np.datetime64("NaT", "m"), values)
+
+    def window(
+        self,
+        base_date: date,
+        pattern: WorkPattern,
+        workdays: int,
+        include_off_days: bool = LOOKBACK_INCLUDE_OFF_DAYS
+    ) -> List[int]:
+        """
+        이전 근무일 N일 구간의 행 번호 (가까운 날짜부터)
+
+        기본은 이전 근무일만 (N=1이면 월요일의 전일은 금요일).
+        include_off_days면 N번째 이전 근무일부터 기준 날짜 전날까지의 모든 날짜를 포함한다.
+        (주말/공휴일에 찍힌 야간 퇴근도 놓치지 않기 위해 - 대신 그날 기록이 금요일보다 우선)
+
+        Args:
+            base_date: 기준 날짜
+            pattern: 근무 패턴
+            workdays: 거슬러 올라갈 근무일 수
+            include_off_days: 사이의 주말/공휴일 포함 여부
+        """
+        rows = []
+        found = 0
+        base = np.datetime64(base_date, "D")
+
+        for i in range(1, workdays * 7 + 1):
+            prev = base - np.timedelta64(i, "D")
+            work_day = pattern.is_work_day(prev.astype(date))
+
+            index = self.day_index(prev)
+            if index is not None and (work_day or include_off_days):
+                rows.append(index)
+
+            if work_day:
+                found += 1
+                if found >= workdays:
+                    break
+
+        return rows
+
+    def daily_counts(self) -> Dict[date, int]:
+        """
+        날짜별 출근 인원 (패턴 분석용, 원시 데이터에 행이 있는 날짜만)
+
+        Returns:
+            {날짜: 출근 인원}
+        """
+        counts = (self.check_in != MISSING).sum(axis=1)
+        days = np.flatnonzero(self.present.any(axis=1))
+        return {self.dates[i].astype(date): int(counts[i]) for i in days}
+
+
+def _offsets(values: np.ndarray, midnight: np.ndarray) -> np.ndarray:
+    """datetime64[m] → 근무일 자정 기준 분 (NaT/int16 범위 밖은 MISSING)"""
+    minutes = (values - midnight).astype(np.int64)
+    valid = ~np.isnat(values) & (minutes > MISSING) & (minutes <= np.iinfo(np.int16).max)
+    return np.where(valid, minutes, MISSING).astype(np.int16)
@@ -1,183 +1,414 @@
 """
 근태 자동 입력 v3.0 - 출퇴근 처리 엔진
 """
-from datetime import datetime, date
-from typing import Dict, Tuple
-from models import AttendanceRecord, ProcessResult, WorkPattern
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from models import AttendanceRecord, ProcessResult, WorkPattern, BatchResult, DecisionSet, normalize_name
+from time_format import NO_MINUTE
+from decision_table import pack_mask, TABLE_PATTERN, TABLE_IN, TABLE_OUT, TABLE_DATE
+from attendance_cube import AttendanceCube
+from shift_policy import ShiftPolicyResolver
+from config import MAX_SHIFT_HOURS, NIGHT_CUTOFF_HOUR, LOOKBACK_WORKDAYS
 
 
 class AttendanceEngine:
     """출퇴근 처리 엔진"""
     
-    def __init__(self, pattern: WorkPattern, logger):
+    def __init__(
+        self,
+        pattern: WorkPattern,
+        logger,
+        base_date: date = None,
+        roster=None,
+        night_cutoff_hour: int = NIGHT_CUTOFF_HOUR,
+        policies: ShiftPolicyResolver = None
+    ):
         """
         초기화
         
         Args:
             pattern: 근무 패턴
             logger: 로거
+            base_date: 기준 날짜
+            roster: ShiftRoster (있으면 야간 판단에 근무표 사용)
+            night_cutoff_hour: 이 시각 이후 출근은 야간 근무 (유연 근무 형태)
+            policies: 직원별 근무 형태 (None이면 설정값)
         """
         self.pattern = pattern
         self.logger = logger
+        self.base_date = base_date
+        self.roster = roster
+        self.night_cutoff = night_cutoff_hour * 60
+        self.policies = policies or ShiftPolicyResolver()
+        self._lookup_cache = {}
     
-    def decide_times(
+    def build_previous_map(self, window: List[Dict[str, AttendanceRecord]]) -> Dict[str, AttendanceRecord]:
+        """
+        이전 구간 맵 병합 (날짜별 맵, gather_cube와 같은 규칙)
+        
+        가장 가까운 기록을 전일 기록으로 사용하고,
+        그 기록에 출근이 없으면 퇴근과 짝이 맞는 더 이전 출근을 찾는다.
+        (예: 금요일 야간 출근 + 토요일 퇴근)
+        
+        Args:
+            window: 날짜별 맵 목록 (가까운 날짜부터)
+            
+        Returns:
+            Dict[이름, AttendanceRecord]
+        """
+        max_shift = timedelta(hours=MAX_SHIFT_HOURS)
+        merged = {}
+        
+        for day_map in window:
+            for name, record in day_map.items():
+                if not record.has_check_in() and not record.has_check_out():
+                    continue
+                
+                key = normalize_name(name)
+                current = merged.get(key)
+                
+                if current is None:
+                    merged[key] = AttendanceRecord(
+                        name=name,
+                        date=record.date,
+                        check_in=record.check_in,
+                        check_out=record.check_out,
+                    )
+                elif (
+                    not current.has_check_in()
+                    and current.has_check_out()
+                    and record.has_check_in()
+                    and timedelta(0) < current.check_out - record.check_in <= max_shift
+                ):
+                    current.check_in = record.check_in
+                    current.date = record.date
+        
+        return {record.name: record for record in merged.values()}
+    
+    def _night_flags(self, names: Sequence[str], check_in: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """
+        야간 근무 출근 여부 (일괄)
+        
+        근무표에 해당 출근이 속한 예정 근무가 있으면 자정을 넘기는지로 판단하고,
+        없으면 직원의 근무 형태로 판단한다 (근무 형태별로 묶어서 한 번씩).
+        
+        Args:
+            names: 이름 목록
+            check_in: 출근 시각 (datetime64[m], 없으면 NaT)
+            codes: 근무 형태 번호 (ShiftPolicyResolver.codes)
+            
+        Returns:
+            bool 배열
+        """
+        present = ~np.isnat(check_in)
+        minutes = _minute_of_day(check_in)
+        night = np.zeros(len(present), dtype=bool)
+        
+        for code in np.unique(codes[present]):
+            group = present & (codes == code)
+            night[group] = self.policies.policies[code].is_night(minutes[group], self.night_cutoff)
+        
+        if self.roster:
+            for i in np.flatnonzero(present):
+                flag = self.roster.is_night_shift(names[i], check_in[i].astype(datetime))
+                if flag is not None:
+                    night[i] = flag
+        
+        return night
+    
+    def gather(
         self,
-        name: str,
+        names: Sequence[str],
         today_map: Dict[str, AttendanceRecord],
         yesterday_map: Dict[str, AttendanceRecord]
-    ) -> ProcessResult:
+    ) -> dict:
         """
-        출퇴근 시간 결정
+        이름 목록의 오늘/전일 기록을 배열로 모으기 (decide_batch 입력)
         
         Args:
-            name: 이름
+            names: 이름 목록
             today_map: 오늘 데이터 맵
             yesterday_map: 전일 데이터 맵
             
         Returns:
-            ProcessResult: 처리 결과
+            dict: decide_batch 키워드 인자
         """
-        # 이름 정규화 (공백 제거, 소문자 변환)
-        name_normalized = name.replace(" ", "").lower()
+        today_lookup = self._normalized(today_map)
+        yesterday_lookup = self._normalized(yesterday_map)
         
-        # 오늘/전일 데이터 가져오기 (정규화된 이름으로 매칭)
-        today = None
-        yesterday = None
+        today = [today_lookup.get(normalize_name(name)) for name in names]
+        yesterday = [yesterday_lookup.get(normalize_name(name)) for name in names]
         
-        for key, value in today_map.items():
-            if key.replace(" ", "").lower() == name_normalized:
-                today = value
-                break
+        return {
+            "names": list(names),
+            "cin_today": _times([r.check_in if r else None for r in today]),
+            "cout_today": _times([r.check_out if r else None for r in today]),
+            "cin_yest": _times([r.check_in if r else None for r in yesterday]),
+            "cout_yest": _times([r.check_out if r else None for r in yesterday]),
+            "today_date": _dates([r.date if r else None for r in today]),
+            "yest_date": _dates([r.date if r else None for r in yesterday]),
+            "policy": self.policies.codes(names),
+        }
+    
+    def gather_cube(
+        self,
+        cube: AttendanceCube,
+        base_date: date,
+        names: Sequence[str] = None,
+        workdays: int = LOOKBACK_WORKDAYS
+    ) -> dict:
+        """
+        큐브에서 기준 날짜의 오늘/전일 기록을 배열로 모으기 (decide_batch 입력)
+        
+        build_previous_map과 같은 규칙을 직원 축 전체에 한 번에 적용한다.
+        
+        Args:
+            cube: AttendanceCube
+            base_date: 기준 날짜
+            names: 대상 이름 목록 (없으면 오늘 행이 있거나 이전 구간에 출퇴근이 있는 직원)
+            workdays: 거슬러 올라갈 근무일 수
+            
+        Returns:
+            dict: decide_batch 키워드 인자
+        """
+        max_shift = np.timedelta64(MAX_SHIFT_HOURS * 60, "m")
+        n = len(cube.names)
+        
+        # 마지막 칸은 큐브에 없는 직원용 (항상 NaT, 열 번호 -1)
+        cin_yest = np.full(n + 1, np.datetime64("NaT", "m"))
+        cout_yest = np.full(n + 1, np.datetime64("NaT", "m"))
+        yest_date = np.full(n + 1, np.datetime64("NaT", "D"))
+        found = np.zeros(n + 1, dtype=bool)
+        
+        for day in cube.window(base_date, self.pattern, workdays):
+            cin = _padded(cube.to_datetime(day, cube.check_in[day]))
+            cout = _padded(cube.to_datetime(day, cube.check_out[day]))
+            has_in = ~np.isnat(cin)
+            has_any = has_in | ~np.isnat(cout)
+            
+            # 퇴근만 있는 기록 → 더 이전의 짝이 맞는 출근
+            gap = cout_yest - cin
+            fill = found & np.isnat(cin_yest) & ~np.isnat(cout_yest) & has_in & (gap > np.timedelta64(0, "m")) & (gap <= max_shift)
+            cin_yest[fill] = cin[fill]
+            yest_date[fill] = cube.dates[day]
+            
+            # 가장 가까운 기록
+            new = ~found & has_any
+            cin_yest[new] = cin[new]
+            cout_yest[new] = cout[new]
+            yest_date[new] = cube.dates[day]
+            found |= new
+        
+        day = cube.day_index(base_date)
+        present = np.zeros(n + 1, dtype=bool)
+        cin_today = np.full(n + 1, np.datetime64("NaT", "m"))
+        cout_today = np.full(n + 1, np.datetime64("NaT", "m"))
+        if day is not None:
+            present[:n] = cube.present[day]
+            cin_today[:n] = cube.to_datetime(day, cube.check_in[day])
+            cout_today[:n] = cube.to_datetime(day, cube.check_out[day])
+        today_date = np.where(present, np.datetime64(base_date, "D"), np.datetime64("NaT", "D"))
         
-        for key, value in yesterday_map.items():
-            if key.replace(" ", "").lower() == name_normalized:
-                yesterday = value
-                break
+        if names is None:
+            # 오늘 행이 있는 직원 먼저, 그다음 전일만 있는 직원
+            cols = np.concatenate([np.flatnonzero(present), np.flatnonzero(found & ~present)])
+            names = [cube.names[j] for j in cols]
+        else:
+            cols = np.array([cube.employees.get(normalize_name(name), -1) for name in names], dtype=np.int64)
         
-        # 편의상 변수 추출
-        cin_today = today.check_in if today else None
-        cout_today = today.check_out if today else None
-        cin_yest = yesterday.check_in if yesterday else None
-        cout_yest = yesterday.check_out if yesterday else None
+        return {
+            "names": list(names),
+            "cin_today": cin_today[cols],
+            "cout_today": cout_today[cols],
+            "cin_yest": cin_yest[cols],
+            "cout_yest": cout_yest[cols],
+            "today_date": today_date[cols],
+            "yest_date": yest_date[cols],
+            "policy": self.policies.codes(names),
+        }
+    
+    def _normalized(self, records: Dict[str, AttendanceRecord]) -> Dict[str, AttendanceRecord]:
+        """정규화된 이름 → 기록 (맵별로 한 번만 생성, 첫 번째 일치 우선)"""
+        cached = self._lookup_cache.get(id(records))
+        if cached is None or cached[0] is not records or cached[1] != len(records):
+            lookup = {}
+            for key, value in records.items():
+                lookup.setdefault(normalize_name(key), value)
+            cached = (records, len(records), lookup)
+            self._lookup_cache[id(records)] = cached
+        return cached[2]
+    
+    def decide_batch(
+        self,
+        names: Sequence[str],
+        cin_today: np.ndarray,
+        cout_today: np.ndarray,
+        cin_yest: np.ndarray,
+        cout_yest: np.ndarray,
+        today_date: np.ndarray,
+        yest_date: np.ndarray,
+        policy: np.ndarray = None
+    ) -> BatchResult:
+        """
+        출퇴근 시간 일괄 결정 (전 직원 한 번에)
+        
+        Args:
+            names: 이름 목록
+            cin_today, cout_today: 오늘 출퇴근 (datetime64, 없으면 NaT)
+            cin_yest, cout_yest: 전일 출퇴근 (datetime64, 없으면 NaT)
+            today_date, yest_date: 오늘/전일 기록 날짜 (datetime64[D], 기록 없으면 NaT)
+            policy: 직원별 근무 형태 번호 (결정 기록의 값 등, None이나 범위 밖 번호는 self.policies로)
+            
+        Returns:
+            BatchResult: 출퇴근 분, 기준 날짜, 패턴 코드
+        """
+        cin_today = np.asarray(cin_today, dtype="datetime64[m]")
+        cout_today = np.asarray(cout_today, dtype="datetime64[m]")
+        cin_yest = np.asarray(cin_yest, dtype="datetime64[m]")
+        cout_yest = np.asarray(cout_yest, dtype="datetime64[m]")
+        today_date = np.asarray(today_date, dtype="datetime64[D]")
+        yest_date = np.asarray(yest_date, dtype="datetime64[D]")
+        
+        has_in_t = ~np.isnat(cin_today)
+        has_out_t = ~np.isnat(cout_today)
+        has_in_y = ~np.isnat(cin_yest)
+        has_out_y = ~np.isnat(cout_yest)
+        
+        codes = self.policies.codes(names)
+        if policy is not None:
+            policy = np.asarray(policy, dtype=np.int8)
+            known = (policy >= 0) & (policy < len(self.policies.policies))
+            codes = np.where(known, policy, codes)
+        night_t = self._night_flags(names, cin_today, codes)
+        night_y = self._night_flags(names, cin_yest, codes)
         
         # 퇴근 날짜는 퇴근 시간의 날짜를 사용 (야간 근무 고려)
-        dout_yest = cout_yest.date() if cout_yest else (yesterday.date if yesterday else None)
+        dout_yest = np.where(has_out_y, cout_yest.astype("datetime64[D]"), yest_date)
         
-        # 디버깅
-        self.logger.debug(f"    출퇴근 시간: cin_today={cin_today}, cout_today={cout_today}")
-        self.logger.debug(f"    전일: cin_yest={cin_yest}, cout_yest={cout_yest}")
-        self.logger.debug(f"    퇴근 날짜: dout_yest={dout_yest}")
-        
-        # 케이스별 처리
-        
-        # 케이스 1: 오늘 출근+퇴근 모두 있음
-        if cin_today and cout_today:
-            return ProcessResult(
-                check_in=cin_today.strftime("%H:%M"),
-                check_out=cout_today.strftime("%H:%M"),
-                base_date=today.date,
-                pattern="today_complete"
-            )
-        
-        # 케이스 2: 오늘 출근만 있음 (퇴근 대기 또는 야간)
-        if cin_today and not cout_today:
-            # 오늘 출근이 주간 (0~12시)
-            if cin_today.hour < 12:
-                # 전일 퇴근이 있으면 사용
-                if cout_yest:
-                    return ProcessResult(
-                        check_in=cin_today.strftime("%H:%M"),
-                        check_out=cout_yest.strftime("%H:%M"),
-                        base_date=dout_yest,
-                        pattern="today_checkin_with_prev_checkout"
-                    )
-                else:
-                    # 전일 퇴근 없음 - 출근만
-                    return ProcessResult(
-                        check_in=cin_today.strftime("%H:%M"),
-                        check_out="",
-                        base_date=today.date,
-                        pattern="today_checkin_only"
-                    )
-            else:
-                # 야간 근무 (12시 이후 출근)
-                # 전일 퇴근 사용
-                if cout_yest:
-                    return ProcessResult(
-                        check_in=cin_today.strftime("%H:%M"),
-                        check_out=cout_yest.strftime("%H:%M"),
-                        base_date=dout_yest,
-                        pattern="night_shift"
-                    )
-                else:
-                    return ProcessResult(
-                        check_in=cin_today.strftime("%H:%M"),
-                        check_out="",
-                        base_date=today.date,
-                        pattern="night_shift_no_checkout"
-                    )
+        # 결정표 조회 (조건 6비트 → 패턴/출처)
+        mask = pack_mask(has_in_t, has_out_t, night_t, has_in_y, has_out_y, night_y)
+        pattern = TABLE_PATTERN[mask]
         
-        # 케이스 3: 오늘 퇴근만 있음 (전일 야간 근무)
-        if not cin_today and cout_today:
-            # 전일 출근 사용
-            if cin_yest:
-                return ProcessResult(
-                    check_in=cin_yest.strftime("%H:%M"),
-                    check_out=cout_today.strftime("%H:%M"),
-                    base_date=yesterday.date,
-                    pattern="prev_night_shift"
-                )
-            else:
-                return ProcessResult(
-                    check_in="",
-                    check_out=cout_today.strftime("%H:%M"),
-                    base_date=today.date,
-                    pattern="checkout_only"
-                )
-        
-        # 케이스 4: 오늘 데이터 없음 - 전일 확인
-        if not cin_today and not cout_today:
-            # 전일 출근+퇴근 있음
-            if cin_yest and cout_yest:
-                # 전일이 야간 근무인지 확인 (출근 12시 이후)
-                if cin_yest.hour >= 12:
-                    # 야간 근무자 → 출근+퇴근 모두 사용
-                    return ProcessResult(
-                        check_in=cin_yest.strftime("%H:%M"),
-                        check_out=cout_yest.strftime("%H:%M"),
-                        base_date=dout_yest,
-                        pattern="prev_night_shift_complete"
-                    )
-                else:
-                    # 주간 근무자 → 미출근 (퇴근만 사용)
-                    return ProcessResult(
-                        check_in="",
-                        check_out=cout_yest.strftime("%H:%M"),
-                        base_date=dout_yest,
-                        pattern="absent_with_prev_checkout"
-                    )
+        # 출처 순서는 decision_table의 SRC_*/DATE_* 값과 같음
+        rows = np.arange(len(mask))
+        minutes = np.stack([
+            np.full(len(mask), NO_MINUTE),
+            _minute_of_day(cin_today),
+            _minute_of_day(cout_today),
+            _minute_of_day(cin_yest),
+            _minute_of_day(cout_yest),
+        ])
+        dates = np.stack([
+            np.full(len(mask), np.datetime64("NaT", "D")),
+            today_date,
+            yest_date,
+            dout_yest,
+        ])
+        
+        check_in = minutes[TABLE_IN[mask], rows]
+        check_out = minutes[TABLE_OUT[mask], rows]
+        base_date = dates[TABLE_DATE[mask], rows]
+        
+        return BatchResult(
+            names=list(names),
+            check_in=check_in.astype(np.int16),
+            check_out=check_out.astype(np.int16),
+            base_date=base_date.astype("datetime64[D]"),
+            pattern=pattern,
+        )
+    
+    def decide_all(
+        self,
+        today_map: Dict[str, AttendanceRecord],
+        yesterday_map: Dict[str, AttendanceRecord]
+    ) -> DecisionSet:
+        """
+        오늘/전일 맵에 있는 전 직원의 출퇴근 시간 일괄 결정
+        
+        근태표(여주/SMC)를 열기 전에 한 번만 호출하고, 각 근태표는 결과를 조회만 한다.
+        
+        Args:
+            today_map: 오늘 데이터 맵
+            yesterday_map: 전일 데이터 맵
             
-            # 전일 출근만 있음 → 완전 결근
-            if cin_yest and not cout_yest:
-                return ProcessResult(
-                    check_in="",
-                    check_out="",
-                    base_date=None,
-                    pattern="prev_checkin_only_no_data"
-                )
+        Returns:
+            DecisionSet: 정규화된 이름으로 조회하는 결과
+        """
+        index = {}
+        names = []
+        for name in list(today_map) + list(yesterday_map):
+            key = normalize_name(name)
+            if key not in index:
+                index[key] = len(names)
+                names.append(name)
+        
+        inputs = self.gather(names, today_map, yesterday_map)
+        batch = self.decide_batch(**inputs)
+        
+        return DecisionSet(batch=batch, index=index, base_date=self.base_date, inputs=inputs)
+    
+    def decide_cube(self, cube: AttendanceCube, base_date: date = None) -> DecisionSet:
+        """
+        큐브에서 기준 날짜의 전 직원 출퇴근 시간 일괄 결정 (decide_all과 같은 결과)
+        
+        Args:
+            cube: AttendanceCube
+            base_date: 기준 날짜 (없으면 self.base_date)
             
-            # 전일 데이터 없음 → 완전 결근
-            return ProcessResult(
-                check_in="",
-                check_out="",
-                base_date=None,
-                pattern="no_data"
-            )
-        
-        # 기타 (도달하지 않아야 함)
-        return ProcessResult(
-            check_in="",
-            check_out="",
-            base_date=None,
-            pattern="unknown"
-        )
+        Returns:
+            DecisionSet: 정규화된 이름으로 조회하는 결과
+        """
+        base_date = base_date or self.base_date
+        inputs = self.gather_cube(cube, base_date)
+        batch = self.decide_batch(**inputs)
+        index = {normalize_name(name): i for i, name in enumerate(batch.names)}
+        
+        return DecisionSet(batch=batch, index=index, base_date=base_date, inputs=inputs)
+    
+    def decide_times(
+        self,
+        name: str,
+        today_map: Dict[str, AttendanceRecord],
+        yesterday_map: Dict[str, AttendanceRecord]
+    ) -> ProcessResult:
+        """
+        출퇴근 시간 결정 (decide_batch 한 명 버전)
+        
+        Args:
+            name: 이름
+            today_map: 오늘 데이터 맵
+            yesterday_map: 전일 데이터 맵
+            
+        Returns:
+            ProcessResult: 처리 결과
+        """
+        inputs = self.gather([name], today_map, yesterday_map)
+        
+        # 디버깅
+        self.logger.debug(f"    출퇴근 시간: cin_today={inputs['cin_today'][0]}, cout_today={inputs['cout_today'][0]}")
+        self.logger.debug(f"    전일: cin_yest={inputs['cin_yest'][0]}, cout_yest={inputs['cout_yest'][0]}")
+        
+        return self.decide_batch(**inputs).to_result(0)
+
+
+def _times(values: list) -> np.ndarray:
+    """datetime 목록 → datetime64[m] 배열 (None은 NaT)"""
+    return np.array([np.datetime64(v, "m") if v else np.datetime64("NaT", "m") for v in values], dtype="datetime64[m]")
+
+
+def _dates(values: list) -> np.ndarray:
+    """date 목록 → datetime64[D] 배열 (None은 NaT)"""
+    return np.array([np.datetime64(v, "D") if v else np.datetime64("NaT", "D") for v in values], dtype="datetime64[D]")
+
+
+def _padded(values: np.ndarray) -> np.ndarray:
+    """배열 끝에 NaT 한 칸 추가 (큐브에 없는 직원용)"""
+    return np.append(values, np.datetime64("NaT", "m"))
+
+
+def _minute_of_day(values: np.ndarray) -> np.ndarray:
+    """datetime64[m] → 분 (0~1439, NaT는 NO_MINUTE)"""
+    minutes = (values - values.astype("datetime64[D]")).astype(np.int64)
+    return np.where(np.isnat(values), NO_MINUTE, minutes)
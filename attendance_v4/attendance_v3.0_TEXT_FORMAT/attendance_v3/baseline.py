@@ -0,0 +1,239 @@
+"""
+근태 자동 입력 v3.0 - 개인별 출퇴근 기준선
+직원별 출퇴근 시각(분 단위)의 중앙값/MAD를 최근 N건으로 유지하고,
+새 날짜만 증분 반영 (전체 이력 재계산 없음)
+시각은 원형(하루 = 1440분)으로 다뤄 자정 전후(23:50, 00:10) 기록도 가깝게 봄
+"""
+import json
+import os
+from bisect import bisect_left, insort
+from collections import deque
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+from config import (
+    COL_DATE, COL_NAME, COL_IN_TIME, COL_OUT_TIME,
+    BASELINE_FILE, BASELINE_WINDOW, BASELINE_MIN_SAMPLES, BASELINE_MAD_K, BASELINE_MIN_SPREAD,
+)
+
+
+DAY_MINUTES = 24 * 60
+
+
+class _RollingStats:
+    """최근 N개 값의 중앙값/MAD (정렬 리스트 유지, 하루 단위 원형)"""
+
+    def __init__(self, window: int, values=()):
+        self.window = window
+        self.values = deque()
+        self.sorted = []
+        for value in values:
+            self.add(value)
+
+    def add(self, value: int):
+        """값 추가 (창을 넘으면 가장 오래된 값 제거)"""
+        self.values.append(value)
+        insort(self.sorted, value)
+
+        if len(self.values) > self.window:
+            oldest = self.values.popleft()
+            del self.sorted[bisect_left(self.sorted, oldest)]
+
+    def count(self) -> int:
+        return len(self.sorted)
+
+    def unwrapped(self) -> list:
+        """
+        가장 넓은 빈 구간에서 원을 끊어 펼친 정렬 값
+
+        자정을 걸친 값(23:50, 00:10)은 00:10 → 24:10으로 이어 붙임.
+        빈 구간이 자정에 있으면(보통) 원래 값 그대로.
+        """
+        values = self.sorted
+        if len(values) < 2:
+            return list(values)
+        gaps = [b - a for a, b in zip(values, values[1:])]
+        cut = max(range(len(gaps)), key=gaps.__getitem__) + 1
+        if gaps[cut - 1] <= values[0] + DAY_MINUTES - values[-1]:
+            return list(values)
+        return values[cut:] + [v + DAY_MINUTES for v in values[:cut]]
+
+    def median(self) -> float:
+        """중앙값 (0 ~ 1440분)"""
+        return _median(self.unwrapped()) % DAY_MINUTES
+
+    def mad(self) -> float:
+        values = self.unwrapped()
+        med = _median(values)
+        return _median(sorted(abs(v - med) for v in values))
+
+
+def _median(values) -> float:
+    """정렬된 값의 중앙값"""
+    n = len(values)
+    mid = n // 2
+    return values[mid] if n % 2 else (values[mid - 1] + values[mid]) / 2
+
+
+def circular_distance(a: float, b: float) -> float:
+    """하루 단위 원형 거리 (분) - 23:50과 00:10은 20분"""
+    d = abs(a - b) % DAY_MINUTES
+    return min(d, DAY_MINUTES - d)
+
+
+class PunchBaseline:
+    """개인별 출퇴근 기준선"""
+
+    KINDS = ("in", "out")
+
+    def __init__(self, logger, path: str = BASELINE_FILE, window: int = BASELINE_WINDOW):
+        """
+        초기화
+
+        Args:
+            logger: 로거
+            path: 저장 파일 경로
+            window: 직원별 유지할 최근 기록 수
+        """
+        self.logger = logger
+        self.path = path
+        self.window = window
+        self.last_date: Optional[date] = None
+        self.stats: Dict[str, Dict[str, _RollingStats]] = {}
+        self.rebuilt = False  # 이전 날짜 재실행용으로 다시 계산함 (저장하지 않음)
+
+    def load(self):
+        """저장된 기준선 불러오기 (없으면 빈 상태)"""
+        if not os.path.exists(self.path):
+            self.logger.debug(f"기준선 파일 없음: {self.path}")
+            return
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+
+            self.last_date = datetime.strptime(data["last_date"], "%Y-%m-%d").date() if data.get("last_date") else None
+            self.stats = {
+                key: {kind: _RollingStats(self.window, values.get(kind, [])) for kind in self.KINDS}
+                for key, values in data.get("samples", {}).items()
+            }
+            self.logger.debug(f"기준선 불러오기: {len(self.stats)}명, 마지막 날짜 {self.last_date}")
+
+        except Exception as e:
+            self.logger.warning(f"기준선 파일 읽기 실패 (새로 생성): {str(e)}")
+            self.last_date = None
+            self.stats = {}
+
+    def save(self):
+        """기준선 저장 (이전 날짜 재실행용으로 다시 계산한 기준선은 저장하지 않음)"""
+        if self.rebuilt:
+            return
+
+        data = {
+            "last_date": self.last_date.strftime("%Y-%m-%d") if self.last_date else None,
+            "samples": {
+                key: {kind: list(stats[kind].values) for kind in self.KINDS}
+                for key, stats in self.stats.items()
+            },
+        }
+
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            self.logger.warning(f"기준선 저장 실패: {str(e)}")
+
+    def ingest(self, history: pd.DataFrame, until: date) -> int:
+        """
+        마지막 반영 날짜 이후 ~ until 전날까지의 기록 반영
+
+        until이 마지막 반영 날짜 이전이면(이전 날짜 재실행) 저장된 기준선에 until 이후 기록이
+        섞여 있으므로, history의 until 이전 기록만으로 다시 계산한다 (저장하지 않음).
+
+        Args:
+            history: DataAnalyzer.normalize_history() 결과
+            until: 기준 날짜 (이 날짜는 반영하지 않음)
+
+        Returns:
+            int: 반영한 기록 수
+        """
+        days = history[COL_DATE]
+        new = days < pd.Timestamp(until)
+        if self.last_date and until <= self.last_date:
+            self.logger.info(
+                f"기준선: 마지막 반영 날짜({self.last_date})보다 이전 기준 날짜 - "
+                f"{until} 이전 기록으로 다시 계산 (저장 안 함)"
+            )
+            self.stats = {}
+            self.last_date = None
+            self.rebuilt = True
+        elif self.last_date:
+            new &= days > pd.Timestamp(self.last_date)
+
+        rows = history[new].sort_values([COL_DATE, COL_NAME])
+        if rows.empty:
+            return 0
+
+        names = rows[COL_NAME].to_numpy()
+        minutes = {
+            "in": self._minute_of_day(rows[COL_IN_TIME]),
+            "out": self._minute_of_day(rows[COL_OUT_TIME]),
+        }
+
+        added = 0
+        for i, name in enumerate(names):
+            stats = self._get(name)
+            for kind in self.KINDS:
+                value = minutes[kind][i]
+                if value >= 0:
+                    stats[kind].add(int(value))
+                    added += 1
+
+        self.last_date = rows[COL_DATE].max().date()
+        self.logger.info(f"기준선 반영: {added}건 (~{self.last_date})")
+        return added
+
+    def check(self, name: str, kind: str, value: Optional[datetime]) -> Optional[Tuple[int, int]]:
+        """
+        평소와 다른 시각인지 확인
+
+        Args:
+            name: 이름
+            kind: "in" 또는 "out"
+            value: 확인할 시각
+
+        Returns:
+            (평소 분, 차이 분) 또는 None (정상/기록 부족)
+        """
+        if value is None:
+            return None
+
+        stats = self.stats.get(self._key(name))
+        if not stats or stats[kind].count() < BASELINE_MIN_SAMPLES:
+            return None
+
+        minute = value.hour * 60 + value.minute
+        median = stats[kind].median()
+        spread = max(stats[kind].mad() * 1.4826, BASELINE_MIN_SPREAD)
+        deviation = circular_distance(minute, median)
+
+        if deviation > BASELINE_MAD_K * spread:
+            return int(median), int(deviation)
+        return None
+
+    def _get(self, name: str) -> Dict[str, _RollingStats]:
+        key = self._key(name)
+        if key not in self.stats:
+            self.stats[key] = {kind: _RollingStats(self.window) for kind in self.KINDS}
+        return self.stats[key]
+
+    @staticmethod
+    def _key(name: str) -> str:
+        """이름 정규화 (공백 제거, 소문자)"""
+        return name.replace(" ", "").lower()
+
+    @staticmethod
+    def _minute_of_day(values: pd.Series):
+        """datetime64 → 분 (NaT는 -1)"""
+        return (values.dt.hour * 60 + values.dt.minute).fillna(-1).astype(int).to_numpy()
@@ -0,0 +1,451 @@
+"""
+근태 자동 입력 v3.0 - 근태표 변경 계획 (changeset)
+Excel에 쓰기 전에 근태표 하나에 쓸 셀 변경을 모두 계산하고 (plan_workbook),
+Excel에는 계산된 변경만 한 번에 적용한다 (ExcelCOM.apply).
+
+    읽기: 시트마다 블록/지울 범위/기준일 셀을 감싸는 사각형 1개 (SheetSnapshot)
+          새 시트는 마지막 시트의 복사본이므로 앞 날짜의 계획 결과를 다음 날짜의 원본으로 이어 씀
+    계획: 스냅샷 + 출퇴근 결정 → (시트, 셀, 이전 값, 새 값, 종류) 목록 - Excel 없이 계산
+    적용: 시트 복사 → 지우기(여러 영역 주소) → 블록 쓰기 사각형 → 기준일/이전 시트 참조 셀
+          같은 날짜를 다시 실행하면 이미 있는 시트와 같은 셀은 변경이 아니므로 바뀐 셀만 쓰고, 없으면 저장도 생략
+
+스냅샷은 Excel(COM) 또는 openpyxl(파일)로 읽으므로 Excel 없이 미리보기 가능:
+
+    python changeset.py 2025-11-05 --yeoju 여주.xlsx --smc SMC.xlsx   (결정 기록의 마지막 실행 결과 사용)
+"""
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from models import DecisionSet
+from sheet_layout import Area, BlockLayout, area_address, layout_for, parse_area, quote_text, read_formulas, slot_name
+from config import RESET_DATE, RERODE_DATA_YEOJU, RERODE_DATA_SMC, SHEET_NAME_FORMAT, CHANGESET_FILE
+
+VALUE = "value"      # 값 입력
+FORMULA = "formula"  # 수식 입력
+CLEAR = "clear"      # 내용 지우기
+
+
+@dataclass
+class CellChange:
+    """셀 변경 하나"""
+    sheet: str
+    address: str
+    old: object   # 바꾸기 전 (Range.Formula 형식, 빈 셀은 "")
+    new: object   # 바꾼 후 (CLEAR는 "")
+    kind: str     # VALUE / FORMULA / CLEAR
+
+    @property
+    def cell(self) -> Tuple[int, int]:
+        return parse_area(self.address)[:2]
+
+
+class SheetSnapshot:
+    """시트의 사각형 범위 셀 내용 (Range.Formula 형식 - 수식은 수식, 값은 입력한 그대로, 텍스트는 앞에 "'")"""
+
+    def __init__(self, area: Area, formulas):
+        """
+        초기화
+
+        Args:
+            area: (시작 행, 시작 열, 끝 행, 끝 열)
+            formulas: 2차원 셀 내용 (한 셀이면 값 하나, 모자란 행/열은 빈 셀)
+        """
+        if not isinstance(formulas, (tuple, list)):
+            formulas = ((formulas,),)
+        r1, c1, r2, c2 = area
+        width = c2 - c1 + 1
+        rows = [list(row)[:width] for row in formulas][:r2 - r1 + 1]
+        rows += [[] for _ in range(r2 - r1 + 1 - len(rows))]
+        self.area = area
+        self.cells = [["" if v is None else v for v in row] + [""] * (width - len(row)) for row in rows]
+
+    @classmethod
+    def read(cls, sheet, area: Area) -> "SheetSnapshot":
+        """COM 시트에서 읽기 (Range 1회 + Formula 1회 + Value 1회)"""
+        return cls(area, read_formulas(sheet.Range(area_address(area))))
+
+    def get(self, row: int, col: int):
+        return self.cells[row - self.area[0]][col - self.area[1]]
+
+    def set(self, row: int, col: int, value):
+        self.cells[row - self.area[0]][col - self.area[1]] = value
+
+    def copy(self) -> "SheetSnapshot":
+        return SheetSnapshot(self.area, self.cells)
+
+    def block(self, area: Area) -> tuple:
+        """일부 사각형 (2차원 튜플)"""
+        r1, c1, r2, c2 = area
+        i, j = r1 - self.area[0], c1 - self.area[1]
+        return tuple(tuple(row[j:j + c2 - c1 + 1]) for row in self.cells[i:i + r2 - r1 + 1])
+
+
+def same_content(old, new) -> bool:
+    """
+    셀 내용 비교 (텍스트 앞 "'"와 숫자 형식 차이는 무시)
+
+    날짜는 Excel이 입력한 텍스트를 날짜로 바꿔 두므로 (Formula는 "11/5/2025", openpyxl은 datetime)
+    둘 다 날짜로 읽히면 날짜끼리 비교 - 다시 실행할 때 기준일 셀을 다시 쓰지 않기 위함
+    """
+    if _plain(old) == _plain(new):
+        return True
+    old_date, new_date = _as_date(old), _as_date(new)
+    return old_date is not None and old_date == new_date
+
+
+def _plain(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value)
+    return text[1:] if text.startswith("'") else text
+
+
+_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%Y/%m/%d", "%Y-%m-%d %H:%M:%S")
+_EXCEL_EPOCH = date(1899, 12, 30)
+
+
+def _as_date(value) -> Optional[date]:
+    """날짜로 읽히는 셀 내용 → date (datetime, 날짜 텍스트, 날짜 일련번호), 아니면 None"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, (int, float)) and 20000 <= value < 80000:
+        return _EXCEL_EPOCH + timedelta(days=int(value))
+    text = _plain(value).strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+class SheetSpec:
+    """근태표 시트의 쓰기 대상 (블록, 지울 셀, 기준일 셀, 이전 시트 참조 셀) - 설정마다 한 번만 계산"""
+
+    def __init__(self, blocks: list, clear_ranges: list, references: list):
+        """
+        초기화
+
+        Args:
+            blocks: [(이름범위, 출근범위, 퇴근범위), ...]
+            clear_ranges: 지울 범위
+            references: [(셀, 이전 시트의 참조 셀), ...]
+        """
+        self.layout: BlockLayout = layout_for(blocks)
+
+        cells = set()
+        for address in clear_ranges:
+            r1, c1, r2, c2 = parse_area(address)
+            cells.update((r, c) for r in range(r1, r2 + 1) for c in range(c1, c2 + 1))
+        self.clear_cells = sorted(cells)
+        self.reset_cells = [parse_area(address)[:2] for address in RESET_DATE]
+        self.references = [(parse_area(address)[:2], ref) for address, ref in references]
+
+        r1, c1, r2, c2 = self.layout.bounds
+        touched = self.clear_cells + self.reset_cells + [cell for cell, _ in self.references]
+        self.area: Area = (
+            min([r1] + [r for r, _ in touched]), min([c1] + [c for _, c in touched]),
+            max([r2] + [r for r, _ in touched]), max([c2] + [c for _, c in touched]),
+        )
+
+
+@lru_cache(maxsize=None)
+def _cached_spec(blocks: tuple, clear_ranges: tuple, references: tuple) -> SheetSpec:
+    return SheetSpec(list(blocks), list(clear_ranges), list(references))
+
+
+def sheet_spec(file_path: str, blocks: list, clear_ranges: list) -> SheetSpec:
+    """
+    근태표 파일 → SheetSpec (같은 설정은 한 번만 계산)
+
+    이전 시트 참조는 파일 이름으로 구분 (여주: W37, SMC: T31)
+    """
+    path_lower = file_path.lower()
+    references = []
+    if ("yj" in path_lower) or ("여주" in path_lower) or ("yeoju" in path_lower):
+        references += [(address, "W37") for address in RERODE_DATA_YEOJU]
+    if "smc" in path_lower:
+        references += [(address, "T31") for address in RERODE_DATA_SMC]
+    return _cached_spec(tuple(tuple(block) for block in blocks), tuple(clear_ranges), tuple(references))
+
+
+@dataclass
+class SheetPlan:
+    """시트 하나의 변경 계획"""
+    sheet: str
+    source: Optional[str]       # 복사할 시트 (None이면 이미 있는 시트에 씀)
+    spec: SheetSpec
+    before: SheetSnapshot       # 바꾸기 전 (새 시트는 복사한 직후)
+    after: SheetSnapshot        # 바꾼 후
+    changes: List[CellChange] = field(default_factory=list)
+    processed: int = 0          # 블록 행 수
+    filled: int = 0             # 입력한 출근/퇴근 수
+
+
+@dataclass
+class Changeset:
+    """근태표 파일 하나의 변경 계획 (기준 날짜 순서)"""
+    file_path: str
+    plans: List[SheetPlan] = field(default_factory=list)
+
+    def __len__(self):
+        return sum(len(plan.changes) for plan in self.plans)
+
+    @property
+    def changes(self) -> List[CellChange]:
+        return [change for plan in self.plans for change in plan.changes]
+
+    def summary(self) -> Dict[str, int]:
+        """종류별 변경 수"""
+        counts = {VALUE: 0, FORMULA: 0, CLEAR: 0}
+        for change in self.changes:
+            counts[change.kind] += 1
+        return counts
+
+    def to_frame(self) -> pd.DataFrame:
+        """미리보기 표 (파일, 시트, 복사 원본, 셀, 이전 값, 새 값, 종류)"""
+        return pd.DataFrame(
+            [
+                (self.file_path, plan.sheet, plan.source or "", change.address, change.old, change.new, change.kind)
+                for plan in self.plans for change in plan.changes
+            ],
+            columns=["파일", "시트", "복사 원본", "셀", "이전 값", "새 값", "종류"],
+        )
+
+
+class ComSheets:
+    """워크북의 시트 (Excel COM)"""
+
+    def __init__(self, workbook):
+        self.workbook = workbook
+
+    def last(self) -> str:
+        return self.workbook.Worksheets(self.workbook.Worksheets.Count).Name
+
+    def exists(self, name: str) -> bool:
+        try:
+            self.workbook.Worksheets(name)
+            return True
+        except Exception:
+            return False
+
+    def previous(self, name: str) -> Optional[str]:
+        index = self.workbook.Worksheets(name).Index
+        return self.workbook.Worksheets(index - 1).Name if index > 1 else None
+
+    def read(self, name: str, area: Area) -> SheetSnapshot:
+        return SheetSnapshot.read(self.workbook.Worksheets(name), area)
+
+
+class FileSheets:
+    """근태표 파일의 시트 (openpyxl - Excel 없이 미리보기)"""
+
+    def __init__(self, file_path: str):
+        from openpyxl import load_workbook
+
+        self.workbook = load_workbook(file_path, read_only=True)
+        self.names = list(self.workbook.sheetnames)
+
+    def last(self) -> str:
+        return self.names[-1]
+
+    def exists(self, name: str) -> bool:
+        return name in self.names
+
+    def previous(self, name: str) -> Optional[str]:
+        index = self.names.index(name)
+        return self.names[index - 1] if index > 0 else None
+
+    def read(self, name: str, area: Area) -> SheetSnapshot:
+        r1, c1, r2, c2 = area
+        rows = self.workbook[name].iter_rows(min_row=r1, max_row=r2, min_col=c1, max_col=c2, values_only=True)
+        return SheetSnapshot(area, [[quote_text(value, value) for value in row] for row in rows])
+
+    def close(self):
+        self.workbook.close()
+
+
+def plan_sheet(
+    spec: SheetSpec,
+    sheet_name: str,
+    source: Optional[str],
+    before: SheetSnapshot,
+    previous: Optional[str],
+    decisions: DecisionSet,
+    logger
+) -> SheetPlan:
+    """
+    시트 하나의 변경 계획 (Excel 없이 스냅샷만으로)
+
+    Args:
+        spec: 쓰기 대상
+        sheet_name: 시트 이름
+        source: 복사할 시트 (None이면 이미 있는 시트)
+        before: 바꾸기 전 내용 (새 시트는 복사 원본 내용)
+        previous: 바로 앞 시트 이름 (이전 시트 참조 수식용)
+        decisions: DecisionSet (조회만 함)
+        logger: 로거
+
+    Returns:
+        SheetPlan (바뀌는 셀만 changes에)
+    """
+    plan = SheetPlan(sheet_name, source, spec, before, before.copy())
+    after = plan.after
+
+    # 1) 셀 지우기
+    for row, col in spec.clear_cells:
+        after.set(row, col, "")
+
+    # 2) 기준일 (YYYY-MM-DD)
+    base_date = decisions.base_date or date.today()
+    for row, col in spec.reset_cells:
+        after.set(row, col, base_date.strftime("%Y-%m-%d"))
+
+    # 3) 이전 시트 참조 (여주 W37 / SMC T31)
+    if previous:
+        for (row, col), ref in spec.references:
+            after.set(row, col, f"='{previous}'!{ref}")
+
+    # 4) 출퇴근
+    logger.info(f"[{sheet_name}] 출퇴근 데이터 계획 중...")
+    for row, name_col, in_col, out_col in spec.layout.slots:
+        plan.processed += 1
+
+        name = slot_name(after.get(row, name_col))
+        if name is None:
+            continue
+
+        # 미리 결정된 결과 조회 (대소문자 무시, 공백 제거)
+        result = decisions.get(name)
+        if result is None:
+            logger.warning(f"    '{name}': 원시 데이터에서 찾을 수 없음")
+            continue
+
+        # 텍스트 형식으로 강제 ("'HH:MM")
+        if result.check_in:
+            after.set(row, in_col, result.check_in_text)
+            plan.filled += 1
+        if result.check_out:
+            after.set(row, out_col, result.check_out_text)
+            plan.filled += 1
+
+        if result.check_in or result.check_out:
+            date_str = result.base_date.strftime("%Y-%m-%d") if result.base_date else "N/A"
+            logger.info(
+                f"  {name}: 출근={result.check_in or '없음'}, "
+                f"퇴근={result.check_out or '없음'}, "
+                f"날짜={date_str}, 패턴={result.pattern}"
+            )
+
+    # 바뀌는 셀만 (지웠다가 같은 값을 다시 쓰는 셀은 변경 없음)
+    r1, c1, r2, c2 = after.area
+    for row in range(r1, r2 + 1):
+        for col in range(c1, c2 + 1):
+            old, new = before.get(row, col), after.get(row, col)
+            if same_content(old, new):
+                continue
+            kind = CLEAR if new == "" else FORMULA if str(new).startswith("=") else VALUE
+            plan.changes.append(CellChange(sheet_name, area_address((row, col, row, col)), old, new, kind))
+
+    logger.info(f"  처리: {plan.processed}명, 입력: {plan.filled}건, 바뀌는 셀: {len(plan.changes)}개")
+    return plan
+
+
+def plan_workbook(
+    file_path: str,
+    sheets,
+    blocks: list,
+    clear_ranges: list,
+    decisions: Dict[date, DecisionSet],
+    logger
+) -> Changeset:
+    """
+    근태표 파일 하나의 변경 계획 (기준 날짜 순서대로 시트 추가/입력)
+
+    Args:
+        file_path: 근태표 파일 (이전 시트 참조 종류 구분용)
+        sheets: ComSheets / FileSheets (시트마다 한 번만 읽음)
+        blocks: 블록 리스트
+        clear_ranges: 지울 범위
+        decisions: {기준 날짜: 출퇴근 결정 결과}
+        logger: 로거
+
+    Returns:
+        Changeset
+    """
+    spec = sheet_spec(file_path, blocks, clear_ranges)
+    changeset = Changeset(file_path)
+    states: Dict[str, SheetSnapshot] = {}  # 계획한 시트의 바꾼 후 내용
+    last = sheets.last()
+
+    for base_date, day_decisions in sorted(decisions.items()):
+        name = base_date.strftime(SHEET_NAME_FORMAT)
+
+        if name in states or sheets.exists(name):
+            # 같은 이름의 시트가 있으면 그 시트에 씀
+            source = None
+            before = states.get(name) or sheets.read(name, spec.area)
+            previous = sheets.previous(name)
+        else:
+            # 마지막 시트 복사 → 날짜 순서대로 이어짐
+            source = last
+            before = (states.get(last) or sheets.read(last, spec.area)).copy()
+            previous = last
+            last = name
+
+        plan = plan_sheet(spec, name, source, before, previous, day_decisions, logger)
+        states[name] = plan.after
+        changeset.plans.append(plan)
+
+    return changeset
+
+
+if __name__ == "__main__":
+    import argparse
+    from logger import Logger
+    from decision_journal import DecisionJournal
+    from multi_date import parse_base_dates
+    from config import YEOJU_BLOCKS, SMC_BLOCKS, CLEAR_RANGES_YEOJU, CLEAR_RANGES_SMC
+
+    parser = argparse.ArgumentParser(description="근태표 변경 미리보기 (Excel 없이, 결정 기록의 마지막 실행 결과로)")
+    parser.add_argument("dates", help="기준 날짜 (2025-11-05, 여러 날짜는 쉼표, 기간은 ~)")
+    parser.add_argument("--yeoju", help="여주 근태표 파일")
+    parser.add_argument("--smc", help="SMC 근태표 파일")
+    parser.add_argument("--output", default=CHANGESET_FILE)
+    args = parser.parse_args()
+
+    logger = Logger()
+    journal = DecisionJournal(logger)
+    decisions = {}
+    for day in parse_base_dates(args.dates):
+        day_decisions = journal.decisions(day)
+        if day_decisions is None:
+            logger.warning(f"{day}: 결정 기록 없음 (프로그램을 먼저 실행하세요)")
+        else:
+            decisions[day] = day_decisions
+
+    frames = []
+    for file_path, blocks, clear_ranges in (
+        (args.yeoju, YEOJU_BLOCKS, CLEAR_RANGES_YEOJU),
+        (args.smc, SMC_BLOCKS, CLEAR_RANGES_SMC),
+    ):
+        if not file_path or not decisions:
+            continue
+        sheets = FileSheets(file_path)
+        try:
+            changeset = plan_workbook(file_path, sheets, blocks, clear_ranges, decisions, logger)
+        finally:
+            sheets.close()
+        logger.info(f"{file_path}: 시트 {len(changeset.plans)}개, 변경 {len(changeset)}개 {changeset.summary()}")
+        frames.append(changeset.to_frame())
+
+    if frames:
+        pd.concat(frames, ignore_index=True).to_excel(args.output, index=False, engine="openpyxl")
+        logger.info(f"미리보기 파일 생성: {args.output}")
@@ -0,0 +1,238 @@
+"""
+근태 자동 입력 v3.0 - Excel COM 전용 스레드
+Excel 객체는 COM 아파트(STA) 스레드 하나에서만 만들고 사용하며,
+다른 스레드는 명령(열기, 시트 복사, 지우기, 블록 입력, 변경 계획/적용, 재입력, 저장, 닫기)을 큐에 넣고 Future를 받음
+
+명령은 넣은 순서대로 실행된다. 워크북 명령이 실패하면 같은 워크북의 이후 명령은
+실행하지 않고 실패로 끝남 (저장되지 않음). 여러 워크북을 commit(book, group)으로 함께 저장하면
+group 중 하나라도 실패했을 때 나머지도 저장하지 않는다.
+Tk는 메인 스레드에서만 써야 하므로 작업 스레드의 로그는 모아 두었다가 wait()에서 출력.
+
+    worker = ComWorker(logger)            # application=FakeExcel(...)이면 Excel 없이
+    worker.start()
+    book = worker.open("여주.xlsx")        # Future - 결과를 기다리지 않고 다음 명령에 넘김
+    worker.copy_sheet(book, "25.11.05")
+    worker.clear(book, CLEAR_RANGES_YEOJU)
+    worker.write_block(book, YEOJU_BLOCKS, decisions)
+    worker.wait(worker.save(book))        # 한 번만 저장 (앞 명령이 실패하면 저장 안 함, commit은 변경이 있을 때만)
+    worker.stop()
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait as wait_futures
+from contextlib import ExitStack
+from typing import Callable, Dict, List, Optional, Tuple
+
+from logger import BufferedLogger
+from excel_com import ExcelCOM, ExcelSession
+
+_STOP = object()
+
+
+class ComWorker:
+    """Excel COM 전용 스레드"""
+
+    def __init__(self, logger, application=None):
+        """
+        초기화
+
+        Args:
+            logger: 로거 (메인 스레드)
+            application: Excel.Application 대신 쓸 객체 (fake_com.FakeExcel 등, None이면 win32com)
+        """
+        self.logger = logger
+        self.application = application
+        self.log = BufferedLogger()
+        self.history: List[Tuple[str, str]] = []  # 실행한 명령 (이름, 파일) - 순서 확인용
+        self._queue = queue.Queue()
+        self._thread = None
+        self._failed: Dict[int, BaseException] = {}  # 실패한 워크북 (id → 처음 난 예외)
+        self._modes: Dict[int, ExitStack] = {}  # 워크북별 속도 설정 (작업 스레드에서만)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """스레드 시작 (Excel 시작도 바로 큐에 넣음 - 다른 작업과 동시에 진행)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="excel-com", daemon=True)
+            self._thread.start()
+            self.submit("start", lambda session: session.start() and None)
+        return self
+
+    def stop(self, pump: Optional[Callable] = None):
+        """남은 명령을 마치고 Excel 종료 후 스레드 정리"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        while self._thread.is_alive():
+            self._thread.join(0.05)
+            self.log.replay(self.logger)
+            if pump:
+                pump()
+        self._thread = None
+        self.log.replay(self.logger)
+
+    # ---------- 명령 ----------
+
+    def submit(self, name: str, function: Callable, *args, workbook=None) -> Future:
+        """
+        명령 넣기
+
+        Args:
+            name: 명령 이름 (history 기록용)
+            function: 작업 스레드에서 실행할 함수 (function(session, *args))
+            args: 인자 (Future는 작업 스레드에서 결과로 바꿔서 넘김)
+            workbook: 대상 워크북 (open의 Future) - 앞 명령이 실패했으면 실행 안 함
+
+        Returns:
+            Future
+        """
+        future = Future()
+        self._queue.put((future, name, function, args, workbook))
+        return future
+
+    def open(self, file_path: str) -> Future:
+        """워크북 열기 → Future[ExcelCOM]"""
+        return self.submit("open", lambda session, path: session.open(path), file_path)
+
+    def performance(self, workbook: Future) -> Future:
+        """속도 설정 켜기 (save/commit 또는 close에서 되돌림)"""
+        def enable(session, excel: ExcelCOM):
+            stack = ExitStack()
+            stack.enter_context(excel.performance())
+            self._modes[id(excel)] = stack
+        return self.submit("performance", enable, workbook, workbook=workbook)
+
+    def copy_sheet(self, workbook: Future, sheet_name: str) -> Future:
+        """마지막 시트 복사"""
+        return self.submit("copy_sheet", lambda session, excel, name: excel.copy_sheet(name),
+                           workbook, sheet_name, workbook=workbook)
+
+    def clear(self, workbook: Future, ranges: list) -> Future:
+        """현재 시트 범위 지우기"""
+        return self.submit("clear", lambda session, excel, ranges: excel.clear_ranges(ranges),
+                           workbook, ranges, workbook=workbook)
+
+    def write_block(self, workbook: Future, blocks: list, decisions) -> Future:
+        """현재 시트에 출퇴근 입력"""
+        return self.submit("write_block", lambda session, excel, blocks, decisions: excel.write_attendance(blocks, decisions),
+                           workbook, blocks, decisions, workbook=workbook)
+
+    def correct(self, workbook: Future, blocks: list, corrections: dict, decisions) -> Future:
+        """수정 데이터 재입력 → Future[입력한 셀 수]"""
+        return self.submit("correct", lambda session, excel, *args: excel.correct(*args),
+                           workbook, blocks, corrections, decisions, workbook=workbook)
+
+    def plan(self, workbook: Future, blocks: list, clear_ranges: list, decisions) -> Future:
+        """기준 날짜별 시트 변경 계획 → Future[Changeset] (읽기만 함)"""
+        return self.submit("plan", lambda session, excel, *args: excel.plan(*args),
+                           workbook, blocks, clear_ranges, decisions, workbook=workbook)
+
+    def apply(self, workbook: Future, changeset: Future) -> Future:
+        """변경 계획 적용"""
+        return self.submit("apply", lambda session, excel, changeset: excel.apply(changeset),
+                           workbook, changeset, workbook=workbook)
+
+    def save(self, workbook: Future) -> Future:
+        """저장 (속도 설정을 먼저 되돌림 - 계산 모드도 파일에 저장되므로)"""
+        def save(session, excel: ExcelCOM):
+            self._restore(excel)
+            excel.save()
+        return self.submit("save", save, workbook, workbook=workbook)
+
+    def commit(self, workbook: Future, group: List[Future] = ()) -> Future:
+        """
+        변경이 있을 때만 저장 (속도 설정을 먼저 되돌림) → Future[저장했는지]
+
+        Args:
+            workbook: 대상 워크북
+            group: 함께 저장할 워크북들 (이 중 하나라도 앞서 실패했으면 저장하지 않음 -
+                   모든 워크북의 입력 명령 뒤에 넣어야 함)
+        """
+        def commit(session, excel: ExcelCOM):
+            failed = [book for book in group if book is not workbook and id(book) in self._failed]
+            if failed:
+                raise RuntimeError(f"함께 저장할 워크북 {len(failed)}개가 실패해서 저장 안 함: {self._failed[id(failed[0])]}")
+            self._restore(excel)
+            return excel.commit()
+        return self.submit("commit", commit, workbook, workbook=workbook)
+
+    def close(self, workbook: Future) -> Future:
+        """워크북 닫기 (저장하지 않음, 실패한 워크북은 변경 취소 후 닫음)"""
+        def close(session, excel: ExcelCOM):
+            if id(workbook) in self._failed:
+                excel.rollback()
+            try:
+                self._restore(excel)
+            finally:
+                excel.close()
+        return self.submit("close", close, workbook)
+
+    def _restore(self, excel: ExcelCOM):
+        """속도 설정 되돌리기 (바뀐 시트 계산 후 원래 설정 - 작업 스레드에서만)"""
+        stack = self._modes.pop(id(excel), None)
+        if stack is not None:
+            stack.close()
+
+    # ---------- 대기 ----------
+
+    def wait(self, future: Future, pump: Optional[Callable] = None):
+        """
+        Future 결과 대기 (기다리는 동안 작업 스레드 로그 출력, pump로 GUI 갱신)
+
+        Raises:
+            명령에서 난 예외
+        """
+        while not future.done():
+            wait_futures([future], timeout=0.05)
+            self.log.replay(self.logger)
+            if pump:
+                pump()
+        self.log.replay(self.logger)
+        return future.result()
+
+    def wait_all(self, futures: List[Future], pump: Optional[Callable] = None) -> list:
+        """여러 Future를 순서대로 대기 (첫 예외를 그대로 올림)"""
+        return [self.wait(future, pump) for future in futures]
+
+    # ---------- 작업 스레드 ----------
+
+    def _run(self):
+        """작업 스레드 (Excel 세션을 이 스레드에서 만들고 닫음)"""
+        session = ExcelSession(self.log, self.application)
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                self._execute(session, *item)
+        finally:
+            session.close()
+
+    def _execute(self, session: ExcelSession, future: Future, name: str, function, args, workbook):
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            if workbook is not None and id(workbook) in self._failed:
+                error = self._failed[id(workbook)]
+                raise RuntimeError(f"앞 명령이 실패해서 {name} 실행 안 함: {error}") from error
+
+            args = [arg.result() if isinstance(arg, Future) else arg for arg in args]
+            excel = next((arg for arg in args if isinstance(arg, ExcelCOM)), None)
+            self.history.append((name, excel.file_path if excel else str(args[0]) if args else ""))
+
+            started = time.perf_counter()
+            result = function(session, *args)
+            self.log.debug(f"COM 명령 {name}: {time.perf_counter() - started:.2f}초")
+            future.set_result(result)
+
+        except BaseException as e:
+            if workbook is not None:
+                self._failed.setdefault(id(workbook), e)
+            future.set_exception(e)
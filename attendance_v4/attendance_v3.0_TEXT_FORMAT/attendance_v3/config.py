@@ -9,6 +9,11 @@ COL_DATE = '근무일자'
 COL_NAME = '이름'
 COL_IN_RAW = '출근시간'
 COL_OUT_RAW = '퇴근시간'
+COL_DEPT = '부서'          # 선택 (있으면 부서별 집계에 사용)
+
+# 정규화된 이력 (벡터 연산용)
+COL_IN_TIME = '출근시각'
+COL_OUT_TIME = '퇴근시각'
 
 # ==============================
 # 여주 근태표 설정
@@ -56,6 +61,27 @@ CLEAR_RANGES_SMC = [
 ]
 
 RERODE_DATA_SMC = ["P31"]
+
+# ==============================
+# 근태표 블록 쓰기 설정 (sheet_layout.py)
+# ==============================
+# 출근/퇴근 열 묶음 사이 열이 이 수 이하면 한 사각형으로 씀 (1: 블록 열마다 하나 - 여주 4개, SMC 3개)
+# 사각형 안의 블록 밖 셀은 읽은 그대로 다시 씀 (텍스트는 "'"를 붙여 그대로, 병합/보호 셀이 걸리면 바뀐 셀만)
+# 0이면 출근/퇴근 셀만 씀 (여주 10개)
+LAYOUT_MERGE_GAP = 1
+# ==============================
+# 근태표 변경 미리보기 설정 (changeset.py)
+# ==============================
+CHANGESET_FILE = "근태표_변경_미리보기.xlsx"  # Excel 없이 계산한 셀 변경 목록
+
+# ==============================
+# 근태표 동시 처리 설정 (site_pool.py)
+# ==============================
+SITE_PROCESSES = False  # 근태표마다 작업 프로세스(각자 Excel)에서 동시에 입력 (False면 COM 전용 스레드 하나에서 차례로)
+                        # exe(PyInstaller)에서 확인하기 전까지 끔
+                        # 근태표마다 따로 저장 (False면 하나라도 실패하면 모두 저장 안 함)
+SITE_WORKERS = None     # 동시에 처리할 근태표 수 (None이면 근태표 수)
+
 # ==============================
 # 날짜/시간 형식 설정
 # ==============================
@@ -67,3 +93,75 @@ TIME_FORMAT = "%H:%M"              # 시간 표시 형식 (예: 09:30)
 # ==============================
 HOLIDAY_THRESHOLD = 0.3  # 공휴일 감지 임계값 (평균 출근의 30%)
 MIN_ATTENDANCE = 5       # 최소 출근 인원 (이하면 공휴일 의심)
+LOOKBACK_WORKDAYS = 1    # 전일 데이터를 찾을 이전 근무일 수
+LOOKBACK_INCLUDE_OFF_DAYS = False  # 사이의 주말/공휴일 기록도 전일 기록으로 볼지
+                                   # (False: 이전 근무일만 - 월요일의 전일은 금요일,
+                                   #  True: 토/일에 찍힌 기록이 금요일보다 우선)
+
+# ==============================
+# 출퇴근 페어링 설정
+# ==============================
+MAX_SHIFT_HOURS = 16     # 출근~퇴근 최대 근무 시간 (초과하면 짝짓지 않음)
+NIGHT_CUTOFF_HOUR = 12   # 이 시각 이후 출근은 야간 근무로 판단 (근무표에 없을 때)
+
+# ==============================
+# 개인별 기준선 설정 (평소와 다른 시각 감지)
+# ==============================
+BASELINE_FILE = "근무_기준선.json"  # 기준선 저장 파일
+BASELINE_WINDOW = 60        # 직원별 유지할 최근 기록 수
+BASELINE_MIN_SAMPLES = 10   # 최소 기록 수 (미만이면 판단 안 함)
+BASELINE_MAD_K = 4.0        # 중앙값에서 MAD의 몇 배 이상 벗어나면 이상으로 볼지
+BASELINE_MIN_SPREAD = 15    # MAD 하한 (분) - 매일 같은 시각인 사람의 과잉 감지 방지
+
+# ==============================
+# 근무시간 집계 설정
+# ==============================
+WORK_HOURS_FILE = "근무시간_집계.xlsx"  # 집계 결과 파일
+REGULAR_WORK_MINUTES = 480  # 1일 소정 근무 (분) - 초과분은 연장
+NIGHT_START_HOUR = 22       # 야간 시작 시각
+NIGHT_END_HOUR = 6          # 야간 종료 시각
+
+# ==============================
+# 근무 형태 설정 (근무표에 없을 때 야간 판단 - shift_policy.py)
+# ==============================
+# day: 주간 고정 / night: 야간 고정 / three_shift: 3교대 / flexible: NIGHT_CUTOFF_HOUR 기준
+DEFAULT_SHIFT_POLICY = "flexible"
+SHIFT_POLICY_BY_DEPT = {}   # {부서: 근무 형태} 예: {'생산1팀': 'three_shift'}
+SHIFT_POLICY_BY_NAME = {}   # {이름: 근무 형태} (부서 설정보다 우선)
+THREE_SHIFT_NIGHT_HOUR = 20 # 3교대: 이 시각 이후 출근만 야간조 (오후조 14시 출근은 주간)
+
+# ==============================
+# 근무표 설정 (선택 - 있으면 야간 판단에 사용)
+# ==============================
+ROSTER_COL_NAME = '이름'
+ROSTER_COL_DATE = '날짜'
+ROSTER_COL_START = '시작'      # HH:MM
+ROSTER_COL_END = '종료'        # HH:MM (시작보다 이르면 다음 날)
+ROSTER_CACHE_FILE = "근무표_색인.pkl"  # 색인 캐시 (근무표가 바뀌면 다시 생성)
+ROSTER_TOLERANCE_MINUTES = 120  # 예정 근무 전후 허용 범위 (분)
+
+# ==============================
+# 출퇴근 큐브 설정
+# ==============================
+CUBE_DIR = "근태_큐브"  # 날짜 × 직원 출퇴근 배열 (.npy, 매 실행마다 갱신)
+
+# ==============================
+# 마지막 실행 상태 설정
+# ==============================
+STATE_FILE = "마지막_상태.json"  # 다음 실행의 전일 계산용 (원시 데이터에 이전 구간이 없으면 사용)
+
+# ==============================
+# 결정 기록 설정
+# ==============================
+JOURNAL_FILE = "결정_기록.bin"  # 엔진 결정 기록 (.idx/.names 파일이 함께 생성됨)
+
+# ==============================
+# 규칙 시뮬레이션 설정
+# ==============================
+SIMULATION_FILE = "규칙_시뮬레이션.xlsx"  # 설정별 변경 결과 파일
+SIMULATION_WORKERS = None  # 병렬 프로세스 수 (None이면 CPU 수)
+
+# ==============================
+# 여러 날짜 처리 설정 (기준 날짜에 기간/여러 날짜 입력 시)
+# ==============================
+MULTI_DATE_WORKERS = None  # 병렬 프로세스 수 (None이면 CPU 수)
@@ -6,7 +6,11 @@ import pandas as pd
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Tuple
 from models import WorkPattern, AttendanceRecord, ProblemData, ValidationResult
-from config import COL_DATE, COL_NAME, COL_IN_RAW, COL_OUT_RAW, HOLIDAY_THRESHOLD, MIN_ATTENDANCE
+from time_format import format_minute
+from config import (
+    COL_DATE, COL_NAME, COL_IN_RAW, COL_OUT_RAW, COL_IN_TIME, COL_OUT_TIME, COL_DEPT,
+    HOLIDAY_THRESHOLD, MIN_ATTENDANCE,
+)
 
 
 class DataAnalyzer:
@@ -46,6 +50,7 @@ class DataAnalyzer:
         found_name = False
         found_in = False
         found_out = False
+        found_dept = False
         
         for col in df.columns:
             col_lower = str(col).lower().strip()
@@ -73,6 +78,12 @@ class DataAnalyzer:
                 column_mapping[col] = COL_OUT_RAW
                 found_out = True
                 self.logger.debug(f"  퇴근 컬럼: '{col}' → '{COL_OUT_RAW}'")
+            
+            # 부서 컬럼 (선택)
+            elif not found_dept and '부서' in col_lower:
+                column_mapping[col] = COL_DEPT
+                found_dept = True
+                self.logger.debug(f"  부서 컬럼: '{col}' → '{COL_DEPT}'")
         
         # 컬럼 매핑 적용
         if column_mapping:
@@ -118,30 +129,38 @@ class DataAnalyzer:
         
         return df[cols_to_keep]
     
-    def analyze_work_pattern(self, df: pd.DataFrame) -> WorkPattern:
+    def analyze_work_pattern(
+        self,
+        df: pd.DataFrame,
+        holiday_threshold: float = HOLIDAY_THRESHOLD,
+        min_attendance: int = MIN_ATTENDANCE,
+        daily_stats: Dict[date, int] = None
+    ) -> WorkPattern:
         """
         근무 패턴 분석
         
         Args:
-            df: 원시 데이터
+            df: 원시 데이터 (daily_stats가 있으면 사용 안 함)
+            holiday_threshold: 공휴일 감지 임계값 (평균 출근 대비 비율)
+            min_attendance: 최소 출근 인원
+            daily_stats: 날짜별 출근 인원 (AttendanceCube.daily_counts(), 없으면 df에서 계산)
             
         Returns:
             WorkPattern: 분석 결과
         """
         self.logger.info("근무 패턴 분석 중...")
         
-        # 컬럼명 자동 감지 및 매핑
-        df = self._map_columns(df)
-        
         # 날짜별 출근 인원 계산
-        daily_stats = self._calculate_daily_stats(df)
+        if daily_stats is None:
+            df = self._map_columns(df)
+            daily_stats = self._calculate_daily_stats(df)
         
         # 평균 출근 인원 계산 (0이 아닌 날만)
         non_zero_days = [count for count in daily_stats.values() if count > 0]
         avg_attendance = sum(non_zero_days) / len(non_zero_days) if non_zero_days else 0
         
         # 임계값 설정
-        threshold = avg_attendance * HOLIDAY_THRESHOLD
+        threshold = avg_attendance * holiday_threshold
         
         # 분류
         work_days = []
@@ -151,7 +170,7 @@ class DataAnalyzer:
         for day, count in daily_stats.items():
             if count == 0:
                 weekends.append(day)
-            elif count < threshold or count < MIN_ATTENDANCE:
+            elif count < threshold or count < min_attendance:
                 holidays.append(day)
             else:
                 work_days.append(day)
@@ -159,7 +178,7 @@ class DataAnalyzer:
         # 로그
         self.logger.success(f"패턴 분석 완료:")
         self.logger.info(f"  평균 출근 인원: {avg_attendance:.1f}명")
-        self.logger.info(f"  공휴일 임계값: {threshold:.1f}명 ({int(HOLIDAY_THRESHOLD*100)}%)")
+        self.logger.info(f"  공휴일 임계값: {threshold:.1f}명 ({int(holiday_threshold*100)}%)")
         self.logger.info(f"  근무일: {len(work_days)}일")
         self.logger.info(f"  공휴일: {len(holidays)}일")
         self.logger.info(f"  주말: {len(weekends)}일")
@@ -227,13 +246,14 @@ class DataAnalyzer:
         
         return None
     
-    def validate_data(self, df: pd.DataFrame, base_date: date) -> ValidationResult:
+    def validate_data(self, df: pd.DataFrame, base_date: date, baseline=None) -> ValidationResult:
         """
         데이터 검증
         
         Args:
             df: 원시 데이터
             base_date: 기준 날짜
+            baseline: PunchBaseline (있으면 평소와 다른 시각도 확인)
             
         Returns:
             ValidationResult: 검증 결과
@@ -266,6 +286,9 @@ class DataAnalyzer:
             # 문제 체크
             issue = self._check_issues(cin_parsed, cout_parsed, cin_ok, cout_ok)
             
+            if not issue and baseline:
+                issue = self._check_baseline(baseline, name, cin_parsed, cout_parsed)
+            
             if issue:
                 # 문제 데이터
                 problems.append(ProblemData(
@@ -407,6 +430,21 @@ class DataAnalyzer:
         
         return None
     
+    def _check_baseline(self, baseline, name: str, cin: datetime, cout: datetime) -> str:
+        """
+        개인별 기준선 확인
+        
+        Returns:
+            str: 문제 설명 (없으면 None)
+        """
+        for kind, label, value in (("in", "출근", cin), ("out", "퇴근", cout)):
+            unusual = baseline.check(name, kind, value)
+            if unusual:
+                usual, _ = unusual
+                return f"평소와 다른 {label} 시간 (평소 {format_minute(usual)})"
+        
+        return None
+    
     def create_maps(self, df: pd.DataFrame, target_date: date) -> Dict[str, AttendanceRecord]:
         """
         날짜별 출퇴근 맵 생성
@@ -447,3 +485,64 @@ class DataAnalyzer:
             )
         
         return result
+    
+    def normalize_history(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        전체 이력 정규화 (벡터 연산용)
+        
+        날짜는 datetime64(자정), 출퇴근은 datetime64(없으면 NaT)로 변환한다.
+        시간만 있는 값("HH:MM")은 근무일자 기준 시각으로 보정한다.
+        
+        Args:
+            df: 원시 데이터
+            
+        Returns:
+            DataFrame[근무일자, 이름, 출근시각, 퇴근시각(, 부서)]
+        """
+        # 컬럼명 자동 감지 및 매핑
+        df = self._map_columns(df)
+        
+        history = pd.DataFrame({
+            COL_DATE: pd.to_datetime(df[COL_DATE]).dt.normalize(),
+            COL_NAME: df[COL_NAME].astype(str).str.strip(),
+        })
+        
+        # 이름 없는 행 제외
+        keep = (history[COL_NAME] != '') & (history[COL_NAME] != 'nan')
+        history = history[keep]
+        
+        history[COL_IN_TIME] = self._parse_time_series(df.loc[keep, COL_IN_RAW], history[COL_DATE])
+        history[COL_OUT_TIME] = self._parse_time_series(df.loc[keep, COL_OUT_RAW], history[COL_DATE])
+        
+        if COL_DEPT in df.columns:
+            history[COL_DEPT] = df.loc[keep, COL_DEPT].astype(str).str.strip()
+        
+        return history.reset_index(drop=True)
+    
+    def _parse_time_series(self, values: pd.Series, work_dates: pd.Series) -> pd.Series:
+        """
+        시간 컬럼 일괄 파싱 (고유값만 _parse_time 호출)
+        
+        Args:
+            values: 원본 시간 값
+            work_dates: 같은 행의 근무일자 (datetime64)
+            
+        Returns:
+            datetime64 Series (파싱 실패/빈 값은 NaT)
+        """
+        if pd.api.types.is_datetime64_any_dtype(values):
+            parsed = values
+        else:
+            lookup = {v: self._parse_time(v)[0] for v in values.dropna().unique()}
+            parsed = pd.to_datetime(values.map(lookup), errors='coerce')
+        
+        # 시간만 있는 값 (2000-01-01, Excel 1899-12-30 기준) → 근무일자 기준으로 보정
+        time_only = parsed.notna() & (parsed.dt.year <= 2000)
+        if time_only.any():
+            parsed = parsed.where(
+                ~time_only,
+                work_dates + (parsed - parsed.dt.normalize())
+            )
+        
+        return parsed
+
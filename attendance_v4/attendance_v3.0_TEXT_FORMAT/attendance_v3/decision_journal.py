@@ -0,0 +1,319 @@
+"""
+근태 자동 입력 v3.0 - 결정 기록 (저널)
+엔진의 모든 결정(입력, 패턴, 출력, 기준 날짜)을 고정 길이 바이너리 레코드로 추가 기록하고,
+날짜/직원 색인으로 조회하거나 현재 엔진으로 다시 실행(replay)해 차이를 비교
+
+    python decision_journal.py show 2025-11-12 홍길동
+    python decision_journal.py replay 2025-01-01 2025-12-31
+"""
+import os
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from models import BatchResult, DecisionSet, PATTERNS, normalize_name
+from shift_policy import ShiftPolicyResolver
+from time_format import MINUTE_STRING_ARRAY
+from config import JOURNAL_FILE
+
+# 결정 1건 = 고정 길이 레코드
+RECORD_DTYPE = np.dtype([
+    ("run_date", "M8[D]"),      # 실행 기준 날짜
+    ("employee", "<i4"),        # 직원 번호 (.names 파일의 줄 번호)
+    ("cin_today", "M8[m]"),     # 입력: 오늘 출근
+    ("cout_today", "M8[m]"),    # 입력: 오늘 퇴근
+    ("cin_yest", "M8[m]"),      # 입력: 전일 출근
+    ("cout_yest", "M8[m]"),     # 입력: 전일 퇴근
+    ("today_date", "M8[D]"),    # 입력: 오늘 기록 날짜
+    ("yest_date", "M8[D]"),     # 입력: 전일 기록 날짜
+    ("policy", "i1"),           # 입력: 근무 형태 번호 (부서별 설정 반영)
+    ("pattern", "i1"),          # 출력: 패턴 코드
+    ("check_in", "<i2"),        # 출력: 출근 분
+    ("check_out", "<i2"),       # 출력: 퇴근 분
+    ("base_date", "M8[D]"),     # 출력: 기준 날짜
+])
+
+# 실행 1회 = 색인 1건 (같은 날짜를 다시 실행하면 마지막 기록 사용)
+INDEX_DTYPE = np.dtype([
+    ("run_date", "M8[D]"),
+    ("offset", "<i8"),          # 데이터 파일 내 시작 레코드
+    ("count", "<i8"),           # 레코드 수
+])
+
+INPUT_FIELDS = ("cin_today", "cout_today", "cin_yest", "cout_yest", "today_date", "yest_date", "policy")
+
+
+class DecisionJournal:
+    """결정 기록"""
+
+    def __init__(self, logger, path: str = JOURNAL_FILE):
+        """
+        초기화
+
+        Args:
+            logger: 로거
+            path: 데이터 파일 경로 (.idx, .names 파일이 같은 위치에 생성됨)
+        """
+        self.logger = logger
+        self.path = path
+        self.index_path = path + ".idx"
+        self.names_path = path + ".names"
+        self._names: Optional[List[str]] = None
+        self._ids: Dict[str, int] = {}
+
+    def append(self, decisions: DecisionSet):
+        """
+        실행 결과 추가 기록
+
+        Args:
+            decisions: AttendanceEngine.decide_all() 결과 (inputs 포함)
+        """
+        batch = decisions.batch
+        if len(batch) == 0 or decisions.inputs is None:
+            return
+
+        records = np.empty(len(batch), dtype=RECORD_DTYPE)
+        records["run_date"] = np.datetime64(decisions.base_date, "D") if decisions.base_date else np.datetime64("NaT", "D")
+        records["employee"] = self._employee_ids(batch.names)
+        for field in INPUT_FIELDS:
+            records[field] = decisions.inputs[field]
+        records["pattern"] = batch.pattern
+        records["check_in"] = batch.check_in
+        records["check_out"] = batch.check_out
+        records["base_date"] = batch.base_date
+
+        # 직원 번호순 정렬 (실행 내 직원 조회는 이진 탐색)
+        records = records[np.argsort(records["employee"], kind="stable")]
+
+        try:
+            offset = self._record_count()
+            entry = np.array([(records["run_date"][0], offset, len(records))], dtype=INDEX_DTYPE)
+
+            # 데이터 먼저, 색인은 나중 (중간에 끊기면 색인 없는 데이터는 무시됨)
+            with open(self.path, "ab") as f:
+                f.truncate(offset * RECORD_DTYPE.itemsize)  # 끊긴 마지막 레코드 제거
+                records.tofile(f)
+            with open(self.index_path, "ab") as f:
+                entry.tofile(f)
+            self.logger.debug(f"결정 기록: {len(records)}건 ({self.path})")
+        except Exception as e:
+            self.logger.warning(f"결정 기록 실패: {str(e)}")
+
+    def load(self, start: date, end: date) -> np.ndarray:
+        """
+        기간 내 실행 기록 (날짜별 마지막 실행)
+
+        Args:
+            start: 시작 날짜
+            end: 종료 날짜 (포함)
+
+        Returns:
+            RECORD_DTYPE 배열
+        """
+        count = self._record_count()
+        if not os.path.exists(self.index_path) or count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+
+        index = np.fromfile(self.index_path, dtype=INDEX_DTYPE)
+        data = np.memmap(self.path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+
+        # 데이터 파일 범위를 벗어난 색인(쓰기 중단)은 제외
+        index = index[index["offset"] + index["count"] <= len(data)]
+        in_range = (index["run_date"] >= np.datetime64(start, "D")) & (index["run_date"] <= np.datetime64(end, "D"))
+
+        latest = {}
+        for entry in index[in_range]:
+            latest[entry["run_date"]] = entry
+
+        blocks = [data[e["offset"]:e["offset"] + e["count"]] for _, e in sorted(latest.items())]
+        return np.concatenate(blocks) if blocks else np.empty(0, dtype=RECORD_DTYPE)
+
+    def decisions(self, run_date: date) -> Optional[DecisionSet]:
+        """
+        기록된 실행 결과 → DecisionSet (근태표 변경 미리보기용, 입력 배열은 없음)
+
+        Returns:
+            DecisionSet (기록이 없으면 None)
+        """
+        records = self.load(run_date, run_date)
+        if len(records) == 0:
+            return None
+
+        names = list(self.names_of(records["employee"]))
+        batch = BatchResult(
+            names=names,
+            check_in=records["check_in"],
+            check_out=records["check_out"],
+            base_date=records["base_date"],
+            pattern=records["pattern"],
+        )
+        return DecisionSet(batch, {normalize_name(name): i for i, name in enumerate(names)}, run_date)
+
+    def find(self, run_date: date, name: str) -> Optional[np.void]:
+        """
+        특정 날짜/직원의 결정 기록
+
+        Args:
+            run_date: 실행 기준 날짜
+            name: 이름
+
+        Returns:
+            레코드 또는 None
+        """
+        self._load_names()
+        employee = self._ids.get(normalize_name(name))
+        if employee is None:
+            return None
+
+        records = self.load(run_date, run_date)
+        i = int(np.searchsorted(records["employee"], employee))
+        if i < len(records) and records["employee"][i] == employee:
+            return records[i]
+        return None
+
+    def replay(self, start: date, end: date, engine) -> pd.DataFrame:
+        """
+        기간 내 기록을 현재 엔진으로 다시 실행해 차이 비교
+
+        근무 형태는 기록 당시 정해진 값(부서별 설정 반영)을 그대로 쓴다.
+
+        Args:
+            start: 시작 날짜
+            end: 종료 날짜 (포함)
+            engine: AttendanceEngine
+
+        Returns:
+            달라진 결정만 담은 DataFrame
+        """
+        records = self.load(start, end)
+        if len(records) == 0:
+            self.logger.warning("해당 기간의 결정 기록이 없습니다")
+            return pd.DataFrame()
+
+        names = self.names_of(records["employee"])
+
+        result = engine.decide_batch(names=list(names), **{field: records[field] for field in INPUT_FIELDS})
+
+        changed = (
+            (result.pattern != records["pattern"])
+            | (result.check_in != records["check_in"])
+            | (result.check_out != records["check_out"])
+            | (result.base_date.astype("i8") != records["base_date"].astype("i8"))
+        )
+
+        self.logger.info(f"다시 실행: {len(records)}건, 변경: {int(changed.sum())}건")
+
+        patterns = np.array(PATTERNS, dtype=object)
+        return pd.DataFrame({
+            "날짜": records["run_date"][changed],
+            "이름": names[changed],
+            "기존_패턴": patterns[records["pattern"][changed]],
+            "기존_출근": MINUTE_STRING_ARRAY[records["check_in"][changed]],
+            "기존_퇴근": MINUTE_STRING_ARRAY[records["check_out"][changed]],
+            "현재_패턴": patterns[result.pattern[changed]],
+            "현재_출근": MINUTE_STRING_ARRAY[result.check_in[changed]],
+            "현재_퇴근": MINUTE_STRING_ARRAY[result.check_out[changed]],
+        })
+
+    def names_of(self, employees: np.ndarray) -> np.ndarray:
+        """직원 번호 배열 → 이름 배열"""
+        self._load_names()
+        return np.array(self._names, dtype=object)[employees]
+
+    def _record_count(self) -> int:
+        """데이터 파일의 완전한 레코드 수"""
+        if not os.path.exists(self.path):
+            return 0
+        return os.path.getsize(self.path) // RECORD_DTYPE.itemsize
+
+    def _employee_ids(self, names: List[str]) -> np.ndarray:
+        """이름 → 직원 번호 (새 이름은 .names 파일에 추가)"""
+        self._load_names()
+
+        new_names = []
+        for name in names:
+            key = normalize_name(name)
+            if key not in self._ids:
+                self._ids[key] = len(self._names)
+                self._names.append(name)
+                new_names.append(name)
+
+        if new_names:
+            with open(self.names_path, "a", encoding="utf-8") as f:
+                f.writelines(name + "\n" for name in new_names)
+
+        return np.array([self._ids[normalize_name(name)] for name in names], dtype=np.int32)
+
+    def _load_names(self):
+        """직원 번호표 불러오기 (한 번만)"""
+        if self._names is not None:
+            return
+
+        self._names = []
+        if os.path.exists(self.names_path):
+            with open(self.names_path, encoding="utf-8") as f:
+                self._names = [line.rstrip("\n") for line in f]
+        self._ids = {normalize_name(name): i for i, name in enumerate(self._names)}
+
+
+def _describe(record: np.void, name: str) -> str:
+    """결정 기록 한 건 설명"""
+    def show(value):
+        return "없음" if np.isnat(value) else str(value)
+
+    policies = ShiftPolicyResolver().policies
+    code = int(record["policy"])
+    policy = policies[code].name if 0 <= code < len(policies) else "알 수 없음"
+
+    return (
+        f"{name} ({record['run_date']})\n"
+        f"  입력: 오늘 출근={show(record['cin_today'])}, 오늘 퇴근={show(record['cout_today'])}, "
+        f"기록일={show(record['today_date'])}\n"
+        f"        전일 출근={show(record['cin_yest'])}, 전일 퇴근={show(record['cout_yest'])}, "
+        f"기록일={show(record['yest_date'])}\n"
+        f"        근무 형태={policy}\n"
+        f"  결과: 출근={MINUTE_STRING_ARRAY[record['check_in']] or '없음'}, "
+        f"퇴근={MINUTE_STRING_ARRAY[record['check_out']] or '없음'}, "
+        f"날짜={show(record['base_date'])}, 패턴={PATTERNS[record['pattern']]}"
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+    from logger import Logger
+    from attendance_engine import AttendanceEngine
+
+    parser = argparse.ArgumentParser(description="결정 기록 조회/다시 실행")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    show_cmd = sub.add_parser("show", help="특정 날짜/직원의 결정 근거")
+    show_cmd.add_argument("date")
+    show_cmd.add_argument("name")
+
+    replay_cmd = sub.add_parser("replay", help="기간 내 결정을 현재 엔진으로 다시 실행")
+    replay_cmd.add_argument("start")
+    replay_cmd.add_argument("end")
+    replay_cmd.add_argument("--roster", help="근무표 파일 (야간 판단에 사용)")
+    replay_cmd.add_argument("--output", help="차이를 저장할 Excel 파일")
+
+    args = parser.parse_args()
+    logger = Logger()
+    journal = DecisionJournal(logger)
+
+    if args.command == "show":
+        run_date = datetime.strptime(args.date, "%Y-%m-%d").date()
+        record = journal.find(run_date, args.name)
+        print(_describe(record, args.name) if record is not None else "기록 없음")
+    else:
+        start = datetime.strptime(args.start, "%Y-%m-%d").date()
+        end = datetime.strptime(args.end, "%Y-%m-%d").date()
+        roster = None
+        if args.roster:
+            from roster import ShiftRoster
+            roster = ShiftRoster.load(args.roster, logger)
+        diff = journal.replay(start, end, AttendanceEngine(None, logger, roster=roster))
+        if args.output and not diff.empty:
+            diff.to_excel(args.output, index=False, engine="openpyxl")
+        elif not diff.empty:
+            print(diff.to_string(index=False))
@@ -0,0 +1,114 @@
+"""
+근태 자동 입력 v3.0 - 출퇴근 결정표
+엔진의 케이스 분기를 6개 조건 비트(64가지)의 조회표로 컴파일
+
+조건 비트 (왼쪽부터):
+    오늘 출근 / 오늘 퇴근 / 오늘 야간 출근 / 전일 출근 / 전일 퇴근 / 전일 야간 출근
+
+새 케이스는 RULES에 한 줄 추가하면 됨 (위에서부터 첫 번째 일치)
+    python decision_table.py  → 전체 64칸 표 출력 (검토용)
+"""
+import numpy as np
+from models import PATTERNS, PATTERN_CODES
+
+FACTS = ("오늘출근", "오늘퇴근", "오늘야간", "전일출근", "전일퇴근", "전일야간")
+
+# 시간 출처 (engine의 분 배열 순서)
+SRC_NONE = 0
+SRC_TODAY_IN = 1
+SRC_TODAY_OUT = 2
+SRC_YEST_IN = 3
+SRC_YEST_OUT = 4
+
+# 기준 날짜 출처 (engine의 날짜 배열 순서)
+DATE_NONE = 0
+DATE_TODAY = 1       # 오늘 기록 날짜
+DATE_YEST = 2        # 전일 기록 날짜
+DATE_YEST_OUT = 3    # 전일 퇴근 시각의 날짜 (없으면 전일 기록 날짜)
+
+SOURCE_NAMES = {SRC_NONE: "-", SRC_TODAY_IN: "오늘출근", SRC_TODAY_OUT: "오늘퇴근", SRC_YEST_IN: "전일출근", SRC_YEST_OUT: "전일퇴근"}
+DATE_NAMES = {DATE_NONE: "-", DATE_TODAY: "오늘", DATE_YEST: "전일", DATE_YEST_OUT: "전일퇴근일"}
+
+# (조건 마스크, 패턴, 출근 출처, 퇴근 출처, 기준 날짜 출처)  - '?'는 무관
+RULES = [
+    # 케이스 1: 오늘 출근+퇴근 모두 있음
+    ("11????", "today_complete", SRC_TODAY_IN, SRC_TODAY_OUT, DATE_TODAY),
+    # 케이스 2: 오늘 출근만 있음 (주간/야간 × 전일 퇴근 유무)
+    ("100?1?", "today_checkin_with_prev_checkout", SRC_TODAY_IN, SRC_YEST_OUT, DATE_YEST_OUT),
+    ("100???", "today_checkin_only", SRC_TODAY_IN, SRC_NONE, DATE_TODAY),
+    ("101?1?", "night_shift", SRC_TODAY_IN, SRC_YEST_OUT, DATE_YEST_OUT),
+    ("101???", "night_shift_no_checkout", SRC_TODAY_IN, SRC_NONE, DATE_TODAY),
+    # 케이스 3: 오늘 퇴근만 있음 (전일 야간 근무)
+    ("01?1??", "prev_night_shift", SRC_YEST_IN, SRC_TODAY_OUT, DATE_YEST),
+    ("01????", "checkout_only", SRC_NONE, SRC_TODAY_OUT, DATE_TODAY),
+    # 케이스 4: 오늘 데이터 없음 - 전일 확인
+    ("00?111", "prev_night_shift_complete", SRC_YEST_IN, SRC_YEST_OUT, DATE_YEST_OUT),
+    ("00?110", "absent_with_prev_checkout", SRC_NONE, SRC_YEST_OUT, DATE_YEST_OUT),
+    ("00?10?", "prev_checkin_only_no_data", SRC_NONE, SRC_NONE, DATE_NONE),
+    # 나머지: 완전 결근
+    ("??????", "no_data", SRC_NONE, SRC_NONE, DATE_NONE),
+]
+
+
+def pack_mask(in_t, out_t, night_t, in_y, out_y, night_y):
+    """조건 비트 → 조회표 인덱스 (스칼라/배열 모두 가능)"""
+    return (
+        (np.asarray(in_t, dtype=np.int8) << 5)
+        | (np.asarray(out_t, dtype=np.int8) << 4)
+        | (np.asarray(night_t, dtype=np.int8) << 3)
+        | (np.asarray(in_y, dtype=np.int8) << 2)
+        | (np.asarray(out_y, dtype=np.int8) << 1)
+        | np.asarray(night_y, dtype=np.int8)
+    )
+
+
+def _matches(rule_mask: str, index: int) -> bool:
+    """인덱스가 규칙 마스크와 일치하는지"""
+    bits = format(index, "06b")
+    return all(r == "?" or r == b for r, b in zip(rule_mask, bits))
+
+
+def compile_table(rules=RULES):
+    """
+    규칙 목록 → 64칸 조회표
+
+    Returns:
+        (패턴 코드, 출근 출처, 퇴근 출처, 날짜 출처) 배열 4개
+    """
+    pattern = np.empty(64, dtype=np.int8)
+    in_source = np.empty(64, dtype=np.int8)
+    out_source = np.empty(64, dtype=np.int8)
+    date_source = np.empty(64, dtype=np.int8)
+
+    for index in range(64):
+        for rule_mask, name, src_in, src_out, src_date in rules:
+            if _matches(rule_mask, index):
+                pattern[index] = PATTERN_CODES[name]
+                in_source[index] = src_in
+                out_source[index] = src_out
+                date_source[index] = src_date
+                break
+        else:
+            raise ValueError(f"결정표에 일치하는 규칙이 없음: {format(index, '06b')}")
+
+    return pattern, in_source, out_source, date_source
+
+
+TABLE_PATTERN, TABLE_IN, TABLE_OUT, TABLE_DATE = compile_table()
+
+
+def format_table() -> str:
+    """결정표 전체를 검토용 문자열로"""
+    lines = ["  ".join(FACTS) + "  →  패턴 / 출근 / 퇴근 / 기준날짜"]
+    for index in range(64):
+        bits = "        ".join(format(index, "06b"))
+        lines.append(
+            f"{bits}  →  {PATTERNS[TABLE_PATTERN[index]]} / "
+            f"{SOURCE_NAMES[TABLE_IN[index]]} / {SOURCE_NAMES[TABLE_OUT[index]]} / "
+            f"{DATE_NAMES[TABLE_DATE[index]]}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_table())
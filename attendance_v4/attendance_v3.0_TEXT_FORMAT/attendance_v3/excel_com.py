@@ -3,31 +3,232 @@
 메모 서식 완벽 보존
 """
 
+from contextlib import contextmanager, nullcontext
 from datetime import date
-from config import RESET_DATE, RERODE_DATA_YEOJU, RERODE_DATA_SMC
+from typing import Dict
+from changeset import (
+    CLEAR, FORMULA, Changeset, ComSheets, SheetPlan, SheetSnapshot, plan_sheet, plan_workbook, sheet_spec,
+)
+from config import SHEET_NAME_FORMAT
+from models import DecisionSet, normalize_name
+from sheet_layout import SheetGrid, cell_areas, clear_addresses, join_addresses, layout_for, slot_name, write_area
 import os
+import time
+
+XL_CALCULATION_MANUAL = -4135
+
+
+class ExcelSession:
+    """Excel 실행 세션 (Excel.Application 하나로 여러 워크북을 열고 닫음)"""
+
+    def __init__(self, logger, application=None):
+        """
+        초기화
+
+        Args:
+            logger: 로거
+            application: Excel.Application 대신 쓸 객체 (fake_com.FakeExcel 등, None이면 win32com)
+        """
+        self.logger = logger
+        self.application = application
+        self.excel = None
+        self.workbooks = []
+
+    def __enter__(self):
+        """with 문 지원"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """with 문 종료 시 자동 close"""
+        self.close()
+
+    def start(self):
+        """Excel 시작 (이미 시작했으면 그대로)"""
+        if self.excel is not None:
+            return self
+
+        try:
+            if self.application is not None:
+                self.excel = self.application
+            else:
+                import win32com.client
+                import pythoncom
+
+                # COM 초기화
+                pythoncom.CoInitialize()
+
+                self.logger.debug("Excel COM 초기화 중...")
+                self.excel = win32com.client.Dispatch("Excel.Application")
+
+            self.excel.Visible = False
+            self.excel.DisplayAlerts = False
+            return self
+
+        except Exception as e:
+            self.logger.error(f"Excel COM 초기화 실패: {str(e)}")
+            self.logger.error("pywin32가 설치되어 있는지 확인하세요: pip install pywin32")
+            raise
+
+    def open(self, file_path: str) -> "ExcelCOM":
+        """
+        워크북 열기 (with 문으로 쓰면 끝날 때 워크북만 닫힘)
+
+        Args:
+            file_path: 엑셀 파일 경로
+        """
+        return ExcelCOM(file_path, self.logger, session=self).open()
+
+    def open_workbook(self, file_path: str):
+        """Workbooks.Open (세션이 닫힐 때 남은 워크북도 닫음)"""
+        self.start()
+        self.logger.debug(f"파일 열기: {file_path}")
+        workbook = self.excel.Workbooks.Open(file_path)
+        self.workbooks.append(workbook)
+        return workbook
+
+    def close_workbook(self, workbook):
+        """워크북 닫기 (저장하지 않음)"""
+        if workbook in self.workbooks:
+            self.workbooks.remove(workbook)
+        self.logger.debug("워크북 닫기")
+        workbook.Close(SaveChanges=False)
+
+    def close(self):
+        """남은 워크북 닫고 Excel 종료"""
+        try:
+            for workbook in list(self.workbooks):
+                self.close_workbook(workbook)
+
+            if self.excel:
+                self.logger.debug("Excel 종료")
+                self.excel.Quit()
+                self.excel = None
+
+                # COM 정리
+                if self.application is None:
+                    import pythoncom
+
+                    pythoncom.CoUninitialize()
+
+        except Exception as e:
+            self.logger.debug(f"Excel 종료 중 오류 (무시): {str(e)}")
+
+
+class PerformanceMode:
+    """
+    Excel 속도 설정 (with 문 안에서 화면 갱신/자동 계산/이벤트/상태 표시줄 끔)
+
+    바뀐 시트는 끝날 때 한 번만 계산하고, 원래 설정은 예외가 나도 되돌린다.
+    Excel은 계산 모드를 파일에 저장하므로 저장은 설정을 되돌린 뒤에 한다
+    (with excel.transaction(), excel.performance(): ... - 속도 설정이 안쪽).
+    단계별 소요 시간은 timings에 모아 끝날 때 로그로 남김.
+    """
+
+    SETTINGS = {
+        "ScreenUpdating": False,
+        "EnableEvents": False,
+        "DisplayStatusBar": False,
+        "Calculation": XL_CALCULATION_MANUAL,  # 워크북이 열려 있어야 바꿀 수 있음
+        "CalculateBeforeSave": False,          # 수동 계산 중 저장 때 전체 재계산 방지 (저장 전에 되돌림)
+    }
+
+    def __init__(self, excel, logger):
+        """
+        초기화
+
+        Args:
+            excel: Excel.Application
+            logger: 로거
+        """
+        self.excel = excel
+        self.logger = logger
+        self.saved: Dict[str, object] = {}
+        self.timings: Dict[str, float] = {}
+        self.pending = []
+
+    def __enter__(self):
+        for key, value in self.SETTINGS.items():
+            try:
+                self.saved[key] = getattr(self.excel, key)
+                setattr(self.excel, key, value)
+            except Exception as e:
+                self.logger.debug(f"Excel 설정 변경 실패 ({key}): {str(e)}")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                self.recalculate()
+        finally:
+            self.restore()
+
+            if self.timings:
+                self.logger.info("Excel 단계별 시간: " + ", ".join(
+                    f"{name} {seconds:.2f}초" for name, seconds in self.timings.items()
+                ))
+
+    @contextmanager
+    def phase(self, name: str):
+        """단계 시간 기록 (같은 이름은 합산)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+
+    def restore(self):
+        """원래 설정으로 되돌림 (한 번만 - 이후 __exit__에서는 아무것도 안 함)"""
+        for key, value in reversed(list(self.saved.items())):
+            try:
+                setattr(self.excel, key, value)
+            except Exception as e:
+                self.logger.warning(f"Excel 설정 복원 실패 ({key}): {str(e)}")
+        self.saved = {}
+
+    def touch(self, sheet):
+        """다시 계산할 시트 등록"""
+        if all(sheet is not pending for pending in self.pending):
+            self.pending.append(sheet)
+
+    def recalculate(self):
+        """등록된 시트만 한 번씩 계산"""
+        if not self.pending:
+            return
+        with self.phase("재계산"):
+            for sheet in self.pending:
+                sheet.Calculate()
+        self.pending = []
 
 
 class ExcelCOM:
-    """Excel COM 핸들러"""
+    """Excel COM 핸들러 (워크북 하나 - Excel은 ExcelSession이 관리)"""
 
-    def __init__(self, file_path: str, logger):
+    def __init__(self, file_path: str, logger, application=None, session: ExcelSession = None):
         """
         초기화
 
         Args:
             file_path: 엑셀 파일 경로
             logger: 로거
+            application: Excel.Application 대신 쓸 객체 (session이 없을 때만)
+            session: 공유 Excel 세션 (None이면 이 워크북만의 세션을 열고 닫음)
         """
         self.file_path = os.path.abspath(file_path)
         self.logger = logger
+        self.session = session or ExcelSession(logger, application)
+        self.owns_session = session is None
         self.excel = None
         self.workbook = None
         self.sheet = None
+        self.perf = None
+        self.rolled_back = False
+        self.dirty = False  # 저장할 변경이 있는지 (transaction()은 있을 때만 저장)
 
     def __enter__(self):
         """with 문 지원"""
-        self.open()
+        if self.workbook is None:
+            self.open()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -35,32 +236,71 @@ class ExcelCOM:
         self.close()
 
     def open(self):
-        """Excel 열기"""
-        try:
-            import win32com.client
-            import pythoncom
+        """워크북 열기"""
+        self.excel = self.session.start().excel
+        self.workbook = self.session.open_workbook(self.file_path)
+        self.rolled_back = False
+        self.dirty = False
+        return self
 
-            # COM 초기화
-            pythoncom.CoInitialize()
+    @contextmanager
+    def performance(self):
+        """
+        속도 설정 안에서 작업 (with excel.performance(): ...)
 
-            self.logger.debug("Excel COM 초기화 중...")
-            self.excel = win32com.client.Dispatch("Excel.Application")
-            self.excel.Visible = False
-            self.excel.DisplayAlerts = False
+        Yields:
+            PerformanceMode (단계별 시간은 timings)
+        """
+        with PerformanceMode(self.excel, self.logger) as perf:
+            self.perf = perf
+            try:
+                yield perf
+            finally:
+                self.perf = None
 
-            self.logger.debug(f"파일 열기: {self.file_path}")
-            self.workbook = self.excel.Workbooks.Open(self.file_path)
+    def _phase(self, name: str):
+        """속도 설정 중이면 단계 시간 기록"""
+        return self.perf.phase(name) if self.perf else nullcontext()
 
-            return self
+    @contextmanager
+    def transaction(self):
+        """
+        워크북 변경을 끝에 한 번만 저장 (with excel.transaction(), excel.performance(): ...)
 
-        except Exception as e:
-            self.logger.error(f"Excel COM 초기화 실패: {str(e)}")
-            self.logger.error("pywin32가 설치되어 있는지 확인하세요: pip install pywin32")
+        with 문 안의 시트 추가/지우기/입력은 열린 워크북에만 하고, 끝날 때 한 번 저장한다.
+        바뀐 셀이 없으면 (같은 날짜 다시 실행) 저장도 하지 않음.
+        속도 설정은 안쪽에 두어 자동 계산 등을 되돌린 뒤 저장되게 한다.
+        도중에 실패하면 저장하지 않고 닫아서 파일은 이전 상태 그대로 남음.
+        """
+        try:
+            yield self
+            self.commit()
+        except BaseException:
+            self.rollback()
             raise
 
+    def commit(self) -> bool:
+        """
+        변경이 있을 때만 저장
+
+        Returns:
+            저장했는지
+        """
+        if not self.dirty:
+            self.logger.info(f"변경 없음 - 저장 생략: {os.path.basename(self.file_path)}")
+            return False
+        self.save()
+        return True
+
+    def rollback(self):
+        """변경 취소 (이후 저장하지 않음 - close()에서 저장하지 않고 닫힘)"""
+        if self.workbook is not None and not self.rolled_back:
+            self.logger.warning(f"변경 취소 (저장하지 않음): {os.path.basename(self.file_path)}")
+        self.rolled_back = True
+
     def prepare_sheet(self, sheet_name: str, clear_ranges: list):
         """
-        시트 준비: 복사 + 셀 지우기
+        시트 준비: 복사 + 셀 지우기 (저장은 transaction()이 끝날 때 한 번)
 
         Args:
             sheet_name: 새 시트 이름
@@ -70,16 +310,26 @@ class ExcelCOM:
             생성된 시트 이름
         """
         # 1. 시트 복사
-        self._copy_last_sheet(sheet_name)
+        self.copy_sheet(sheet_name)
 
         # 2. 셀 지우기
-        self._clear_ranges(clear_ranges)
-
-        # 3. 저장
-        self.save()
+        self.clear_ranges(clear_ranges)
 
         return sheet_name
 
+    def copy_sheet(self, sheet_name: str):
+        """마지막 시트를 복사해 현재 시트로 (같은 이름이 있으면 그 시트)"""
+        with self._phase("시트 준비"):
+            self._copy_last_sheet(sheet_name)
+
+        if self.perf:
+            self.perf.touch(self.sheet)
+
+    def clear_ranges(self, ranges: list):
+        """현재 시트의 범위 지우기"""
+        with self._phase("시트 준비"):
+            self._clear_ranges(ranges)
+
     def _copy_last_sheet(self, new_name: str):
         """마지막 시트 복사"""
         try:
@@ -100,6 +350,7 @@ class ExcelCOM:
 
             # 시트 복사
             last_sheet.Copy(Before=None, After=last_sheet)
+            self.dirty = True
 
             # 복사된 시트 (마지막 위치에 생성됨)
             self.sheet = self.workbook.Worksheets(self.workbook.Worksheets.Count)
@@ -121,220 +372,228 @@ class ExcelCOM:
             raise
 
     def _clear_ranges(self, ranges: list):
-        """셀 값 지우기"""
+        """셀 값 지우기 (여러 영역 주소로 한 번에, 셀 수는 설정에서 계산)"""
         try:
-            cleared = 0
+            addresses, cleared = clear_addresses(ranges)
 
-            for rng in ranges:
-                self.sheet.Range(rng).ClearContents()
-                cleared += self.sheet.Range(rng).Cells.Count
+            for address in addresses:
+                self.sheet.Range(address).ClearContents()
+            self.dirty = True
 
             self.logger.info(f"셀 지우기 완료: {cleared}개")
 
         except Exception as e:
             self.logger.warning(f"셀 지우기 실패: {str(e)}")
 
-    def write_attendance(self, blocks: list, today_map: dict, yesterday_map: dict, engine):
+    def write_attendance(self, blocks: list, decisions):
         """
         출퇴근 데이터 입력
 
         Args:
             blocks: [(이름범위, 출근범위, 퇴근범위), ...]
-            today_map: 오늘 맵
-            yesterday_map: 전일 맵
-            engine: AttendanceEngine
+            decisions: DecisionSet (AttendanceEngine.decide_all 결과 - 조회만 함)
         """
+        with self._phase("입력"):
+            self._write_attendance(blocks, decisions)
+
+        if self.perf:
+            self.perf.touch(self.sheet)
+
+    def _write_attendance(self, blocks: list, decisions):
+        """출퇴근 데이터 입력 (write_attendance 본문 - 현재 시트 변경 계획 후 적용)"""
         try:
-            self.logger.info("출퇴근 데이터 입력 중...")
+            spec = sheet_spec(self.file_path, blocks, [])
+            sheets = ComSheets(self.workbook)
+            name = self.sheet.Name
+            before = SheetSnapshot.read(self.sheet, spec.area)
+            plan = plan_sheet(spec, name, None, before, sheets.previous(name), decisions, self.logger)
+            self._apply_sheet(plan)
 
-            # === 0) 파일명 기준 여주 / SMC 구분 ===
-            path_lower = self.file_path.lower()
-            is_yeoju = ("yj" in path_lower) or ("여주" in path_lower) or ("yeoju" in path_lower)
-            is_smc   = ("smc" in path_lower)
+            self.logger.separator()
+            self.logger.success("출퇴근 데이터 입력 완료")
+            self.logger.info(f"  처리: {plan.processed}명")
+            self.logger.info(f"  입력: {plan.filled}건")
+            self.logger.separator()
 
-            self.logger.debug(f"is_yeoju={is_yeoju}, is_smc={is_smc}")
+        except Exception as e:
+            self.logger.error(f"데이터 입력 실패: {str(e)}")
+            raise
 
-            # === 1) 기준일 계산 ===
-            base_date = getattr(engine, "base_date", None)
-            if base_date is None:
-                base_date = date.today()
+    def correct(self, blocks: list, corrections: dict, decisions: Dict[date, DecisionSet]) -> int:
+        """
+        수정 데이터 재입력 (기준 날짜 시트마다 블록을 한 번 읽고 바뀐 범위만 씀)
 
-            # RESET_DATE용: YYYY-MM-DD 형식
-            reset_date_str = base_date.strftime("%Y-%m-%d")
+        Args:
+            blocks: 블록 리스트
+            corrections: {기준 날짜: {정규화된 이름: (이름, 수정_출근, 수정_퇴근)}}
+            decisions: {기준 날짜: 출퇴근 결정 결과} (로그의 기존 값 - 재계산 없음)
 
-            # === 1-1) 현재 시트/이전 시트 이름 가져오기 ===
-            cur_sheet = self.sheet
-            wb = self.workbook
-            prev_sheet_name = None
+        Returns:
+            입력한 셀 수
+        """
+        filled = 0
+        layout = layout_for(blocks)
+
+        for base_date, day_corrections in sorted(corrections.items()):
+            sheet_name = base_date.strftime(SHEET_NAME_FORMAT)
+            self.sheet = self.workbook.Worksheets(sheet_name)
+            day_decisions = decisions.get(base_date)
+            found = set()
+
+            grid = layout.read(self.sheet)
+            for row, name_col, in_col, out_col in layout.slots:
+                key = normalize_name(slot_name(grid.get(row, name_col)) or "")
+                if key not in day_corrections or key in found:
+                    continue
+
+                name_val, cin, cout = day_corrections[key]
+                if cin:
+                    grid.set(row, in_col, cin)
+                    filled += 1
+                if cout:
+                    grid.set(row, out_col, cout)
+                    filled += 1
+
+                previous = day_decisions.get(name_val) if day_decisions else None
+                before = f" (기존: {previous.check_in or '없음'}/{previous.check_out or '없음'})" if previous else ""
+                self.logger.info(f"  [{sheet_name}] {name_val}: 출근={cin or '없음'}, 퇴근={cout or '없음'}{before}")
+                found.add(key)
+
+            with self._phase("입력"):
+                if layout.write(self.sheet, grid):
+                    self.dirty = True
+            if self.perf:
+                self.perf.touch(self.sheet)
+
+            for key, (name_val, _, _) in day_corrections.items():
+                if key not in found:
+                    self.logger.warning(f"  [{sheet_name}] {name_val}: 이름을 찾을 수 없음")
+
+        self.logger.success(f"재입력 완료: {filled}건 ({os.path.basename(self.file_path)})")
+        return filled
+
+    def plan(self, blocks: list, clear_ranges: list, decisions: Dict[date, DecisionSet]) -> Changeset:
+        """
+        기준 날짜별 시트 변경 계획 (시트마다 한 번씩 읽기만 하고 쓰지 않음)
 
-            try:
-                if cur_sheet.Index > 1:
-                    prev_sheet = wb.Worksheets(cur_sheet.Index - 1)
-                    prev_sheet_name = prev_sheet.Name
-                    self.logger.debug(f"이전 시트 이름: {prev_sheet_name!r}")
-                else:
-                    self.logger.debug("이전 시트 없음 (첫 번째 시트)")
-            except Exception as e:
-                self.logger.warning(f"이전 시트 이름 가져오기 실패: {e}")
-
-            self.logger.debug(
-                f"기준일: {reset_date_str}, 이전 시트: {prev_sheet_name}"
-            )
-
-            # === 2) RESET_DATE 셀들에 기준일 쓰기 (여주/SMC 공통) ===
-            for addr in RESET_DATE:
-                try:
-                    self.sheet.Range(addr).Value = reset_date_str
-                    self.logger.debug(f"RESET_DATE: {addr} <- {reset_date_str}")
-                except Exception as e:
-                    self.logger.warning(f"RESET_DATE 입력 실패 ({addr}): {e}")
-
-            # === 3) 여주 전용: 이전 시트의 W37 참조 ===
-            if is_yeoju and prev_sheet_name:
-                for addr in RERODE_DATA_YEOJU:
-                    try:
-                        ref_addr = "W37"  # 여주에서 참조할 셀 주소
-                        formula = f"='{prev_sheet_name}'!{ref_addr}"
-
-                        self.logger.debug(f"prev_sheet_name raw: {repr(prev_sheet_name)}")
-                        self.logger.debug(f"formula: {repr(formula)}")
-
-                        cell = self.sheet.Range(addr)
-                        cell.Formula = formula
-                        self.logger.debug(f"RERODE_DATA_YEOJU: {addr} <- {cell.Formula}")
-
-                    except Exception as e:
-                        self.logger.warning(
-                            f"RERODE_DATA_YEOJU 수식 입력 실패 ({addr}): {e}"
-                        )
-
-            # === 4) SMC 전용: 이전 시트의 T31 참조 ===
-            if is_smc and prev_sheet_name:
-                for addr in RERODE_DATA_SMC:
-                    try:
-                        ref_addr = "T31"  # SMC에서 참조할 셀 주소
-                        formula = f"='{prev_sheet_name}'!{ref_addr}"
-
-                        self.logger.debug(f"prev_sheet_name raw: {repr(prev_sheet_name)}")
-                        self.logger.debug(f"formula: {repr(formula)}")
-
-                        cell = self.sheet.Range(addr)
-                        cell.Formula = formula
-                        self.logger.debug(f"RERODE_DATA_SMC: {addr} <- {cell.Formula}")
-
-                    except Exception as e:
-                        self.logger.warning(
-                            f"RERODE_DATA_SMC 수식 입력 실패 ({addr}): {e}"
-                        )
-
-            # === 5) 기존 출퇴근 입력 로직 ===
-            filled = 0
-            processed = 0
-
-            for block_idx, (name_range, in_range, out_range) in enumerate(blocks, 1):
-                self.logger.debug(f"블록 {block_idx}/{len(blocks)} 처리: {name_range}")
-
-                # 범위 가져오기
-                name_cells = self.sheet.Range(name_range)
-                in_cells = self.sheet.Range(in_range)
-                out_cells = self.sheet.Range(out_range)
-
-                # 각 행 처리
-                for i in range(1, name_cells.Rows.Count + 1):
-                    processed += 1
-
-                    name = str(name_cells.Cells(i, 1).Value or "").strip()
-                    if not name or name == "None":
-                        continue
-
-                    # 디버깅: 이름 출력
-                    self.logger.debug(f"  처리 중: '{name}'")
-
-                    # 맵에서 이름 찾기 (대소문자 무시, 공백 제거)
-                    name_normalized = name.replace(" ", "").lower()
-
-                    found_in_today = False
-                    found_in_yesterday = False
-
-                    for map_name in today_map.keys():
-                        if map_name.replace(" ", "").lower() == name_normalized:
-                            found_in_today = True
-                            self.logger.debug(f"    오늘 맵에서 발견: '{map_name}'")
-                            break
-
-                    for map_name in yesterday_map.keys():
-                        if map_name.replace(" ", "").lower() == name_normalized:
-                            found_in_yesterday = True
-                            self.logger.debug(f"    전일 맵에서 발견: '{map_name}'")
-                            break
-
-                    if not found_in_today and not found_in_yesterday:
-                        self.logger.warning(
-                            f"    '{name}': 원시 데이터에서 찾을 수 없음"
-                        )
-                        continue
-
-                    # 출퇴근 시간 결정
-                    result = engine.decide_times(name, today_map, yesterday_map)
-
-                    # 셀에 쓰기 (텍스트 형식으로 강제)
-                    if result.check_in:
-                        in_cells.Cells(i, 1).Value = "'" + result.check_in
-                        filled += 1
-                    if result.check_out:
-                        out_cells.Cells(i, 1).Value = "'" + result.check_out
-                        filled += 1
-
-                    # 로그 (데이터 있을 때만)
-                    if result.check_in or result.check_out:
-                        date_str = (
-                            result.base_date.strftime("%Y-%m-%d")
-                            if result.base_date
-                            else "N/A"
-                        )
-                        self.logger.info(
-                            f"  {name}: 출근={result.check_in or '없음'}, "
-                            f"퇴근={result.check_out or '없음'}, "
-                            f"날짜={date_str}, 패턴={result.pattern}"
-                        )
+        Args:
+            blocks: 블록 리스트
+            clear_ranges: 지울 범위
+            decisions: {기준 날짜: 출퇴근 결정 결과}
+        """
+        with self._phase("계획"):
+            return plan_workbook(self.file_path, ComSheets(self.workbook), blocks, clear_ranges, decisions, self.logger)
 
-            self.logger.separator()
-            self.logger.success("출퇴근 데이터 입력 완료")
-            self.logger.info(f"  처리: {processed}명")
-            self.logger.info(f"  입력: {filled}건")
-            self.logger.separator()
+    def apply(self, changeset: Changeset) -> int:
+        """
+        변경 계획 적용 (시트마다 복사 → 지우기 → 블록 사각형 → 나머지 셀)
+
+        이미 있는 시트에 바뀐 셀이 없으면 건너뜀 (같은 날짜 다시 실행).
+
+        Returns:
+            적용한 셀 변경 수
+        """
+        try:
+            for plan in changeset.plans:
+                if not plan.source and not plan.changes:
+                    self.logger.info(f"[{plan.sheet}] 변경 없음 - 건너뜀")
+                    continue
+
+                with self._phase("시트 준비"):
+                    if plan.source:
+                        self._copy_last_sheet(plan.sheet)
+                    else:
+                        self.sheet = self.workbook.Worksheets(plan.sheet)
+
+                with self._phase("입력"):
+                    self._apply_sheet(plan)
+
+                if self.perf:
+                    self.perf.touch(self.sheet)
+
+            if not self.dirty:
+                self.logger.info(f"변경 없음: 시트 {len(changeset.plans)}개 모두 근태표와 같음")
+                return 0
+            self.logger.success(f"변경 적용 완료: 시트 {len(changeset.plans)}개, 셀 {len(changeset)}개")
+            return len(changeset)
 
         except Exception as e:
-            self.logger.error(f"데이터 입력 실패: {str(e)}")
+            self.logger.error(f"변경 적용 실패: {str(e)}")
             raise
 
+    def _apply_sheet(self, plan: SheetPlan):
+        """시트 하나의 변경 적용 (현재 시트)"""
+        if not plan.changes:
+            return
+        self.dirty = True
+
+        layout = plan.spec.layout
+        bounds = layout.bounds
+
+        # 블록 사각형: 바뀐 셀이 든 사각형만 쓰기 (사각형 안의 지울 셀도 함께)
+        # 바뀐 셀이 몇 개뿐이면 (다시 실행) 사각형 대신 그 셀만
+        grid = SheetGrid(layout, plan.before.block(bounds), plan.after.block(bounds))
+        areas = layout.areas_for(change.cell for change in plan.changes)
+
+        def covered(cell):
+            return any(r1 <= cell[0] <= r2 and c1 <= cell[1] <= c2 for r1, c1, r2, c2 in areas)
+
+        rest = [change for change in plan.changes if not covered(change.cell)]
+
+        # 지우기 (여러 영역 주소로 한 번에)
+        clears = [change.cell for change in rest if change.kind == CLEAR]
+        if clears:
+            for address in join_addresses(cell_areas(clears)):
+                self.sheet.Range(address).ClearContents()
+            self.logger.info(f"셀 지우기 완료: {len(clears)}개")
+
+        writes = sum(write_area(self.sheet, grid, area) for area in areas)
+        self.logger.debug(f"블록 쓰기: {writes}회 ({len(areas)}개 범위, 쓰기 사각형 {len(layout.write_areas)}개)")
+
+        # 기준일/이전 시트 참조
+        for change in rest:
+            if change.kind == CLEAR:
+                continue
+            try:
+                if change.kind == FORMULA:
+                    self.sheet.Range(change.address).Formula = change.new
+                else:
+                    self.sheet.Range(change.address).Value = change.new
+                self.logger.debug(f"{change.address} <- {change.new}")
+            except Exception as e:
+                self.logger.warning(f"셀 입력 실패 ({change.address}): {e}")
+
     def save(self):
         """저장 (메모 서식 완벽 보존!)"""
+        if self.rolled_back:
+            raise RuntimeError("변경이 취소된 워크북은 저장할 수 없습니다")
+
         try:
+            # 아직 속도 설정 중이면 바뀐 시트를 계산하고 원래 설정으로 되돌린 뒤 저장
+            # (계산 모드도 파일에 저장되므로 수동 계산인 채로 저장하지 않음)
+            if self.perf:
+                self.perf.recalculate()
+                self.perf.restore()
+
             self.logger.debug("파일 저장 중...")
-            self.workbook.Save()
+            with self._phase("저장"):
+                self.workbook.Save()
+            self.dirty = False
             self.logger.success("파일 저장 완료")
         except Exception as e:
             self.logger.error(f"파일 저장 실패: {str(e)}")
             raise
 
     def close(self):
-        """Excel 종료"""
+        """워크북 닫기 (자체 세션이면 Excel도 종료)"""
         try:
             if self.workbook:
-                self.logger.debug("워크북 닫기")
-                self.workbook.Close(SaveChanges=False)
+                self.session.close_workbook(self.workbook)
                 self.workbook = None
 
-            if self.excel:
-                self.logger.debug("Excel 종료")
-                self.excel.Quit()
-                self.excel = None
-
-            # COM 정리
-            import pythoncom
-
-            pythoncom.CoUninitialize()
-
         except Exception as e:
-            self.logger.debug(f"Excel 종료 중 오류 (무시): {str(e)}")
+            self.logger.debug(f"워크북 닫기 중 오류 (무시): {str(e)}")
+
+        if self.owns_session:
+            self.session.close()
+        self.excel = None
@@ -0,0 +1,439 @@
+"""
+근태 자동 입력 v3.0 - 가짜 Excel COM
+Excel 없이(Linux 등) ExcelCOM 동작과 COM 호출 횟수를 확인하기 위한 대체 객체
+
+    python fake_com.py              # 여주 근태표 입력의 COM 호출 수
+    python fake_com.py --latency 2  # 호출당 2ms 지연으로 소요 시간 비교
+
+COM 객체 모양(Workbooks.Open, Worksheets(i), Range(...).Value 등)만 흉내 낸다.
+수식은 계산하지 않고, 셀 서식/메모는 없음.
+coerce=True면 Excel처럼 "'" 없이 쓴 숫자/시간/날짜 모양 텍스트를 값으로 바꿔 저장한다.
+병합 셀(FakeSheet.merged)에 일부만 걸치게 쓰면 Excel처럼 실패한다.
+워크북은 files에 보관하며 Open은 복사본을 열고 Save에서만 반영된다.
+"""
+import copy
+import os
+import re
+import time
+from collections import Counter
+from datetime import date
+from typing import Dict, List, Tuple
+
+from sheet_layout import ADDRESS_LIMIT, parse_area, area_address
+
+XL_CALCULATION_AUTOMATIC = -4105
+_EXCEL_EPOCH = date(1899, 12, 30)
+
+
+def coerce_text(value):
+    """
+    Excel이 셀에 쓸 때 하는 텍스트 변환 흉내 ("'"로 시작하지 않는 텍스트만)
+
+        "001" → 1, "1.5" → 1.5, "08:30" → 0.354... (하루 중 비율),
+        "2025-11-05" / "11/5/2025" / "1-2" → 날짜 일련번호 (연도가 없으면 올해)
+    """
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if re.fullmatch(r"[+-]?\d+", text):
+        return int(text)
+    if re.fullmatch(r"[+-]?\d*\.\d+", text):
+        return float(text)
+    match = re.fullmatch(r"(\d{1,2}):(\d{2})(?::(\d{2}))?", text)
+    if match:
+        h, m, s = (int(part or 0) for part in match.groups())
+        return (h * 3600 + m * 60 + s) / 86400
+    match = re.fullmatch(r"(\d{4})-(\d{1,2})-(\d{1,2})", text)
+    if match:
+        y, m, d = (int(part) for part in match.groups())
+        return _date_serial(y, m, d, value)
+    match = re.fullmatch(r"(\d{1,2})[-/](\d{1,2})(?:[-/](\d{4}))?", text)
+    if match:
+        m, d, y = match.groups()
+        return _date_serial(int(y or date.today().year), int(m), int(d), value)
+    return value
+
+
+def _date_serial(year: int, month: int, day: int, text: str):
+    try:
+        return (date(year, month, day) - _EXCEL_EPOCH).days
+    except ValueError:
+        return text
+
+
+class FakeExcel:
+    """가짜 Excel.Application"""
+
+    def __init__(self, files: Dict[str, "FakeWorkbook"] = None, latency: float = 0.0, coerce: bool = False):
+        """
+        초기화
+
+        Args:
+            files: {경로: FakeWorkbook} (디스크 대신, 절대 경로로 보관)
+            latency: COM 호출 1회당 지연 (초)
+            coerce: Excel처럼 숫자/시간/날짜 모양 텍스트를 값으로 바꿔 저장 (coerce_text)
+        """
+        self.files = {os.path.abspath(path): workbook for path, workbook in (files or {}).items()}
+        self.latency = latency
+        self.coerce = coerce
+        self.calls = Counter()
+        self.Visible = True
+        self.DisplayAlerts = True
+        self.ScreenUpdating = True
+        self.EnableEvents = True
+        self.DisplayStatusBar = True
+        self.Calculation = XL_CALCULATION_AUTOMATIC
+        self.CalculateBeforeSave = True
+        self.Workbooks = _Workbooks(self)
+
+    def tick(self, kind: str):
+        """COM 호출 1회 기록"""
+        self.calls[kind] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def call_count(self) -> int:
+        return sum(self.calls.values())
+
+    def Quit(self):
+        self.tick("Quit")
+
+
+class _Workbooks:
+    def __init__(self, app: FakeExcel):
+        self._app = app
+
+    def Open(self, path: str) -> "FakeWorkbook":
+        self._app.tick("Workbooks.Open")
+        path = os.path.abspath(path)
+        if path not in self._app.files:
+            raise FileNotFoundError(path)
+        workbook = copy.deepcopy(self._app.files[path])
+        workbook.attach(self._app, path)
+        return workbook
+
+
+class FakeWorkbook:
+    """가짜 Workbook"""
+
+    def __init__(self, sheets: Dict[str, Dict[str, object]] = None):
+        """
+        초기화
+
+        Args:
+            sheets: {시트 이름: {"A1": 값, ...}} (순서대로)
+        """
+        self.app = None
+        self.path = None
+        self.saved = 0
+        self.sheets: List["FakeSheet"] = []
+        for name, values in (sheets or {}).items():
+            sheet = FakeSheet(self, name)
+            for address, value in values.items():
+                r, c, _, _ = parse_area(address)
+                sheet.cells[(r, c)] = value
+            self.sheets.append(sheet)
+        self.Worksheets = _Worksheets(self)
+
+    def attach(self, app: FakeExcel, path: str):
+        self.app = app
+        self.path = path
+
+    def __deepcopy__(self, memo):
+        clone = FakeWorkbook()
+        for sheet in self.sheets:
+            copied = FakeSheet(clone, sheet.Name)
+            copied.cells = dict(sheet.cells)
+            copied.formulas = dict(sheet.formulas)
+            copied.merged = list(sheet.merged)
+            clone.sheets.append(copied)
+        return clone
+
+    def Save(self):
+        self.app.tick("Save")
+        self.saved += 1
+        self.app.files[self.path] = copy.deepcopy(self)
+
+    def Close(self, SaveChanges=False):
+        self.app.tick("Close")
+        if SaveChanges:
+            self.Save()
+
+    def sheet(self, name: str) -> "FakeSheet":
+        """이름으로 시트 (COM 호출로 세지 않음 - 확인용)"""
+        for sheet in self.sheets:
+            if sheet.Name == name:
+                return sheet
+        raise KeyError(name)
+
+
+class _Worksheets:
+    def __init__(self, workbook: FakeWorkbook):
+        self._workbook = workbook
+
+    def __call__(self, key):
+        self._workbook.app.tick("Worksheets")
+        sheets = self._workbook.sheets
+        if isinstance(key, int):
+            if not 1 <= key <= len(sheets):
+                raise IndexError(key)
+            return sheets[key - 1]
+        return self._workbook.sheet(key)
+
+    @property
+    def Count(self) -> int:
+        self._workbook.app.tick("Worksheets.Count")
+        return len(self._workbook.sheets)
+
+
+class FakeSheet:
+    """가짜 Worksheet"""
+
+    def __init__(self, workbook: FakeWorkbook, name: str):
+        self.workbook = workbook
+        self._name = name
+        self.cells: Dict[Tuple[int, int], object] = {}
+        self.formulas: Dict[Tuple[int, int], str] = {}
+        self.merged: List[Tuple[int, int, int, int]] = []  # 병합 셀 (시작 행, 시작 열, 끝 행, 끝 열)
+
+    @property
+    def Name(self) -> str:
+        return self._name
+
+    @Name.setter
+    def Name(self, value: str):
+        if any(sheet is not self and sheet.Name == value for sheet in self.workbook.sheets):
+            raise ValueError(f"같은 이름의 시트가 있습니다: {value}")
+        self._name = value
+
+    @property
+    def Index(self) -> int:
+        return self.workbook.sheets.index(self) + 1
+
+    def Range(self, address: str) -> "FakeRange":
+        self.workbook.app.tick("Range")
+        if len(address) > ADDRESS_LIMIT:
+            raise ValueError(f"주소가 {ADDRESS_LIMIT}자를 넘습니다: {len(address)}자")
+        return FakeRange(self, *[parse_area(part) for part in address.split(",")])
+
+    def Copy(self, Before=None, After=None):
+        self.workbook.app.tick("Copy")
+        copied = FakeSheet(self.workbook, self._unique_name())
+        copied.cells = dict(self.cells)
+        copied.formulas = dict(self.formulas)
+        copied.merged = list(self.merged)
+        anchor = After or Before or self
+        position = self.workbook.sheets.index(anchor) + (1 if After is not None or Before is None else 0)
+        self.workbook.sheets.insert(position, copied)
+
+    def _unique_name(self) -> str:
+        names = {sheet.Name for sheet in self.workbook.sheets}
+        i = 2
+        while f"{self.Name} ({i})" in names:
+            i += 1
+        return f"{self.Name} ({i})"
+
+    def Calculate(self):
+        self.workbook.app.tick("Calculate")
+
+    def value(self, address: str):
+        """셀 값 (COM 호출로 세지 않음 - 확인용)"""
+        r, c, _, _ = parse_area(address)
+        return self.cells.get((r, c))
+
+    def formula(self, address: str):
+        """셀 수식 (COM 호출로 세지 않음 - 확인용)"""
+        r, c, _, _ = parse_area(address)
+        return self.formulas.get((r, c))
+
+
+class FakeRange:
+    """가짜 Range (여러 영역이면 Value/Formula/Cells는 첫 영역 - Excel과 같음)"""
+
+    def __init__(self, sheet: FakeSheet, *areas: Tuple[int, int, int, int]):
+        self._sheet = sheet
+        self._areas = areas
+        self._area = areas[0]
+
+    def _tick(self, kind: str):
+        self._sheet.workbook.app.tick(kind)
+
+    def _positions(self):
+        r1, c1, r2, c2 = self._area
+        return [[(r, c) for c in range(c1, c2 + 1)] for r in range(r1, r2 + 1)]
+
+    @property
+    def Value(self):
+        self._tick("Value.get")
+        grid = tuple(tuple(self._sheet.cells.get(pos) for pos in row) for row in self._positions())
+        return grid[0][0] if len(grid) == 1 and len(grid[0]) == 1 else grid
+
+    @Value.setter
+    def Value(self, value):
+        self._tick("Value.set")
+        self._check_merged()
+        positions = self._positions()
+        if not isinstance(value, (tuple, list)):
+            value = [[value] * len(positions[0])] * len(positions)
+        for row_positions, row_values in zip(positions, value):
+            for pos, cell in zip(row_positions, row_values):
+                self._set(pos, cell)
+
+    @property
+    def Formula(self):
+        self._tick("Formula.get")
+        grid = tuple(
+            tuple(self._sheet.formulas.get(pos, self._sheet.cells.get(pos, "")) for pos in row)
+            for row in self._positions()
+        )
+        return grid[0][0] if len(grid) == 1 and len(grid[0]) == 1 else grid
+
+    @Formula.setter
+    def Formula(self, value):
+        self._tick("Formula.set")
+        self._check_merged()
+        positions = self._positions()
+        if not isinstance(value, (tuple, list)):
+            value = [[value] * len(positions[0])] * len(positions)
+        for row_positions, row_values in zip(positions, value):
+            for pos, cell in zip(row_positions, row_values):
+                self._set(pos, cell)
+
+    def _check_merged(self):
+        """병합 셀의 일부만 걸치면 실패 (Excel: 병합된 셀의 일부를 변경할 수 없습니다)"""
+        r1, c1, r2, c2 = self._area
+        for m1, n1, m2, n2 in self._sheet.merged:
+            overlaps = m1 <= r2 and r1 <= m2 and n1 <= c2 and c1 <= n2
+            inside = r1 <= m1 and m2 <= r2 and c1 <= n1 and n2 <= c2
+            if overlaps and not inside:
+                raise RuntimeError(f"병합된 셀의 일부를 변경할 수 없습니다: {area_address((m1, n1, m2, n2))}")
+
+    def _set(self, pos, value):
+        """셀 하나 쓰기 ("="로 시작하는 문자열은 수식, 앞의 "'"는 텍스트 표시라 저장 안 함 - Excel과 같음)"""
+        self._sheet.formulas.pop(pos, None)
+        self._sheet.cells.pop(pos, None)
+        if isinstance(value, str) and value.startswith("'"):
+            value = value[1:]
+        elif self._sheet.workbook.app.coerce:
+            value = coerce_text(value)
+        if isinstance(value, str) and value.startswith("="):
+            self._sheet.formulas[pos] = value
+        elif value is not None and value != "":
+            self._sheet.cells[pos] = value
+
+    def ClearContents(self):
+        self._tick("ClearContents")
+        for r1, c1, r2, c2 in self._areas:
+            for r in range(r1, r2 + 1):
+                for c in range(c1, c2 + 1):
+                    self._set((r, c), None)
+
+    @property
+    def Cells(self) -> "_Cells":
+        self._tick("Cells")
+        return _Cells(self)
+
+    @property
+    def Rows(self) -> "_Rows":
+        self._tick("Rows")
+        return _Rows(self)
+
+
+class _Cells:
+    def __init__(self, rng: FakeRange):
+        self._range = rng
+
+    def __call__(self, row: int, col: int) -> FakeRange:
+        self._range._tick("Cells.Item")
+        r1, c1, _, _ = self._range._area
+        r, c = r1 + row - 1, c1 + col - 1
+        return FakeRange(self._range._sheet, (r, c, r, c))
+
+    @property
+    def Count(self) -> int:
+        self._range._tick("Cells.Count")
+        return sum((r2 - r1 + 1) * (c2 - c1 + 1) for r1, c1, r2, c2 in self._range._areas)
+
+
+class _Rows:
+    def __init__(self, rng: FakeRange):
+        self._range = rng
+
+    @property
+    def Count(self) -> int:
+        self._range._tick("Rows.Count")
+        r1, _, r2, _ = self._range._area
+        return r2 - r1 + 1
+
+
+def sample_workbook(blocks: list, names: List[str], sheet_name: str = "25.11.04") -> FakeWorkbook:
+    """
+    근태표 모양의 가짜 워크북 (블록 이름 칸을 names로 순서대로 채움)
+
+    Args:
+        blocks: [(이름범위, 출근범위, 퇴근범위), ...]
+        names: 채울 이름
+        sheet_name: 시트 이름
+    """
+    values = {}
+    queue = iter(names)
+    for name_range, _, _ in blocks:
+        r1, c1, r2, _ = parse_area(name_range)
+        for r in range(r1, r2 + 1):
+            name = next(queue, None)
+            if name is None:
+                break
+            values[area_address((r, c1, r, c1))] = name
+    return FakeWorkbook({sheet_name: values})
+
+
+if __name__ == "__main__":
+    import argparse
+    from datetime import date
+    import numpy as np
+    from logger import QuietLogger
+    from excel_com import ExcelSession
+    from models import BatchResult, DecisionSet, normalize_name
+    from config import YEOJU_BLOCKS, CLEAR_RANGES_YEOJU
+
+    parser = argparse.ArgumentParser(description="가짜 COM으로 근태표 변경 계획/적용 COM 호출 수 측정")
+    parser.add_argument("--latency", type=float, default=0.0, help="COM 호출당 지연 (ms)")
+    args = parser.parse_args()
+
+    names = [f"직원{i}" for i in range(60)]
+    path = "여주_근태표.xlsx"
+    app = FakeExcel({path: sample_workbook(YEOJU_BLOCKS, names)}, latency=args.latency / 1000, coerce=True)
+
+    n = len(names)
+    batch = BatchResult(
+        names=names,
+        check_in=np.full(n, 8 * 60, dtype=np.int16),
+        check_out=np.full(n, 17 * 60 + 30, dtype=np.int16),
+        base_date=np.full(n, np.datetime64("2025-11-05"), dtype="datetime64[D]"),
+        pattern=np.zeros(n, dtype=np.int8),
+    )
+    decisions = DecisionSet(batch, {normalize_name(name): i for i, name in enumerate(names)}, date(2025, 11, 5))
+
+    started = time.perf_counter()
+    with ExcelSession(QuietLogger(), application=app) as session, session.open(path) as excel:
+        with excel.transaction(), excel.performance() as perf:
+            before = app.call_count
+            changeset = excel.plan(YEOJU_BLOCKS, CLEAR_RANGES_YEOJU, {date(2025, 11, 5): decisions})
+            planned = app.call_count - before
+            excel.apply(changeset)
+            applied = app.call_count - before - planned
+    elapsed = time.perf_counter() - started
+
+    print(f"변경 계획 COM 호출: {planned}회 (읽기만), 적용 COM 호출: {applied}회 (셀 {len(changeset)}개)")
+    print(f"전체 COM 호출: {app.call_count}회, {elapsed * 1000:.0f}ms")
+    print("단계별: " + ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in perf.timings.items()))
+    for kind, count in app.calls.most_common():
+        print(f"  {kind}: {count}")
+
+    # 같은 날짜 다시 실행 (바뀐 셀이 없으면 쓰기/저장 없음)
+    before, saves = app.call_count, app.calls["Save"]
+    with ExcelSession(QuietLogger(), application=app) as session, session.open(path) as excel:
+        with excel.transaction(), excel.performance():
+            changes = excel.apply(excel.plan(YEOJU_BLOCKS, CLEAR_RANGES_YEOJU, {date(2025, 11, 5): decisions}))
+    print(f"다시 실행: 변경 {changes}셀, COM 호출 {app.call_count - before}회, 저장 {app.calls['Save'] - saves}회")
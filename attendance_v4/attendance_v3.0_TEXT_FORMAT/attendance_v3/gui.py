@@ -4,6 +4,7 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
 from datetime import datetime
+from multi_date import parse_base_dates
 
 
 class AttendanceGUI:
@@ -28,8 +29,13 @@ class AttendanceGUI:
         self.raw_file = tk.StringVar()
         self.yeoju_file = tk.StringVar()
         self.smc_file = tk.StringVar()
+        self.roster_file = tk.StringVar()
         self.base_date = tk.StringVar(value=datetime.today().strftime("%Y-%m-%d"))
         
+        # 버튼 상태 (실행 중에는 둘 다 잠금, 재입력은 문제 데이터가 있을 때만)
+        self.busy = False
+        self.retry_enabled = False
+        
         self._create_widgets()
     
     def _create_widgets(self):
@@ -53,11 +59,16 @@ class AttendanceGUI:
         tk.Entry(file_frame, textvariable=self.smc_file, width=50).grid(row=2, column=1, padx=5, pady=2)
         tk.Button(file_frame, text="찾아보기", command=lambda: self._browse_file(self.smc_file, "SMC 근태표")).grid(row=2, column=2, pady=2)
         
+        # 근무표 (선택)
+        tk.Label(file_frame, text="근무표 (선택):").grid(row=3, column=0, sticky=tk.W, pady=2)
+        tk.Entry(file_frame, textvariable=self.roster_file, width=50).grid(row=3, column=1, padx=5, pady=2)
+        tk.Button(file_frame, text="찾아보기", command=lambda: self._browse_file(self.roster_file, "근무표", csv=True)).grid(row=3, column=2, pady=2)
+        
         # 날짜 입력 프레임
         date_frame = tk.LabelFrame(self.root, text="기준 날짜", padx=10, pady=10)
         date_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        tk.Label(date_frame, text="날짜 (YYYY-MM-DD):").grid(row=0, column=0, sticky=tk.W, pady=2)
+        tk.Label(date_frame, text="날짜 (YYYY-MM-DD 또는 기간 ~):").grid(row=0, column=0, sticky=tk.W, pady=2)
         tk.Entry(date_frame, textvariable=self.base_date, width=20).grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
         
         # 버튼 프레임
@@ -79,12 +90,19 @@ class AttendanceGUI:
         self.logbox = scrolledtext.ScrolledText(log_frame, height=20, state=tk.NORMAL, wrap=tk.WORD)
         self.logbox.pack(fill=tk.BOTH, expand=True)
     
-    def _browse_file(self, var: tk.StringVar, title: str):
-        """파일 찾아보기"""
-        filetypes = [
-            ("Excel 파일", "*.xlsx;*.xls"),
-            ("모든 파일", "*.*")
-        ]
+    def _browse_file(self, var: tk.StringVar, title: str, csv: bool = False):
+        """
+        파일 찾아보기
+        
+        Args:
+            var: 경로를 넣을 변수
+            title: 대화상자 제목
+            csv: CSV 파일도 보여줄지 (근무표만 CSV 지원)
+        """
+        filetypes = [("Excel 파일", "*.xlsx;*.xls")]
+        if csv:
+            filetypes.append(("CSV 파일", "*.csv"))
+        filetypes.append(("모든 파일", "*.*"))
         filename = filedialog.askopenfilename(title=title, filetypes=filetypes)
         if filename:
             var.set(filename)
@@ -102,11 +120,11 @@ class AttendanceGUI:
             messagebox.showerror("오류", "SMC 근태표 파일을 선택하세요.")
             return
         
-        # 날짜 검증
+        # 날짜 검증 (여러 날짜는 쉼표, 기간은 ~)
         try:
-            datetime.strptime(self.base_date.get(), "%Y-%m-%d")
+            parse_base_dates(self.base_date.get())
         except:
-            messagebox.showerror("오류", "날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)")
+            messagebox.showerror("오류", "날짜 형식이 올바르지 않습니다. (YYYY-MM-DD, 기간: YYYY-MM-DD~YYYY-MM-DD)")
             return
         
         # 로그 초기화
@@ -117,7 +135,8 @@ class AttendanceGUI:
             raw_file=self.raw_file.get(),
             yeoju_file=self.yeoju_file.get(),
             smc_file=self.smc_file.get(),
-            base_date=self.base_date.get()
+            base_date=self.base_date.get(),
+            roster_file=self.roster_file.get()
         )
     
     def _on_retry_click(self):
@@ -125,12 +144,29 @@ class AttendanceGUI:
         self.on_retry()
     
     def enable_retry_button(self):
-        """재입력 버튼 활성화"""
-        self.retry_btn.config(state=tk.NORMAL)
+        """재입력 버튼 활성화 (실행 중이면 끝난 뒤)"""
+        self.retry_enabled = True
+        self._update_buttons()
     
     def disable_retry_button(self):
         """재입력 버튼 비활성화"""
-        self.retry_btn.config(state=tk.DISABLED)
+        self.retry_enabled = False
+        self._update_buttons()
+    
+    def set_busy(self, busy: bool):
+        """
+        실행/재입력 중 버튼 잠금 (COM 작업을 기다리며 GUI 이벤트를 처리하므로 다시 누를 수 있음)
+        
+        Args:
+            busy: 실행 중 여부
+        """
+        self.busy = busy
+        self._update_buttons()
+    
+    def _update_buttons(self):
+        """버튼 상태 반영"""
+        self.execute_btn.config(state=tk.DISABLED if self.busy else tk.NORMAL)
+        self.retry_btn.config(state=tk.NORMAL if self.retry_enabled and not self.busy else tk.DISABLED)
     
     def run(self):
         """GUI 실행"""
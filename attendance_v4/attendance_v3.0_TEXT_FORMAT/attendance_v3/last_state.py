@@ -0,0 +1,201 @@
+"""
+근태 자동 입력 v3.0 - 마지막 실행 상태
+실행이 끝나면 다음 실행의 "전일" 계산에 필요한 직원별 마지막 출퇴근(이전 근무일 구간)을 저장하고,
+다음 실행에서 원시 데이터에 그 구간이 없으면 저장된 상태로 보충
+(다음 날은 그날 원시 데이터만 있어도 됨)
+
+상태가 오래되었거나(기준 날짜 간격이 7일 초과) 원시 데이터와 다르면 사용하지 않고
+원시 데이터 전체로 다시 계산한다.
+"""
+import json
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from models import WorkPattern, normalize_name
+from config import (
+    COL_DATE, COL_NAME, COL_IN_TIME, COL_OUT_TIME,
+    STATE_FILE, LOOKBACK_WORKDAYS, NIGHT_CUTOFF_HOUR,
+)
+
+# 직원별 기록: (날짜, 출근, 퇴근) - 시각은 "YYYY-MM-DDTHH:MM" 또는 None
+Entry = Tuple[str, Optional[str], Optional[str]]
+
+
+class LastStateStore:
+    """마지막 실행 상태"""
+
+    VERSION = 1
+    MAX_GAP_DAYS = 7  # 이보다 오래된 상태는 사용하지 않음
+
+    def __init__(self, logger, path: str = STATE_FILE):
+        """
+        초기화
+
+        Args:
+            logger: 로거
+            path: 저장 파일 경로
+        """
+        self.logger = logger
+        self.path = path
+        self.base_date: Optional[date] = None
+        self.employees: Dict[str, List[Entry]] = {}
+
+    def load(self):
+        """저장된 상태 불러오기 (없거나 읽을 수 없으면 빈 상태)"""
+        if not os.path.exists(self.path):
+            self.logger.debug(f"상태 파일 없음: {self.path}")
+            return
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+
+            if data.get("version") != self.VERSION:
+                raise ValueError(f"버전 불일치: {data.get('version')}")
+
+            self.base_date = datetime.strptime(data["base_date"], "%Y-%m-%d").date()
+            self.employees = {name: [tuple(entry) for entry in entries] for name, entries in data["employees"].items()}
+            self.logger.debug(f"상태 불러오기: {len(self.employees)}명, 기준 날짜 {self.base_date}")
+
+        except Exception as e:
+            self.logger.warning(f"상태 파일 읽기 실패 (원시 데이터로 계산): {str(e)}")
+            self.base_date = None
+            self.employees = {}
+
+    def save(self):
+        """상태 저장"""
+        if self.base_date is None:
+            return
+
+        data = {
+            "version": self.VERSION,
+            "base_date": self.base_date.strftime("%Y-%m-%d"),
+            "employees": {name: [list(entry) for entry in entries] for name, entries in self.employees.items()},
+        }
+
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            self.logger.warning(f"상태 저장 실패: {str(e)}")
+
+    def fill_history(self, history: pd.DataFrame, base_date: date) -> pd.DataFrame:
+        """
+        원시 데이터에 없는 이전 구간 기록을 상태로 보충
+
+        일관성 확인:
+            - 상태의 기준 날짜가 이번 기준 날짜보다 이전이고 MAX_GAP_DAYS 이내
+            - 원시 데이터에도 있는 날짜는 출퇴근이 상태와 같아야 함 (수정된 원시 데이터 우선)
+
+        Args:
+            history: DataAnalyzer.normalize_history() 결과
+            base_date: 이번 실행의 (첫) 기준 날짜
+
+        Returns:
+            보충된 이력 (상태를 쓸 수 없으면 history 그대로)
+        """
+        if self.base_date is None:
+            return history
+
+        gap = (base_date - self.base_date).days
+        if gap <= 0 or gap > self.MAX_GAP_DAYS:
+            self.logger.info(f"마지막 상태({self.base_date})가 기준 날짜와 맞지 않아 원시 데이터로 계산합니다")
+            return history
+
+        state = self._to_frame()
+        raw_days = set(history[COL_DATE].dt.date)
+        overlap = state[state[COL_DATE].dt.date.isin(raw_days)]
+
+        if not overlap.empty and not self._same(overlap, history[history[COL_DATE].isin(overlap[COL_DATE].unique())]):
+            self.logger.warning("원시 데이터가 마지막 상태와 다릅니다 (수정된 데이터) - 원시 데이터로 다시 계산합니다")
+            return history
+
+        missing = state[~state[COL_DATE].dt.date.isin(raw_days)]
+        if missing.empty:
+            return history
+
+        days = sorted(missing[COL_DATE].dt.date.unique())
+        self.logger.info(
+            f"마지막 상태로 보충: {len(missing)}건 ({days[0]} ~ {days[-1]}, "
+            f"열린 야간 근무 {self.open_night_shifts()}명)"
+        )
+        return pd.concat([history, missing], ignore_index=True).sort_values(COL_DATE, kind="stable").reset_index(drop=True)
+
+    def update(self, history: pd.DataFrame, pattern: WorkPattern, base_date: date, workdays: int = LOOKBACK_WORKDAYS):
+        """
+        이번 실행 결과로 상태 갱신 (다음 실행의 이전 근무일 구간)
+
+        기준 날짜부터 거슬러 N번째 근무일까지의 출퇴근을 직원별로 보관한다.
+
+        Args:
+            history: 이번 실행에 사용한 이력
+            pattern: 근무 패턴
+            base_date: 이번 실행의 (마지막) 기준 날짜
+            workdays: 보관할 근무일 수
+        """
+        first = base_date
+        found = 0
+        for i in range(0, workdays * 7):
+            day = base_date - timedelta(days=i)
+            first = day
+            if day == base_date or pattern.is_work_day(day):
+                found += 1
+                if found >= workdays:
+                    break
+
+        rows = history[
+            (history[COL_DATE] >= pd.Timestamp(first))
+            & (history[COL_DATE] <= pd.Timestamp(base_date))
+            & (history[COL_IN_TIME].notna() | history[COL_OUT_TIME].notna())
+        ]
+
+        employees: Dict[str, List[Entry]] = {}
+        for day, name, cin, cout in zip(rows[COL_DATE], rows[COL_NAME], rows[COL_IN_TIME], rows[COL_OUT_TIME]):
+            employees.setdefault(name, []).append((day.strftime("%Y-%m-%d"), _format(cin), _format(cout)))
+
+        self.base_date = base_date
+        self.employees = employees
+        self.logger.info(f"마지막 상태 저장: {len(employees)}명 ({first} ~ {base_date}, 열린 야간 근무 {self.open_night_shifts()}명)")
+
+    def open_night_shifts(self) -> int:
+        """기준 날짜에 야간 출근 후 퇴근이 없는 직원 수"""
+        if self.base_date is None:
+            return 0
+
+        day = self.base_date.strftime("%Y-%m-%d")
+        count = 0
+        for entries in self.employees.values():
+            for entry_day, cin, cout in entries:
+                if entry_day == day and cin and not cout and int(cin[11:13]) >= NIGHT_CUTOFF_HOUR:
+                    count += 1
+        return count
+
+    def _to_frame(self) -> pd.DataFrame:
+        """상태 → 이력 형식 DataFrame"""
+        rows = [(day, name, cin, cout) for name, entries in self.employees.items() for day, cin, cout in entries]
+        frame = pd.DataFrame(rows, columns=[COL_DATE, COL_NAME, COL_IN_TIME, COL_OUT_TIME])
+        for col in (COL_DATE, COL_IN_TIME, COL_OUT_TIME):
+            frame[col] = pd.to_datetime(frame[col])
+        return frame
+
+    @staticmethod
+    def _same(state: pd.DataFrame, raw: pd.DataFrame) -> bool:
+        """출퇴근이 있는 기록이 같은지 (이름 정규화)"""
+        def keys(frame):
+            punched = frame[frame[COL_IN_TIME].notna() | frame[COL_OUT_TIME].notna()]
+            return set(zip(
+                punched[COL_DATE],
+                punched[COL_NAME].map(normalize_name),
+                punched[COL_IN_TIME].dt.floor("min"),
+                punched[COL_OUT_TIME].dt.floor("min"),
+            ))
+        return keys(state) == keys(raw)
+
+
+def _format(value) -> Optional[str]:
+    """Timestamp → "YYYY-MM-DDTHH:MM" (NaT는 None)"""
+    if pd.isna(value):
+        return None
+    return value.strftime("%Y-%m-%dT%H:%M")
@@ -2,8 +2,10 @@
 근태 자동 입력 v3.0 - 로깅
 """
 import tkinter as tk
+from collections import deque
 from datetime import datetime
 from enum import Enum
+from typing import List, Tuple
 
 
 class LogLevel(Enum):
@@ -122,3 +124,39 @@ class Logger:
         """카운트 초기화"""
         self.warning_count = 0
         self.error_count = 0
+
+
+class QuietLogger(Logger):
+    """경고/오류만 출력하는 로거 (백그라운드 작업용)"""
+    
+    def _log(self, level: LogLevel, message: str):
+        if level in (LogLevel.WARNING, LogLevel.ERROR):
+            super()._log(level, message)
+
+
+class BufferedLogger(Logger):
+    """다른 스레드/프로세스용 로거 (메시지를 모아 두었다가 replay()로 원래 로거에 출력 - Tk는 메인 스레드에서만)"""
+    
+    def __init__(self):
+        super().__init__(None)
+        self._pending = deque()
+    
+    def _log(self, level: LogLevel, message: str):
+        self._pending.append((level, message))
+    
+    def drain(self) -> List[Tuple[LogLevel, str]]:
+        """모인 메시지 꺼내기 (다른 프로세스로 돌려줄 때 - 피클 가능)"""
+        messages = []
+        while self._pending:
+            messages.append(self._pending.popleft())
+        return messages
+    
+    def replay(self, logger: Logger):
+        """모인 메시지를 logger로 출력 (호출한 스레드에서)"""
+        replay_messages(self.drain(), logger)
+
+
+def replay_messages(messages: List[Tuple[LogLevel, str]], logger: Logger):
+    """BufferedLogger.drain() 결과를 logger로 출력"""
+    for level, message in messages:
+        getattr(logger, level.value.lower())(message)
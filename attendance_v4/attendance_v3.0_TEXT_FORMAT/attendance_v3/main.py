@@ -1,8 +1,11 @@
 """
 근태 자동 입력 v3.0 - 메인
 """
+import multiprocessing
 import pandas as pd
-from datetime import datetime
+from concurrent.futures import Future
+from datetime import date
+from typing import Dict
 from tkinter import messagebox
 import os
 
@@ -10,9 +13,18 @@ from config import *
 from logger import Logger
 from gui import AttendanceGUI
 from data_analyzer import DataAnalyzer
-from attendance_engine import AttendanceEngine
-from excel_com import ExcelCOM
-from models import ProblemData
+from shift_pairing import ShiftPairer
+from attendance_cube import AttendanceCube
+from baseline import PunchBaseline
+from work_hours import WorkHoursCalculator
+from roster import ShiftRoster
+from shift_policy import ShiftPolicyResolver
+from decision_journal import DecisionJournal
+from last_state import LastStateStore
+from multi_date import MultiDateProcessor, parse_base_dates
+from com_worker import ComWorker
+from site_pool import SiteJob, SitePool, SiteResult
+from models import ProblemData, DecisionSet, ValidationResult, normalize_name
 
 
 class AttendanceProcessor:
@@ -24,6 +36,8 @@ class AttendanceProcessor:
         self.gui = None
         self.problem_file = "문제_데이터_확인.xlsx"
         self.current_files = {}  # 현재 처리 중인 파일 정보
+        self.decisions = {}      # {기준 날짜: 출퇴근 결정 결과} (재입력에서 재사용)
+        self.running = False     # 실행 중 (COM 작업을 기다리는 동안 GUI 이벤트를 처리하므로)
     
     def run(self):
         """실행"""
@@ -36,7 +50,7 @@ class AttendanceProcessor:
         # GUI 실행
         self.gui.run()
     
-    def _execute(self, raw_file: str, yeoju_file: str, smc_file: str, base_date: str):
+    def _execute(self, raw_file: str, yeoju_file: str, smc_file: str, base_date: str, roster_file: str = ""):
         """
         메인 실행 로직
         
@@ -44,8 +58,15 @@ class AttendanceProcessor:
             raw_file: 원시 데이터 파일
             yeoju_file: 여주 근태표 파일
             smc_file: SMC 근태표 파일
-            base_date: 기준 날짜 (YYYY-MM-DD)
+            base_date: 기준 날짜 (YYYY-MM-DD, 여러 날짜는 쉼표, 기간은 ~)
+            roster_file: 근무표 파일 (선택)
         """
+        if self.running:
+            return
+        self.running = True
+        self.gui.set_busy(True)
+        runner = None
+        
         try:
             # 로거 초기화
             self.logger = Logger(self.gui.logbox)
@@ -58,8 +79,21 @@ class AttendanceProcessor:
                 'base_date': base_date
             }
             
-            # 날짜 파싱
-            base_date_obj = datetime.strptime(base_date, "%Y-%m-%d").date()
+            sites = [
+                SiteJob("여주", yeoju_file, YEOJU_BLOCKS, CLEAR_RANGES_YEOJU),
+                SiteJob("SMC", smc_file, SMC_BLOCKS, CLEAR_RANGES_SMC),
+            ]
+            
+            # 근태표마다 작업 프로세스에서 동시에 입력하거나,
+            # COM 전용 스레드에서 Excel을 먼저 시작해 근태표를 열어 둠 (데이터 분석과 동시에 진행)
+            if SITE_PROCESSES:
+                runner = SitePool(self.logger, len(sites)).start()
+            else:
+                runner = ComWorker(self.logger).start()
+                books = {site.name: runner.open(site.file_path) for site in sites}
+            
+            # 날짜 파싱 (여러 날짜/기간 가능)
+            base_dates = parse_base_dates(base_date)
             self.logger.info(f"기준 날짜: {base_date}")
             
             # ========== 1단계: 원시 데이터 로드 ==========
@@ -73,65 +107,115 @@ class AttendanceProcessor:
             self.logger.info("2단계: 데이터 분석")
             
             analyzer = DataAnalyzer(self.logger)
-            pattern = analyzer.analyze_work_pattern(df)
+            
+            # 전체 이력 정규화 → 날짜 × 직원 큐브 (이후 단계는 큐브의 행/열만 읽음)
+            history = analyzer.normalize_history(df)
+            
+            # 원시 데이터에 이전 근무일 구간이 없으면 마지막 실행 상태로 보충
+            state = LastStateStore(self.logger)
+            state.load()
+            history = state.fill_history(history, base_dates[0])
+            
+            cube = AttendanceCube.from_history(history)
+            self._save_cube(cube)
+            
+            pattern = analyzer.analyze_work_pattern(df, daily_stats=cube.daily_counts())
+            
+            # 여러 날짜면 근무일만 처리
+            if len(base_dates) > 1:
+                skipped = [day for day in base_dates if not pattern.is_work_day(day)]
+                base_dates = [day for day in base_dates if pattern.is_work_day(day)]
+                if skipped:
+                    self.logger.info(f"근무일이 아닌 날짜 제외: {len(skipped)}일")
+                if not base_dates:
+                    raise Exception("처리할 근무일이 없습니다")
+                self.logger.info(f"처리할 기준 날짜: {len(base_dates)}일 ({base_dates[0]} ~ {base_dates[-1]})")
             
             # 이전 근무일 찾기
-            prev_workday = analyzer.find_previous_workday(base_date_obj, pattern)
+            prev_workday = analyzer.find_previous_workday(base_dates[0], pattern)
             if prev_workday:
                 self.logger.info(f"이전 근무일: {prev_workday.strftime('%Y-%m-%d')}")
             else:
                 self.logger.warning("이전 근무일을 찾을 수 없습니다")
-                prev_workday = base_date_obj  # fallback
+            
+            # 전체 이력 출퇴근 페어링 (자정/주말 넘김 근무)
+            pairer = ShiftPairer(self.logger)
+            shifts = pairer.pair(history)
+            pairer.log_summary(shifts)
+            
+            # 근무표 (선택)
+            roster = ShiftRoster.load(roster_file, self.logger) if roster_file else None
+            
+            # 직원별 근무 형태 (근무표에 없을 때 야간 판단, 실행마다 한 번만 정함)
+            policies = ShiftPolicyResolver.from_history(history)
+            summary = policies.summary(cube.names)
+            self.logger.info("근무 형태: " + ", ".join(f"{name} {count}명" for name, count in summary.items()))
             
             # ========== 3단계: 데이터 검증 ==========
             self.logger.separator()
             self.logger.info("3단계: 데이터 검증")
             
-            validation = analyzer.validate_data(df, base_date_obj)
+            # 개인별 기준선 (새 날짜만 증분 반영, 첫 기준 날짜 이전까지)
+            baseline = PunchBaseline(self.logger)
+            baseline.load()
+            baseline.ingest(history, base_dates[0])
+            baseline.save()
+            
+            validations = [analyzer.validate_data(df, day, baseline) for day in base_dates]
+            validation = ValidationResult(
+                valid_records=[record for v in validations for record in v.valid_records],
+                problems=[problem for v in validations for problem in v.problems],
+            )
             
             # ========== 4단계: 맵 생성 ==========
             self.logger.separator()
             self.logger.info("4단계: 출퇴근 맵 생성")
             
-            today_map = analyzer.create_maps(df, base_date_obj)
-            yesterday_map = analyzer.create_maps(df, prev_workday)
-            
-            self.logger.info(f"오늘 맵: {len(today_map)}명")
-            self.logger.info(f"전일 맵: {len(yesterday_map)}명")
+            # 전 직원 출퇴근 결정 (근태표를 열기 전에 한 번만, 큐브의 기준 날짜/이전 구간 행만 읽음)
+            # 여러 날짜면 큐브를 공유 메모리에 올려 날짜별로 병렬 계산
+            self.decisions = MultiDateProcessor(self.logger).decide(cube, pattern, base_dates, roster, policies)
+            
+            journal = DecisionJournal(self.logger)
+            for day, decisions in self.decisions.items():
+                inputs = decisions.inputs
+                self.logger.info(
+                    f"{day}: 오늘 기록 {int(pd.notna(inputs['today_date']).sum())}명, "
+                    f"전일 기록 {int(pd.notna(inputs['yest_date']).sum())}명 (이전 근무일 {LOOKBACK_WORKDAYS}일), "
+                    f"결정 {len(decisions)}명"
+                )
+                journal.append(decisions)
             
             # ========== 5단계: 정상 데이터 입력 ==========
             self.logger.separator()
             self.logger.info("5단계: 정상 데이터 입력")
             
-            engine = AttendanceEngine(pattern, self.logger)
-            
-            # 여주 근태표
-            self._process_file(
-                "여주",
-                yeoju_file,
-                YEOJU_BLOCKS,
-                CLEAR_RANGES_YEOJU,
-                today_map,
-                yesterday_map,
-                engine,
-                base_date_obj
-            )
+            # 작업만 넣고, Excel이 쓰는 동안 근무시간 집계를 계속함
+            if SITE_PROCESSES:
+                saved = {site.name: runner.submit(site, self.decisions) for site in sites}
+            else:
+                for site in sites:
+                    self._process_file(runner, books[site.name], site, self.decisions)
+                saved = self._commit_files(runner, books)
             
-            # SMC 근태표
-            self._process_file(
-                "SMC",
-                smc_file,
-                SMC_BLOCKS,
-                CLEAR_RANGES_SMC,
-                today_map,
-                yesterday_map,
-                engine,
-                base_date_obj
-            )
+            # ========== 6단계: 근무시간 집계 ==========
+            self.logger.separator()
+            self.logger.info("6단계: 근무시간 집계")
+            
+            calculator = WorkHoursCalculator(self.logger)
+            daily_hours = calculator.compute_daily(shifts, history)
+            monthly_hours = calculator.aggregate_monthly(daily_hours)
+            calculator.save(daily_hours, monthly_hours, WORK_HOURS_FILE)
             
-            # ========== 6단계: 문제 데이터 처리 ==========
+            # 근태표 입력 완료 대기
+            self._finish_files(runner, saved)
+            
+            # 다음 실행의 전일 계산용 상태 (근태표 입력이 끝난 뒤에만)
+            state.update(history, pattern, base_dates[-1])
+            state.save()
+            
+            # ========== 7단계: 문제 데이터 처리 ==========
             self.logger.separator()
-            self.logger.info("6단계: 문제 데이터 처리")
+            self.logger.info("7단계: 문제 데이터 처리")
             
             if validation.has_problems():
                 self._save_problem_data(validation.problems)
@@ -165,6 +249,19 @@ class AttendanceProcessor:
             import traceback
             self.logger.error(traceback.format_exc())
             messagebox.showerror("오류", f"처리 중 오류가 발생했습니다:\n{str(e)}")
+        
+        finally:
+            # 남은 작업을 마치고 Excel 종료 (실패한 근태표는 저장하지 않고 닫힘)
+            if runner is not None:
+                runner.stop(self._pump)
+            self.running = False
+            self.gui.set_busy(False)
+    
+    def _pump(self):
+        """COM 작업을 기다리는 동안 GUI 이벤트 처리 (창 멈춤 방지)"""
+        root = getattr(self.gui, "root", None)
+        if root is not None:
+            root.update()
     
     def _load_raw_data(self, file_path: str) -> pd.DataFrame:
         """
@@ -200,53 +297,95 @@ class AttendanceProcessor:
             self.logger.error(f"파일 로드 실패: {str(e)}")
             raise
     
+    def _save_cube(self, cube: AttendanceCube):
+        """
+        큐브 저장 (시뮬레이션 등 다른 도구가 memmap으로 읽음)
+        
+        Args:
+            cube: AttendanceCube
+        """
+        try:
+            cube.save(CUBE_DIR)
+            self.logger.info(f"출퇴근 큐브: {len(cube)}일 × {len(cube.names)}명 ({CUBE_DIR})")
+        except Exception as e:
+            self.logger.warning(f"출퇴근 큐브 저장 실패: {str(e)}")
+    
     def _process_file(
         self,
-        name: str,
-        file_path: str,
-        blocks: list,
-        clear_ranges: list,
-        today_map: dict,
-        yesterday_map: dict,
-        engine: AttendanceEngine,
-        base_date
+        worker: ComWorker,
+        book: Future,
+        site: SiteJob,
+        decisions: Dict[date, DecisionSet]
     ):
         """
-        근태표 파일 처리
+        근태표 파일 처리 명령 넣기 (COM 스레드에서 기준 날짜 순서대로 시트 추가/입력, 저장은 _commit_files)
         
         Args:
-            name: 파일 이름 (로그용)
-            file_path: 파일 경로
-            blocks: 블록 리스트
-            clear_ranges: 지울 범위
-            today_map: 오늘 맵
-            yesterday_map: 전일 맵
-            engine: 엔진
-            base_date: 기준 날짜
+            worker: COM 전용 스레드
+            book: 열린 근태표 (ComWorker.open 결과)
+            site: 근태표 작업 (이름, 파일, 블록, 지울 범위)
+            decisions: {기준 날짜: 출퇴근 결정 결과}
         """
         self.logger.separator()
-        self.logger.info(f"[{name} 근태표 처리]")
-        self.logger.info(f"파일: {file_path}")
+        self.logger.info(f"[{site.name} 근태표 처리]")
+        self.logger.info(f"파일: {site.file_path}")
         
-        # 시트 이름 생성
-        sheet_name = base_date.strftime(SHEET_NAME_FORMAT)
+        # 쓰는 동안 화면 갱신/자동 계산/이벤트 끔 (바뀐 시트만 저장 전에 계산)
+        worker.performance(book)
         
-        try:
-            with ExcelCOM(file_path, self.logger) as excel:
-                # 시트 준비
-                excel.prepare_sheet(sheet_name, clear_ranges)
-                
-                # 데이터 입력
-                excel.write_attendance(blocks, today_map, yesterday_map, engine)
-                
-                # 저장 (이미 prepare_sheet에서 저장되었지만 한 번 더)
-                excel.save()
+        # 모든 기준 날짜의 셀 변경을 먼저 계산한 뒤 (시트는 읽기만) 한 번에 적용
+        changeset = worker.plan(book, site.blocks, site.clear_ranges, decisions)
+        worker.apply(book, changeset)
+    
+    def _commit_files(self, worker: ComWorker, books: Dict[str, Future]) -> Dict[str, Future]:
+        """
+        저장/닫기 명령 넣기 (모든 근태표의 입력 명령 뒤 - 하나라도 실패하면 나머지도 저장하지 않음)
+        
+        Args:
+            worker: COM 전용 스레드
+            books: {파일 이름: 열린 근태표}
             
-            self.logger.success(f"{name} 근태표 처리 완료")
+        Returns:
+            {파일 이름: 저장의 Future} (_finish_files로 대기)
+        """
+        # 모든 날짜를 입력한 뒤 한 번만 저장 (바뀐 셀이 없으면 저장 생략, 실패하면 저장하지 않고 닫힘)
+        group = list(books.values())
+        saved = {name: worker.commit(book, group) for name, book in books.items()}
+        for book in group:
+            worker.close(book)
+        return saved
+    
+    def _finish_files(self, runner, saved: Dict[str, Future]):
+        """
+        근태표 처리 완료 대기 (모두 기다린 뒤 실패가 있으면 근태표별 저장 여부와 함께 예외)
+        
+        Args:
+            runner: COM 전용 스레드(ComWorker) 또는 근태표별 작업 프로세스(SitePool)
+            saved: {파일 이름: _commit_files / SitePool.submit 결과}
             
-        except Exception as e:
-            self.logger.error(f"{name} 근태표 처리 실패: {str(e)}")
-            raise
+        Raises:
+            RuntimeError: 실패한 근태표가 있음 (메시지에 근태표별 저장 여부 - SitePool은 근태표마다 따로 저장)
+        """
+        status = {}
+        failed = []
+        
+        for name, future in saved.items():
+            try:
+                result = runner.wait(future, self._pump)
+                written = result.saved if isinstance(result, SiteResult) else result
+                status[name] = "저장됨" if written else "변경 없음 (저장 생략)"
+                self.logger.success(f"{name} 근태표 처리 완료")
+                
+            except Exception as e:
+                status[name] = "저장 안 함 (실행 전 그대로)"
+                failed.append(name)
+                self.logger.error(f"{name} 근태표 처리 실패: {str(e)}")
+        
+        if failed:
+            raise RuntimeError(
+                f"근태표 처리 실패: {', '.join(failed)}\n"
+                + "\n".join(f"  {name}: {text}" for name, text in status.items())
+            )
     
     def _save_problem_data(self, problems: list):
         """
@@ -270,6 +409,12 @@ class AttendanceProcessor:
     
     def _retry(self):
         """재입력 (사용자가 문제 데이터 수정 후)"""
+        if self.running:
+            return
+        self.running = True
+        self.gui.set_busy(True)
+        runner = None
+        
         try:
             self.logger.separator("=")
             self.logger.info("재입력 시작")
@@ -289,15 +434,19 @@ class AttendanceProcessor:
                 messagebox.showerror("오류", "파일 형식이 올바르지 않습니다.")
                 return
             
-            # 시트 이름
-            base_date = datetime.strptime(self.current_files['base_date'], "%Y-%m-%d").date()
-            sheet_name = base_date.strftime(SHEET_NAME_FORMAT)
-            
-            # 여주 근태표 재입력
-            self._retry_file("여주", self.current_files['yeoju'], sheet_name, YEOJU_BLOCKS, df_fixed)
+            # 수정 데이터 정리 (근태표를 열기 전에, 기준 날짜별)
+            corrections = self._load_corrections(df_fixed)
             
-            # SMC 근태표 재입력
-            self._retry_file("SMC", self.current_files['smc'], sheet_name, SMC_BLOCKS, df_fixed)
+            # 두 근태표 명령을 COM 스레드에 넣고 완료 대기 (실패한 근태표는 저장하지 않고 닫힘)
+            runner = ComWorker(self.logger).start()
+            sites = [
+                ("여주", self.current_files['yeoju'], YEOJU_BLOCKS),
+                ("SMC", self.current_files['smc'], SMC_BLOCKS),
+            ]
+            books = {name: runner.open(file_path) for name, file_path, _ in sites}
+            for name, _, blocks in sites:
+                self._retry_file(runner, books[name], name, blocks, corrections)
+            self._finish_files(runner, self._commit_files(runner, books))
             
             self.logger.separator("=")
             self.logger.success("✓ 재입력 완료")
@@ -313,74 +462,59 @@ class AttendanceProcessor:
             import traceback
             self.logger.error(traceback.format_exc())
             messagebox.showerror("오류", f"재입력 중 오류가 발생했습니다:\n{str(e)}")
+        
+        finally:
+            if runner is not None:
+                runner.stop(self._pump)
+            self.running = False
+            self.gui.set_busy(False)
+    
+    def _load_corrections(self, df_fixed: pd.DataFrame) -> dict:
+        """
+        수정된 데이터 정리 (근태표를 열기 전에 한 번만)
+        
+        Args:
+            df_fixed: 수정된 데이터
+            
+        Returns:
+            {기준 날짜: {정규화된 이름: (이름, 수정_출근, 수정_퇴근)}}
+        """
+        corrections = {}
+        
+        # 날짜가 없으면 실행 때의 마지막 기준 날짜
+        default_date = max(self.decisions) if self.decisions else parse_base_dates(self.current_files['base_date'])[-1]
+        dates = pd.to_datetime(df_fixed['날짜'], errors='coerce') if '날짜' in df_fixed.columns else None
+        
+        for idx, row in df_fixed.iterrows():
+            name_val = str(row['이름']).strip()
+            cin = str(row['수정_출근']).strip() if pd.notna(row['수정_출근']) else ''
+            cout = str(row['수정_퇴근']).strip() if pd.notna(row['수정_퇴근']) else ''
+            
+            if not cin and not cout:
+                continue
+            
+            day = dates[idx].date() if dates is not None and pd.notna(dates[idx]) else default_date
+            corrections.setdefault(day, {})[normalize_name(name_val)] = (name_val, cin, cout)
+        
+        return corrections
     
-    def _retry_file(self, name: str, file_path: str, sheet_name: str, blocks: list, df_fixed: pd.DataFrame):
+    def _retry_file(self, worker: ComWorker, book: Future, name: str, blocks: list, corrections: dict):
         """
-        파일 재입력
+        파일 재입력 명령 넣기 (COM 스레드에서 모든 날짜를 고침, 저장은 _commit_files)
         
         Args:
+            worker: COM 전용 스레드
+            book: 열린 근태표 (ComWorker.open 결과)
             name: 파일 이름
-            file_path: 파일 경로
-            sheet_name: 시트 이름
             blocks: 블록 리스트
-            df_fixed: 수정된 데이터
+            corrections: _load_corrections() 결과
         """
         self.logger.info(f"[{name} 근태표 재입력]")
         
-        try:
-            with ExcelCOM(file_path, self.logger) as excel:
-                # 시트 선택
-                excel.sheet = excel.workbook.Worksheets(sheet_name)
-                
-                filled = 0
-                
-                # 각 행 처리
-                for idx, row in df_fixed.iterrows():
-                    name_val = str(row['이름']).strip()
-                    cin = str(row['수정_출근']).strip() if pd.notna(row['수정_출근']) else ''
-                    cout = str(row['수정_퇴근']).strip() if pd.notna(row['수정_퇴근']) else ''
-                    
-                    if not cin and not cout:
-                        continue
-                    
-                    # 이름 찾아서 입력
-                    found = False
-                    for name_range, in_range, out_range in blocks:
-                        name_cells = excel.sheet.Range(name_range)
-                        in_cells = excel.sheet.Range(in_range)
-                        out_cells = excel.sheet.Range(out_range)
-                        
-                        for i in range(1, name_cells.Rows.Count + 1):
-                            cell_name = str(name_cells.Cells(i, 1).Value or "").strip()
-                            
-                            if cell_name == name_val:
-                                if cin:
-                                    in_cells.Cells(i, 1).Value = cin
-                                    filled += 1
-                                if cout:
-                                    out_cells.Cells(i, 1).Value = cout
-                                    filled += 1
-                                
-                                self.logger.info(f"  {name_val}: 출근={cin or '없음'}, 퇴근={cout or '없음'}")
-                                found = True
-                                break
-                        
-                        if found:
-                            break
-                    
-                    if not found:
-                        self.logger.warning(f"  {name_val}: 이름을 찾을 수 없음")
-                
-                # 저장
-                excel.save()
-                
-                self.logger.success(f"{name} 재입력 완료: {filled}건")
-                
-        except Exception as e:
-            self.logger.error(f"{name} 재입력 실패: {str(e)}")
-            raise
-
+        worker.performance(book)
+        worker.correct(book, blocks, corrections, self.decisions)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # exe(PyInstaller)의 작업 프로세스가 GUI를 다시 띄우지 않도록
     processor = AttendanceProcessor()
     processor.run()
@@ -3,7 +3,15 @@
 """
 from dataclasses import dataclass
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Optional, List, Dict
+
+import numpy as np
+from time_format import MINUTE_STRING_ARRAY, MINUTE_TEXT_ARRAY, format_time
+
+
+def normalize_name(name: str) -> str:
+    """이름 정규화 (공백 제거, 소문자 변환) - 근태표 이름과 원시 데이터 이름 매칭용"""
+    return name.replace(" ", "").lower()
 
 
 @dataclass
@@ -28,11 +36,11 @@ class AttendanceRecord:
     
     def get_check_in_str(self) -> str:
         """출근 시간 문자열"""
-        return self.check_in.strftime("%H:%M") if self.check_in else ""
+        return format_time(self.check_in)
     
     def get_check_out_str(self) -> str:
         """퇴근 시간 문자열"""
-        return self.check_out.strftime("%H:%M") if self.check_out else ""
+        return format_time(self.check_out)
 
 
 @dataclass
@@ -103,11 +111,99 @@ class ValidationResult:
 @dataclass
 class ProcessResult:
     """처리 결과"""
-    check_in: str              # 결정된 출근 시간
-    check_out: str             # 결정된 퇴근 시간
+    check_in_minute: int       # 결정된 출근 시간 (분, 없으면 NO_MINUTE)
+    check_out_minute: int      # 결정된 퇴근 시간 (분, 없으면 NO_MINUTE)
     base_date: Optional[date]  # 기준 날짜
     pattern: str               # 사용된 패턴
     
+    @property
+    def check_in(self) -> str:
+        """출근 "HH:MM" (없으면 빈 문자열)"""
+        return MINUTE_STRING_ARRAY[self.check_in_minute]
+    
+    @property
+    def check_out(self) -> str:
+        """퇴근 "HH:MM" (없으면 빈 문자열)"""
+        return MINUTE_STRING_ARRAY[self.check_out_minute]
+    
+    @property
+    def check_in_text(self) -> str:
+        """출근 "'HH:MM" (Excel 텍스트 입력용)"""
+        return MINUTE_TEXT_ARRAY[self.check_in_minute]
+    
+    @property
+    def check_out_text(self) -> str:
+        """퇴근 "'HH:MM" (Excel 텍스트 입력용)"""
+        return MINUTE_TEXT_ARRAY[self.check_out_minute]
+    
     def __str__(self):
         date_str = self.base_date.strftime('%Y-%m-%d') if self.base_date else 'N/A'
         return f"출근={self.check_in or '없음'}, 퇴근={self.check_out or '없음'}, 날짜={date_str}, 패턴={self.pattern}"
+
+
+# 엔진 패턴 코드 (BatchResult.pattern 값 = 인덱스)
+PATTERNS = (
+    "today_complete",
+    "today_checkin_with_prev_checkout",
+    "today_checkin_only",
+    "night_shift",
+    "night_shift_no_checkout",
+    "prev_night_shift",
+    "checkout_only",
+    "prev_night_shift_complete",
+    "absent_with_prev_checkout",
+    "prev_checkin_only_no_data",
+    "no_data",
+)
+PATTERN_CODES = {name: code for code, name in enumerate(PATTERNS)}
+
+
+@dataclass
+class BatchResult:
+    """일괄 처리 결과 (컬럼 형식)"""
+    names: List[str]
+    check_in: np.ndarray    # 출근 분 (0~1439, 없으면 NO_MINUTE)
+    check_out: np.ndarray   # 퇴근 분 (0~1439, 없으면 NO_MINUTE)
+    base_date: np.ndarray   # 기준 날짜 (datetime64[D], 없으면 NaT)
+    pattern: np.ndarray     # 패턴 코드 (PATTERNS 인덱스)
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def to_result(self, i: int) -> ProcessResult:
+        """i번째 행을 ProcessResult로 변환"""
+        base = self.base_date[i]
+        return ProcessResult(
+            check_in_minute=int(self.check_in[i]),
+            check_out_minute=int(self.check_out[i]),
+            base_date=None if np.isnat(base) else base.astype(date),
+            pattern=PATTERNS[self.pattern[i]],
+        )
+    
+    def check_in_texts(self) -> np.ndarray:
+        """출근 "'HH:MM" 컬럼 (없으면 빈 문자열)"""
+        return MINUTE_TEXT_ARRAY[self.check_in]
+    
+    def check_out_texts(self) -> np.ndarray:
+        """퇴근 "'HH:MM" 컬럼 (없으면 빈 문자열)"""
+        return MINUTE_TEXT_ARRAY[self.check_out]
+
+
+@dataclass
+class DecisionSet:
+    """기준 날짜의 전 직원 처리 결과 (근태표를 열기 전에 한 번만 계산)"""
+    batch: BatchResult
+    index: Dict[str, int]              # 정규화된 이름 → batch 행
+    base_date: Optional[date] = None   # 기준 날짜
+    inputs: Optional[dict] = None      # 엔진 입력 배열 (결정 기록용)
+    
+    def __len__(self):
+        return len(self.batch)
+    
+    def __contains__(self, name: str) -> bool:
+        return normalize_name(name) in self.index
+    
+    def get(self, name: str) -> Optional[ProcessResult]:
+        """이름으로 결과 조회 (원시 데이터에 없으면 None)"""
+        i = self.index.get(normalize_name(name))
+        return None if i is None else self.batch.to_result(i)
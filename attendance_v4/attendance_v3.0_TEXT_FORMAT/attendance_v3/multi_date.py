@@ -0,0 +1,183 @@
+"""
+근태 자동 입력 v3.0 - 여러 기준 날짜 일괄 처리
+출퇴근 큐브를 multiprocessing.shared_memory에 한 번 올려 두고,
+작업 프로세스가 날짜별로 엔진 결정만 계산 (DataFrame/배열을 피클하지 않음)
+
+근태표 입력은 모든 결정이 끝난 뒤 날짜 순서대로 한 번에 한다 (main.py).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+from logger import QuietLogger
+from attendance_cube import AttendanceCube
+from attendance_engine import AttendanceEngine
+from shift_policy import ShiftPolicyResolver
+from models import DecisionSet, WorkPattern
+from config import MULTI_DATE_WORKERS
+
+_ARRAYS = ("check_in", "check_out", "present", "dates")
+
+# 작업 프로세스별 상태 (공유 메모리에 붙은 큐브)
+_worker = {}
+
+
+def parse_base_dates(text: str) -> List[date]:
+    """
+    기준 날짜 입력 해석
+
+    "2025-11-12"                → 하루
+    "2025-11-03,2025-11-05"     → 나열한 날짜
+    "2025-11-01~2025-11-30"     → 기간 (양 끝 포함)
+
+    Raises:
+        ValueError: 형식이 올바르지 않을 때
+    """
+    dates = []
+    for part in text.replace(" ", "").split(","):
+        if not part:
+            continue
+        if "~" in part:
+            start_text, _, end_text = part.partition("~")
+            start = datetime.strptime(start_text, "%Y-%m-%d").date()
+            end = datetime.strptime(end_text, "%Y-%m-%d").date()
+            if end < start:
+                raise ValueError(f"기간이 올바르지 않습니다: {part}")
+            dates.extend(start + timedelta(days=i) for i in range((end - start).days + 1))
+        else:
+            dates.append(datetime.strptime(part, "%Y-%m-%d").date())
+
+    if not dates:
+        raise ValueError("기준 날짜가 없습니다")
+    return sorted(set(dates))
+
+
+class SharedCube:
+    """공유 메모리에 올린 출퇴근 큐브 (with 문 종료 시 해제)"""
+
+    def __init__(self, cube: AttendanceCube):
+        """
+        초기화 (큐브 배열을 공유 메모리로 한 번 복사)
+
+        Args:
+            cube: AttendanceCube
+        """
+        self.names = cube.names
+        self.spec = {}
+        self._blocks = []
+
+        try:
+            for key in _ARRAYS:
+                array = np.ascontiguousarray(getattr(cube, key))
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                self._blocks.append(block)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+                self.spec[key] = (block.name, array.shape, array.dtype.str)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """공유 메모리 해제"""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    @staticmethod
+    def attach(spec: dict, names: List[str]):
+        """
+        작업 프로세스에서 공유 메모리에 붙기 (복사 없음)
+
+        Returns:
+            (AttendanceCube, 공유 메모리 핸들 목록 - 큐브를 쓰는 동안 유지)
+        """
+        blocks = []
+        arrays = {}
+        for key, (block_name, shape, dtype) in spec.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+        cube = AttendanceCube(arrays["dates"], names, arrays["check_in"], arrays["check_out"], arrays["present"])
+        return cube, blocks
+
+
+class MultiDateProcessor:
+    """여러 기준 날짜의 출퇴근 결정"""
+
+    def __init__(self, logger, workers: Optional[int] = MULTI_DATE_WORKERS):
+        """
+        초기화
+
+        Args:
+            logger: 로거
+            workers: 병렬 프로세스 수 (None이면 CPU 수)
+        """
+        self.logger = logger
+        self.workers = workers
+
+    def decide(
+        self,
+        cube: AttendanceCube,
+        pattern: WorkPattern,
+        base_dates: List[date],
+        roster=None,
+        policies: ShiftPolicyResolver = None
+    ) -> Dict[date, DecisionSet]:
+        """
+        기준 날짜별 전 직원 출퇴근 결정
+
+        Args:
+            cube: AttendanceCube
+            pattern: 근무 패턴
+            base_dates: 기준 날짜 목록
+            roster: ShiftRoster (선택)
+            policies: 직원별 근무 형태 (작업 프로세스에는 한 번만 전달)
+
+        Returns:
+            {기준 날짜: DecisionSet} (날짜 순서)
+        """
+        base_dates = sorted(base_dates)
+        policies = policies or ShiftPolicyResolver()
+        workers = min(self.workers or os.cpu_count() or 1, len(base_dates))
+
+        if workers <= 1:
+            results = [
+                AttendanceEngine(pattern, self.logger, day, roster, policies=policies).decide_cube(cube)
+                for day in base_dates
+            ]
+        else:
+            with SharedCube(cube) as shared:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(shared.spec, shared.names, pattern, roster, policies),
+                ) as pool:
+                    results = list(pool.map(_decide, base_dates))
+
+        self.logger.info(f"출퇴근 결정: {len(base_dates)}일, {sum(len(r) for r in results)}건")
+        return dict(zip(base_dates, results))
+
+
+def _init_worker(spec: dict, names: List[str], pattern: WorkPattern, roster, policies: ShiftPolicyResolver):
+    """작업 프로세스 초기화 (공유 메모리 큐브에 한 번만 붙음)"""
+    cube, blocks = SharedCube.attach(spec, names)
+    _worker.update(cube=cube, blocks=blocks, pattern=pattern, roster=roster, policies=policies, logger=QuietLogger())
+
+
+def _decide(base_date: date) -> DecisionSet:
+    """기준 날짜 하나의 결정 (작업 프로세스)"""
+    engine = AttendanceEngine(
+        _worker["pattern"], _worker["logger"], base_date, _worker["roster"], policies=_worker["policies"]
+    )
+    return engine.decide_cube(_worker["cube"])
@@ -0,0 +1,177 @@
+"""
+근태 자동 입력 v3.0 - 근무표 (교대 스케줄)
+근무표(이름, 날짜, 시작, 종료)를 직원별 정렬 배열로 색인해
+"이 출퇴근이 어느 예정 근무에 속하는지"를 O(log n)으로 찾음
+"""
+import os
+import pickle
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from config import (
+    ROSTER_COL_NAME, ROSTER_COL_DATE, ROSTER_COL_START, ROSTER_COL_END,
+    ROSTER_CACHE_FILE, ROSTER_TOLERANCE_MINUTES,
+)
+
+
+class ShiftRoster:
+    """근무표 색인"""
+
+    CACHE_VERSION = 2
+
+    def __init__(self, index: Dict[str, Tuple[np.ndarray, np.ndarray]], tolerance_minutes: int = ROSTER_TOLERANCE_MINUTES):
+        """
+        초기화
+
+        Args:
+            index: {정규화된 이름: (시작 분 배열, 종료 분 배열)} - 시작 기준 정렬, epoch 기준 분
+            tolerance_minutes: 조기 출근/늦은 퇴근 허용 범위
+        """
+        self.index = index
+        self.tolerance = tolerance_minutes
+
+    @classmethod
+    def load(cls, file_path: str, logger, cache_path: str = ROSTER_CACHE_FILE) -> "ShiftRoster":
+        """
+        근무표 불러오기 (원본이 바뀌지 않았으면 캐시 사용)
+
+        Args:
+            file_path: 근무표 파일 (.xlsx/.xls/.csv)
+            logger: 로거
+            cache_path: 색인 캐시 파일
+
+        Returns:
+            ShiftRoster
+        """
+        source = os.path.abspath(file_path)
+        stat = os.stat(source)
+        signature = (cls.CACHE_VERSION, source, stat.st_mtime, stat.st_size)
+
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, "rb") as f:
+                    cached = pickle.load(f)
+                if cached.get("signature") == signature:
+                    logger.info(f"근무표 색인 캐시 사용: {len(cached['index'])}명")
+                    return cls(cached["index"])
+            except Exception as e:
+                logger.debug(f"근무표 캐시 읽기 실패 (다시 생성): {str(e)}")
+
+        logger.info(f"근무표 로드: {file_path}")
+        index = cls._build_index(cls._read(file_path), logger)
+
+        try:
+            with open(cache_path, "wb") as f:
+                pickle.dump({"signature": signature, "index": index}, f)
+        except Exception as e:
+            logger.warning(f"근무표 캐시 저장 실패: {str(e)}")
+
+        logger.success(f"근무표 색인 완료: {len(index)}명, {sum(len(s) for s, _ in index.values())}건")
+        return cls(index)
+
+    @staticmethod
+    def _read(file_path: str) -> pd.DataFrame:
+        """근무표 파일 읽기"""
+        lower = file_path.lower()
+        if lower.endswith(".csv"):
+            return pd.read_csv(file_path)
+        if lower.endswith(".xls"):
+            return pd.read_excel(file_path, engine="xlrd")
+        return pd.read_excel(file_path, engine="openpyxl")
+
+    @staticmethod
+    def _build_index(df: pd.DataFrame, logger=None) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        색인 생성 (한 번만)
+
+        종료가 시작보다 이르면 다음 날 종료(야간 근무)로 본다.
+        시작/종료 시각이 비었거나 읽을 수 없는 줄은 제외 (00:00으로 보면 24시간 근무가 됨)
+
+        Args:
+            df: 근무표
+            logger: 로거 (제외한 줄 경고, 선택)
+        """
+        df = df.dropna(subset=[ROSTER_COL_NAME, ROSTER_COL_DATE])
+
+        start_minute = ShiftRoster._minute_of_day(df[ROSTER_COL_START])
+        end_minute = ShiftRoster._minute_of_day(df[ROSTER_COL_END])
+        invalid = np.isnan(start_minute) | np.isnan(end_minute)
+        if invalid.any():
+            if logger:
+                for label, row in df[invalid].iterrows():
+                    line = label + 2 if isinstance(label, (int, np.integer)) else label  # 머리글 1줄 + 0부터 시작
+                    logger.warning(
+                        f"근무표 {line}행 제외: 시작/종료 시각을 읽을 수 없음 "
+                        f"({row[ROSTER_COL_NAME]}, {row[ROSTER_COL_START]!r} ~ {row[ROSTER_COL_END]!r})"
+                    )
+            df = df[~invalid]
+            start_minute, end_minute = start_minute[~invalid], end_minute[~invalid]
+
+        days = pd.to_datetime(df[ROSTER_COL_DATE]).dt.normalize().to_numpy(dtype="datetime64[m]").astype(np.int64)
+        start = days + start_minute.astype(np.int64)
+        end = days + end_minute.astype(np.int64)
+        end = np.where(end <= start, end + 24 * 60, end)
+
+        keys = df[ROSTER_COL_NAME].astype(str).str.replace(" ", "").str.lower().to_numpy()
+        order = np.lexsort((start, keys))
+        keys, start, end = keys[order], start[order], end[order]
+
+        # 직원별 구간 (정렬되어 있으므로 경계만 찾으면 됨)
+        index = {}
+        bounds = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+        for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(keys)]):
+            if lo < hi:
+                index[keys[lo]] = (start[lo:hi], end[lo:hi])
+
+        return index
+
+    @staticmethod
+    def _minute_of_day(values: pd.Series) -> np.ndarray:
+        """"HH:MM"/time/datetime 값 → 분 (읽을 수 없으면 NaN)"""
+        parts = values.astype(str).str.extract(r"(\d{1,2}):(\d{2})").astype(float)
+        minutes = parts[0] * 60 + parts[1]
+        valid = (parts[0] <= 24) & (parts[1] < 60) & (minutes <= 24 * 60)
+        return minutes.where(valid).to_numpy(dtype=float)
+
+    def find_shift(self, name: str, when: datetime) -> Optional[Tuple[datetime, datetime]]:
+        """
+        해당 시각이 속한 예정 근무 찾기
+
+        Args:
+            name: 이름
+            when: 출근 또는 퇴근 시각
+
+        Returns:
+            (시작, 종료) 또는 None
+        """
+        entry = self.index.get(name.replace(" ", "").lower())
+        if entry is None or when is None:
+            return None
+
+        starts, ends = entry
+        t = int(np.datetime64(when, "m").astype(np.int64))
+
+        # 허용 범위 안에서 t 이전에 시작한 마지막 근무
+        i = int(np.searchsorted(starts, t + self.tolerance, side="right")) - 1
+        if i < 0 or ends[i] + self.tolerance < t:
+            return None
+
+        return (
+            np.datetime64(int(starts[i]), "m").astype(datetime),
+            np.datetime64(int(ends[i]), "m").astype(datetime),
+        )
+
+    def is_night_shift(self, name: str, when: datetime) -> Optional[bool]:
+        """
+        해당 시각이 자정을 넘기는 예정 근무에 속하는지
+
+        Returns:
+            True/False, 근무표에 없으면 None
+        """
+        shift = self.find_shift(name, when)
+        if shift is None:
+            return None
+        start, end = shift
+        return (end - timedelta(minutes=1)).date() > start.date()
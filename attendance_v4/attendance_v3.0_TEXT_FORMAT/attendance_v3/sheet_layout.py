@@ -0,0 +1,386 @@
+"""
+근태 자동 입력 v3.0 - 근태표 블록 배치
+(이름, 출근, 퇴근) 블록들을 최소한의 사각형으로 합쳐 시트당 COM 호출을 줄임
+
+    읽기: 모든 블록을 감싸는 사각형 1개 (예: 여주 C9:Z30) - Formula + Value
+    쓰기: 사이 열이 LAYOUT_MERGE_GAP 이하인 출근/퇴근 열 묶음끼리 한 사각형 (여주 4개, SMC 3개)
+          LAYOUT_MERGE_GAP = 0이면 출근/퇴근 셀만 덮는 사각형 (여주 10개)
+    지우기: 지울 범위 전체를 여러 영역 주소 하나로 (255자를 넘을 때만 나눔)
+
+합친 쓰기 사각형 안의 블록 밖 셀은 읽은 내용을 그대로 다시 쓴다 (읽기-수정-쓰기).
+Range.Formula는 텍스트 앞의 "'"를 빼고 돌려주므로, Value가 텍스트인 셀은 "'"를 다시 붙여 둔다
+(read_formulas - 안 그러면 "08:30", "001" 같은 텍스트를 Excel이 숫자/시간으로 바꿈).
+병합/보호된 셀이 걸려 사각형 쓰기가 실패하면 그 사각형은 바뀐 셀만 따로 쓴다.
+"""
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from config import LAYOUT_MERGE_GAP
+
+_CELL = re.compile(r"^\$?([A-Z]+)\$?(\d+)$")
+
+# (시작 행, 시작 열, 끝 행, 끝 열)
+Area = Tuple[int, int, int, int]
+
+ADDRESS_LIMIT = 255  # Excel Range() 주소 최대 글자 수
+
+
+def column_number(letters: str) -> int:
+    """열 문자 → 번호 (A=1)"""
+    number = 0
+    for ch in letters:
+        number = number * 26 + ord(ch) - 64
+    return number
+
+
+def column_letters(number: int) -> str:
+    """열 번호 → 문자 (1=A)"""
+    letters = ""
+    while number:
+        number, rem = divmod(number - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def parse_area(address: str) -> Area:
+    """
+    "C9:E11" / "A3" → (시작 행, 시작 열, 끝 행, 끝 열)
+
+    Raises:
+        ValueError: 주소 형식이 올바르지 않을 때
+    """
+    parts = address.strip().upper().split(":")
+    cells = [_CELL.match(part) for part in parts]
+    if len(parts) > 2 or not all(cells):
+        raise ValueError(f"잘못된 셀 주소: {address}")
+
+    (c1, r1), (c2, r2) = cells[0].groups(), cells[-1].groups()
+    r1, r2 = sorted((int(r1), int(r2)))
+    c1, c2 = sorted((column_number(c1), column_number(c2)))
+    return r1, c1, r2, c2
+
+
+def area_address(area: Area) -> str:
+    """(시작 행, 시작 열, 끝 행, 끝 열) → "C9:E11" (한 셀이면 "A3")"""
+    r1, c1, r2, c2 = area
+    start = f"{column_letters(c1)}{r1}"
+    if (r1, c1) == (r2, c2):
+        return start
+    return f"{start}:{column_letters(c2)}{r2}"
+
+
+class BlockLayout:
+    """근태표 블록 배치 (블록 설정마다 한 번만 계산 - layout_for)"""
+
+    def __init__(self, blocks: list, merge_gap: int = LAYOUT_MERGE_GAP):
+        """
+        초기화
+
+        Args:
+            blocks: [(이름범위, 출근범위, 퇴근범위), ...] - 각 범위는 한 열
+            merge_gap: 출근/퇴근 열 묶음 사이 열이 이 수 이하면 한 사각형으로 씀
+
+        Raises:
+            ValueError: 블록 범위가 한 열이 아니거나 행 수가 다를 때
+        """
+        # 행 순서대로 (행, 이름 열, 출근 열, 퇴근 열) - 블록 순서 유지
+        self.slots: List[Tuple[int, int, int, int]] = []
+        for block in blocks:
+            areas = [parse_area(address) for address in block]
+            rows = {(a[0], a[2]) for a in areas}
+            if len(rows) != 1 or any(a[1] != a[3] for a in areas):
+                raise ValueError(f"블록 범위가 올바르지 않습니다: {block}")
+            (r1, r2), = rows
+            self.slots.extend((r, areas[0][1], areas[1][1], areas[2][1]) for r in range(r1, r2 + 1))
+
+        cells = [(r, c) for r, *cols in self.slots for c in cols]
+        self.bounds: Area = (
+            min(r for r, _ in cells), min(c for _, c in cells),
+            max(r for r, _ in cells), max(c for _, c in cells),
+        )
+
+        # 출근/퇴근 셀 (쓰기 대상)
+        self.targets = {(r, c) for r, _, cin, cout in self.slots for c in (cin, cout)}
+        self.write_areas: List[Area] = self._plan_writes(merge_gap)
+
+    def _plan_writes(self, merge_gap: int) -> List[Area]:
+        """
+        쓰기 사각형
+
+        merge_gap이 0이면 출근/퇴근 셀만 덮는 사각형 (블록 밖 셀은 쓰지 않음),
+        0보다 크면 출근/퇴근 열을 연속 열 묶음으로 모으고, 사이 열이 merge_gap 이하인 묶음끼리 합침
+        """
+        if merge_gap <= 0:
+            return cell_areas(self.targets)
+
+        columns = sorted({c for _, c in self.targets})
+        runs = [[columns[0], columns[0]]]
+        for c in columns[1:]:
+            if c - runs[-1][1] - 1 <= merge_gap:
+                runs[-1][1] = c
+            else:
+                runs.append([c, c])
+
+        areas = []
+        for start, end in runs:
+            rows = [r for r, c in self.targets if start <= c <= end]
+            areas.append((min(rows), start, max(rows), end))
+        return areas
+
+    @property
+    def read_address(self) -> str:
+        return area_address(self.bounds)
+
+    def read(self, sheet) -> "SheetGrid":
+        """블록 전체를 한 번에 읽기 (COM: Range 1회 + Formula 1회 + Value 1회)"""
+        return SheetGrid(self, read_formulas(sheet.Range(self.read_address)))
+
+    def changed_areas(self, grid: "SheetGrid") -> List[Area]:
+        """바뀐 셀이 있는 쓰기 사각형"""
+        return [area for area in self.write_areas if grid.changed(area)]
+
+    def areas_for(self, cells) -> List[Area]:
+        """
+        바뀐 셀 → 쓸 사각형 (쓰기 사각형 밖의 셀은 제외)
+
+        바뀐 셀이 든 쓰기 사각형과 바뀐 셀만 묶은 사각형 중 Range 호출이 적은 쪽
+        (같으면 바뀐 셀만 - 다시 실행해서 몇 셀만 바뀌면 그 셀만 씀)
+        """
+        def inside(cell, area):
+            r1, c1, r2, c2 = area
+            return r1 <= cell[0] <= r2 and c1 <= cell[1] <= c2
+
+        cells = [cell for cell in cells if any(inside(cell, area) for area in self.write_areas)]
+        areas = [area for area in self.write_areas if any(inside(cell, area) for cell in cells)]
+        exact = cell_areas(cells)
+        return exact if len(exact) <= len(areas) else areas
+
+    def write(self, sheet, grid: "SheetGrid") -> int:
+        """
+        바뀐 쓰기 사각형만 한 번씩 쓰기
+
+        Returns:
+            쓴 사각형 수
+        """
+        areas = self.changed_areas(grid)
+        for area in areas:
+            write_area(sheet, grid, area)
+        return len(areas)
+
+
+def write_area(sheet, grid: "SheetGrid", area: Area) -> int:
+    """
+    사각형 하나 쓰기 (Range.Formula 1회)
+
+    병합/보호된 셀이 걸려 실패하면 사각형 안의 바뀐 셀만 묶어서 다시 쓴다.
+
+    Returns:
+        Range 쓰기 횟수
+    """
+    try:
+        sheet.Range(area_address(area)).Formula = grid.values(area)
+        return 1
+    except Exception:
+        parts = cell_areas(grid.changed_cells(area))
+        if parts == [area]:
+            raise
+        for part in parts:
+            sheet.Range(area_address(part)).Formula = grid.values(part)
+        return len(parts)
+
+
+@lru_cache(maxsize=None)
+def _cached_layout(blocks: tuple, merge_gap: int) -> BlockLayout:
+    return BlockLayout(list(blocks), merge_gap)
+
+
+def layout_for(blocks: list, merge_gap: int = LAYOUT_MERGE_GAP) -> BlockLayout:
+    """블록 설정 → BlockLayout (같은 설정은 한 번만 계산)"""
+    return _cached_layout(tuple(tuple(block) for block in blocks), merge_gap)
+
+
+def _split_addresses(ranges: tuple, limit: int) -> Tuple[Tuple[str, ...], int]:
+    """범위 목록 → (limit 글자 이하로 묶은 여러 영역 주소들, 전체 셀 수)"""
+    chunks = []
+    count = 0
+    for address in ranges:
+        r1, c1, r2, c2 = parse_area(address)
+        count += (r2 - r1 + 1) * (c2 - c1 + 1)
+        address = area_address((r1, c1, r2, c2))
+        if chunks and len(chunks[-1]) + 1 + len(address) <= limit:
+            chunks[-1] += "," + address
+        else:
+            chunks.append(address)
+    return tuple(chunks), count
+
+
+_cached_addresses = lru_cache(maxsize=None)(_split_addresses)
+
+
+def cell_areas(cells) -> List[Area]:
+    """
+    셀 목록 → 사각형 목록 (열마다 연속 행을 묶고, 행 묶음이 같은 이웃 열끼리 합침)
+
+    Args:
+        cells: [(행, 열), ...]
+    """
+    runs = {}
+    for c in sorted({c for _, c in cells}):
+        rows = sorted({r for r, col in cells if col == c})
+        spans = [[rows[0], rows[0]]]
+        for r in rows[1:]:
+            if r == spans[-1][1] + 1:
+                spans[-1][1] = r
+            else:
+                spans.append([r, r])
+        runs[c] = [tuple(span) for span in spans]
+
+    areas = []
+    for c, spans in runs.items():
+        for r1, r2 in spans:
+            merged = next((i for i, a in enumerate(areas) if (a[0], a[2], a[3]) == (r1, r2, c - 1)), None)
+            if merged is None:
+                areas.append((r1, c, r2, c))
+            else:
+                areas[merged] = (r1, areas[merged][1], r2, c)
+    return areas
+
+
+def join_addresses(areas: List[Area], limit: int = ADDRESS_LIMIT) -> Tuple[str, ...]:
+    """사각형 목록 → limit 글자 이하로 묶은 여러 영역 주소들"""
+    return _split_addresses(tuple(area_address(area) for area in areas), limit)[0]
+
+
+def clear_addresses(ranges: list, limit: int = ADDRESS_LIMIT) -> Tuple[Tuple[str, ...], int]:
+    """
+    지울 범위를 여러 영역 주소로 묶기 (같은 설정은 한 번만 계산)
+
+    Excel Range() 주소는 255자까지라 넘는 경우만 나눈다.
+
+    Args:
+        ranges: ["D9:E11", "G9:G11", ...]
+        limit: 주소 한 개의 최대 글자 수
+
+    Returns:
+        (주소 목록, 전체 셀 수)
+
+    Raises:
+        ValueError: 주소 형식이 올바르지 않을 때
+    """
+    return _cached_addresses(tuple(ranges), limit)
+
+
+class SheetGrid:
+    """블록 사각형의 셀 내용 (읽은 값 + 바꿀 값)"""
+
+    def __init__(self, layout: BlockLayout, formulas, planned=None):
+        """
+        초기화
+
+        Args:
+            layout: BlockLayout
+            formulas: 블록 사각형 Range.Formula (2차원 튜플, 한 셀이면 값 하나)
+            planned: 바꾼 후 내용 (변경 계획 - 없으면 읽은 그대로에서 set()으로 바꿈)
+        """
+        if not isinstance(formulas, tuple):
+            formulas = ((formulas,),)
+        self.layout = layout
+        self.origin = layout.bounds[:2]
+        self.original = [list(row) for row in formulas]
+        self.cells = [list(row) for row in (planned if planned is not None else formulas)]
+
+    def _index(self, row: int, col: int) -> Tuple[int, int]:
+        return row - self.origin[0], col - self.origin[1]
+
+    def get(self, row: int, col: int):
+        i, j = self._index(row, col)
+        return self.cells[i][j]
+
+    def set(self, row: int, col: int, value):
+        """출근/퇴근 셀만 바꿀 수 있음 (블록 밖 셀 보호)"""
+        if (row, col) not in self.layout.targets:
+            raise KeyError(f"블록 밖 셀: {area_address((row, col, row, col))}")
+        i, j = self._index(row, col)
+        self.cells[i][j] = value
+
+    def changed(self, area: Area) -> bool:
+        """사각형 안에 바뀐 셀이 있는지"""
+        r1, c1, r2, c2 = area
+        i1, j1 = self._index(r1, c1)
+        i2, j2 = self._index(r2, c2)
+        return any(self.cells[i][j1:j2 + 1] != self.original[i][j1:j2 + 1] for i in range(i1, i2 + 1))
+
+    def changed_cells(self, area: Area) -> List[Tuple[int, int]]:
+        """사각형 안의 바뀐 셀"""
+        r1, c1, r2, c2 = area
+        cells = []
+        for r in range(r1, r2 + 1):
+            for c in range(c1, c2 + 1):
+                i, j = self._index(r, c)
+                if self.cells[i][j] != self.original[i][j]:
+                    cells.append((r, c))
+        return cells
+
+    def values(self, area: Area) -> tuple:
+        """
+        쓰기용 2차원 튜플 (Range.Formula에 대입)
+
+        출근/퇴근 셀의 바뀌지 않은 텍스트는 "'"를 붙여 텍스트로 유지하고,
+        블록 밖 셀은 읽은 그대로 둔다 (텍스트는 read_formulas에서 이미 "'"가 붙어 있음).
+        """
+        r1, c1, r2, c2 = area
+        rows = []
+        for r in range(r1, r2 + 1):
+            row = []
+            for c in range(c1, c2 + 1):
+                i, j = self._index(r, c)
+                value = self.cells[i][j]
+                if (r, c) in self.layout.targets and value == self.original[i][j]:
+                    value = _as_text(value)
+                row.append(value)
+            rows.append(tuple(row))
+        return tuple(rows)
+
+
+def read_formulas(rng):
+    """
+    Range의 셀 내용 (Formula 형식, 텍스트 상수는 앞에 "'")
+
+    Formula는 텍스트 앞의 "'"를 빼고 돌려주므로 Value가 텍스트인 셀(수식 제외)만 "'"를 다시 붙인다.
+    그대로 다시 써도 Excel이 바꾸지 않음. COM: Formula 1회 + Value 1회
+
+    Returns:
+        2차원 튜플 (한 셀이면 값 하나 - Range.Formula와 같음)
+    """
+    formulas, values = rng.Formula, rng.Value
+    if not isinstance(formulas, tuple):
+        return quote_text(formulas, values)
+    return tuple(
+        tuple(quote_text(formula, value) for formula, value in zip(formula_row, value_row))
+        for formula_row, value_row in zip(formulas, values)
+    )
+
+
+def quote_text(formula, value):
+    """셀 내용이 텍스트 상수면 "'"를 붙임 (value가 텍스트이고 수식이 아닐 때)"""
+    if isinstance(value, str) and isinstance(formula, str) and formula and formula[0] not in "='":
+        return "'" + formula
+    return formula
+
+
+def _as_text(value):
+    """입력했던 텍스트가 숫자/시간으로 바뀌지 않도록 "'" 붙이기"""
+    if isinstance(value, str) and value and value[0] not in "='":
+        return "'" + value
+    return value
+
+
+def slot_name(value) -> Optional[str]:
+    """이름 셀 값 → 이름 (비어 있으면 None, 텍스트 표시 "'"는 뺌)"""
+    name = str(value or "").strip()
+    if name.startswith("'"):
+        name = name[1:].strip()
+    if not name or name == "None":
+        return None
+    return name
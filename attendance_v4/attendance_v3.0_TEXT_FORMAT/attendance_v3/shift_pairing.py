@@ -0,0 +1,107 @@
+"""
+근태 자동 입력 v3.0 - 출퇴근 페어링
+전체 이력에서 출근마다 다음 퇴근을 구간 조인으로 짝지음 (자정/주말 넘김 지원)
+"""
+import pandas as pd
+from config import COL_DATE, COL_NAME, COL_IN_TIME, COL_OUT_TIME, MAX_SHIFT_HOURS
+from models import normalize_name
+
+_KEY = '_key'
+
+
+class ShiftPairer:
+    """출퇴근 페어링"""
+
+    def __init__(self, logger, max_shift_hours: float = MAX_SHIFT_HOURS):
+        """
+        초기화
+
+        Args:
+            logger: 로거
+            max_shift_hours: 출근~퇴근 최대 근무 시간
+        """
+        self.logger = logger
+        self.max_shift = pd.Timedelta(hours=max_shift_hours)
+
+    def pair(self, history: pd.DataFrame) -> pd.DataFrame:
+        """
+        근무 기록 생성
+
+        출근 시각을 정렬한 뒤 같은 사람의 다음 퇴근을 merge_asof(forward)로 찾는다.
+        최대 근무 시간을 넘거나 다음 출근 이후의 퇴근은 짝짓지 않는다.
+        짝이 없는 퇴근은 출근 없는 기록으로 남긴다.
+        같은 사람은 정규화 이름으로 묶고(AttendanceCube와 같음), 이름은 처음 나온 표기로 쓴다.
+
+        Args:
+            history: DataAnalyzer.normalize_history() 결과
+
+        Returns:
+            DataFrame[이름, 근무일자, 출근시각, 퇴근시각] (근무일자 = 출근 날짜)
+        """
+        keys = history[COL_NAME].map(normalize_name)
+        names = history[COL_NAME].groupby(keys).first()
+        history = history.assign(**{_KEY: keys})
+
+        ins = (
+            history.loc[history[COL_IN_TIME].notna(), [_KEY, COL_IN_TIME]]
+            .drop_duplicates()
+            .sort_values([_KEY, COL_IN_TIME])
+        )
+        outs = (
+            history.loc[history[COL_OUT_TIME].notna(), [_KEY, COL_OUT_TIME]]
+            .drop_duplicates()
+            .sort_values(COL_OUT_TIME)
+        )
+
+        # 같은 사람의 다음 출근 시각
+        ins['_next_in'] = ins.groupby(_KEY)[COL_IN_TIME].shift(-1)
+        ins = ins.sort_values(COL_IN_TIME)
+
+        # 출근 이후 가장 가까운 퇴근 (최대 근무 시간 이내)
+        shifts = pd.merge_asof(
+            ins,
+            outs,
+            left_on=COL_IN_TIME,
+            right_on=COL_OUT_TIME,
+            by=_KEY,
+            direction='forward',
+            tolerance=self.max_shift,
+            allow_exact_matches=False,
+        )
+
+        # 다음 출근 이후의 퇴근은 다음 근무의 것
+        stale = shifts['_next_in'].notna() & (shifts[COL_OUT_TIME] > shifts['_next_in'])
+        shifts.loc[stale, COL_OUT_TIME] = pd.NaT
+        shifts = shifts.drop(columns='_next_in')
+
+        # 짝이 없는 퇴근
+        used = shifts.loc[shifts[COL_OUT_TIME].notna(), [_KEY, COL_OUT_TIME]]
+        orphans = outs.merge(used, on=[_KEY, COL_OUT_TIME], how='left', indicator=True)
+        orphans = orphans.loc[orphans['_merge'] == 'left_only', [_KEY, COL_OUT_TIME]]
+        orphans[COL_IN_TIME] = pd.NaT
+
+        shifts = pd.concat([shifts, orphans], ignore_index=True)
+        shifts[COL_NAME] = shifts[_KEY].map(names)
+        shifts[COL_DATE] = shifts[COL_IN_TIME].fillna(shifts[COL_OUT_TIME]).dt.normalize()
+
+        return (
+            shifts[[COL_NAME, COL_DATE, COL_IN_TIME, COL_OUT_TIME]]
+            .sort_values([COL_NAME, COL_DATE, COL_IN_TIME])
+            .reset_index(drop=True)
+        )
+
+    def log_summary(self, shifts: pd.DataFrame):
+        """
+        페어링 결과 로그
+
+        Args:
+            shifts: pair() 결과
+        """
+        complete = shifts[COL_IN_TIME].notna() & shifts[COL_OUT_TIME].notna()
+        overnight = complete & (shifts[COL_OUT_TIME].dt.normalize() > shifts[COL_DATE])
+
+        self.logger.success("출퇴근 페어링 완료:")
+        self.logger.info(f"  근무 기록: {int(complete.sum())}건")
+        self.logger.info(f"  자정 넘김: {int(overnight.sum())}건")
+        self.logger.info(f"  퇴근 누락: {int(shifts[COL_OUT_TIME].isna().sum())}건")
+        self.logger.info(f"  출근 누락: {int(shifts[COL_IN_TIME].isna().sum())}건")
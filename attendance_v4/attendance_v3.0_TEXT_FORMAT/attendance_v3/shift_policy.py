@@ -0,0 +1,156 @@
+"""
+근태 자동 입력 v3.0 - 근무 형태 (야간 판단 정책)
+출근 시각으로 "자정을 넘기는 근무의 시작인지"를 판단하는 정책을 등록해 두고,
+직원별 정책은 실행마다 한 번만 정해서 캐시
+
+엔진은 정책별로 직원을 묶어 묶음마다 한 번씩 배열로 판단한다.
+새 정책은 ShiftPolicy를 상속해 register_policy()로 등록하면 됨.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+from models import normalize_name
+from config import (
+    COL_NAME, COL_DEPT,
+    DEFAULT_SHIFT_POLICY, SHIFT_POLICY_BY_DEPT, SHIFT_POLICY_BY_NAME, THREE_SHIFT_NIGHT_HOUR,
+)
+
+
+class ShiftPolicy(ABC):
+    """근무 형태 (야간 출근 판단)"""
+
+    name = ""
+    description = ""
+
+    @abstractmethod
+    def is_night(self, minutes: np.ndarray, cutoff: int) -> np.ndarray:
+        """
+        야간 근무 출근 여부 (일괄)
+
+        Args:
+            minutes: 출근 시각 (0~1439분, 모두 있는 값)
+            cutoff: 엔진의 야간 판단 기준 (분)
+
+        Returns:
+            bool 배열
+        """
+
+
+class DayPolicy(ShiftPolicy):
+    name = "day"
+    description = "주간 고정 (야간 없음)"
+
+    def is_night(self, minutes, cutoff):
+        return np.zeros(len(minutes), dtype=bool)
+
+
+class NightPolicy(ShiftPolicy):
+    name = "night"
+    description = "야간 고정 (출근은 항상 야간 근무 시작)"
+
+    def is_night(self, minutes, cutoff):
+        return np.ones(len(minutes), dtype=bool)
+
+
+class ThreeShiftPolicy(ShiftPolicy):
+    name = "three_shift"
+    description = f"3교대 ({THREE_SHIFT_NIGHT_HOUR}시 이후 출근만 야간조, 오후조는 주간)"
+
+    def is_night(self, minutes, cutoff):
+        return minutes >= THREE_SHIFT_NIGHT_HOUR * 60
+
+
+class FlexiblePolicy(ShiftPolicy):
+    name = "flexible"
+    description = "유연 (야간 판단 기준 시각 이후 출근은 야간)"
+
+    def is_night(self, minutes, cutoff):
+        return minutes >= cutoff
+
+
+_REGISTRY: Dict[str, ShiftPolicy] = {}
+
+
+def register_policy(policy: ShiftPolicy) -> ShiftPolicy:
+    """정책 등록 (같은 이름이면 교체)"""
+    _REGISTRY[policy.name] = policy
+    return policy
+
+
+def get_policy(name: str) -> ShiftPolicy:
+    """이름 → 정책"""
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 근무 형태: {name} (가능: {', '.join(_REGISTRY)})")
+
+
+for _policy in (DayPolicy(), NightPolicy(), ThreeShiftPolicy(), FlexiblePolicy()):
+    register_policy(_policy)
+
+
+class ShiftPolicyResolver:
+    """직원별 근무 형태 (이름 설정 > 부서 설정 > 기본값)"""
+
+    def __init__(
+        self,
+        by_name: Dict[str, str] = SHIFT_POLICY_BY_NAME,
+        by_dept: Dict[str, str] = SHIFT_POLICY_BY_DEPT,
+        default: str = DEFAULT_SHIFT_POLICY,
+        departments: Dict[str, str] = None
+    ):
+        """
+        초기화 (설정의 정책 이름은 여기서 모두 확인)
+
+        Args:
+            by_name: {이름: 정책}
+            by_dept: {부서: 정책}
+            default: 기본 정책
+            departments: {이름: 부서}
+        """
+        self.policies: List[ShiftPolicy] = list(_REGISTRY.values())
+        codes = {policy.name: i for i, policy in enumerate(self.policies)}
+
+        def code(policy_name):
+            get_policy(policy_name)
+            return codes[policy_name]
+
+        self._default = code(default)
+        self._by_name = {normalize_name(name): code(policy) for name, policy in by_name.items()}
+        by_dept = {dept: code(policy) for dept, policy in by_dept.items()}
+        for name, dept in (departments or {}).items():
+            key = normalize_name(name)
+            if key not in self._by_name and dept in by_dept:
+                self._by_name[key] = by_dept[dept]
+
+        self._cache: Dict[str, int] = {}
+
+    @classmethod
+    def from_history(cls, history: pd.DataFrame, **kwargs) -> "ShiftPolicyResolver":
+        """이력의 부서 컬럼으로 부서별 설정까지 반영 (부서는 마지막 기록 기준)"""
+        departments = {}
+        if COL_DEPT in history.columns:
+            departments = history.dropna(subset=[COL_DEPT]).groupby(COL_NAME)[COL_DEPT].last().to_dict()
+        return cls(departments=departments, **kwargs)
+
+    def codes(self, names: Sequence[str]) -> np.ndarray:
+        """
+        이름 목록 → 정책 번호 배열 (self.policies 인덱스 = 등록 순서, 이름별로 한 번만 계산)
+
+        번호는 결정 기록에 저장되므로 기본 정책의 등록 순서는 바꾸지 않는다 (새 정책은 뒤에 추가).
+        """
+        if not self._by_name:
+            return np.full(len(names), self._default, dtype=np.int8)
+
+        cache = self._cache
+        for name in names:
+            if name not in cache:
+                cache[name] = self._by_name.get(normalize_name(name), self._default)
+        return np.fromiter((cache[name] for name in names), dtype=np.int8, count=len(names))
+
+    def summary(self, names: Sequence[str]) -> Dict[str, int]:
+        """정책별 인원 (로그용)"""
+        counts = np.bincount(self.codes(names), minlength=len(self.policies))
+        return {policy.name: int(count) for policy, count in zip(self.policies, counts) if count}
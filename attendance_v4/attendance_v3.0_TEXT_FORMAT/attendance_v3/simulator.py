@@ -0,0 +1,324 @@
+"""
+근태 자동 입력 v3.0 - 규칙 시뮬레이션
+임계값(야간 판단 시각, 공휴일 임계값, 최소 출근 인원)을 바꾸기 전에
+전체 이력(출퇴근 큐브)에 설정별로 다시 실행해 운영 결정(결정 기록)과 달라지는 건수를 비교
+
+    python simulator.py 2025-01-01 2025-12-31 --set night_cutoff_hour=11 --set holiday_threshold=0.25,min_attendance=3
+    python simulator.py 2025-01-01 2025-12-31 --raw 원시.xlsx ...   (큐브를 원시 데이터로 다시 생성)
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from logger import QuietLogger
+from data_analyzer import DataAnalyzer
+from attendance_cube import AttendanceCube
+from attendance_engine import AttendanceEngine
+from shift_policy import ShiftPolicyResolver
+from models import BatchResult, WorkPattern, PATTERNS
+from time_format import MINUTE_STRING_ARRAY
+from config import (
+    HOLIDAY_THRESHOLD, MIN_ATTENDANCE, NIGHT_CUTOFF_HOUR,
+    CUBE_DIR, SIMULATION_FILE, SIMULATION_WORKERS,
+)
+
+# 시뮬레이션할 수 있는 설정과 현재 값
+DEFAULTS = {
+    "night_cutoff_hour": NIGHT_CUTOFF_HOUR,
+    "holiday_threshold": HOLIDAY_THRESHOLD,
+    "min_attendance": MIN_ATTENDANCE,
+}
+
+# 작업 프로세스별 상태 (큐브는 프로세스마다 같은 파일을 memmap)
+_worker = {}
+
+
+class RuleSimulator:
+    """규칙 시뮬레이터"""
+
+    def __init__(
+        self,
+        logger,
+        cube_path: str = CUBE_DIR,
+        roster=None,
+        workers: Optional[int] = SIMULATION_WORKERS,
+        policies: ShiftPolicyResolver = None
+    ):
+        """
+        초기화
+
+        Args:
+            logger: 로거
+            cube_path: 저장된 출퇴근 큐브 폴더 (AttendanceCube.save)
+            roster: ShiftRoster (선택)
+            workers: 병렬 프로세스 수 (None이면 CPU 수)
+            policies: 직원별 근무 형태 (None이면 설정값 - 결정 기록이 있으면 기록된 근무 형태가 우선)
+        """
+        self.logger = logger
+        self.cube_path = cube_path
+        self.roster = roster
+        self.workers = workers
+        self.policies = policies or ShiftPolicyResolver()
+
+    def run(
+        self,
+        start: date,
+        end: date,
+        parameter_sets: List[dict],
+        journal=None
+    ) -> Tuple[pd.DataFrame, List[pd.DataFrame]]:
+        """
+        설정별 시뮬레이션
+
+        운영 결정은 결정 기록(journal)의 기간 내 기록을 사용하고,
+        기록이 없으면 현재 설정으로 계산한 결과를 기준으로 삼는다.
+
+        Args:
+            start: 시작 날짜
+            end: 종료 날짜 (포함)
+            parameter_sets: 설정 목록 (DEFAULTS의 일부 키만 지정 가능)
+            journal: DecisionJournal (선택)
+
+        Returns:
+            (요약 DataFrame, 설정별 변경 DataFrame 목록)
+        """
+        for params in parameter_sets:
+            unknown = set(params) - set(DEFAULTS)
+            if unknown:
+                raise ValueError(f"알 수 없는 설정: {', '.join(sorted(unknown))}")
+
+        _init_worker(self.cube_path, self.roster, self.policies)
+        production = self._production(start, end, journal)
+        if production is None:
+            return pd.DataFrame(), []
+
+        run_dates, names, expected, policy = production
+        self.logger.info(f"운영 결정: {len(run_dates)}일, {len(expected.names)}건")
+
+        # 현재 설정을 맨 앞에 두어 이력 자체의 차이(데이터 수정 등)를 함께 보여줌
+        runs = [dict(DEFAULTS)] + [{**DEFAULTS, **params} for params in parameter_sets]
+
+        if self.workers == 1 or len(runs) == 1:
+            outcomes = [_simulate(params, run_dates, names, policy) for params in runs]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.cube_path, self.roster, self.policies),
+            ) as pool:
+                outcomes = list(pool.map(
+                    _simulate, runs, [run_dates] * len(runs), [names] * len(runs), [policy] * len(runs)
+                ))
+
+        base_pattern = outcomes[0][0]
+        rows = []
+        diffs = []
+        for params, (pattern, result) in zip(runs, outcomes):
+            diff = _compare(expected, result)
+            diffs.append(diff)
+            rows.append({
+                "설정": _describe(params),
+                "결정 수": len(result.names),
+                "변경 수": len(diff),
+                "변경 비율": round(len(diff) / len(result.names), 4) if len(result.names) else 0.0,
+                "근무일": len(pattern.work_days),
+                "공휴일": len(pattern.holidays),
+                "근무일 변경": len(set(pattern.work_days) ^ set(base_pattern.work_days)),
+            })
+            self.logger.info(f"  {rows[-1]['설정']}: 변경 {len(diff)}건")
+
+        return pd.DataFrame(rows), diffs
+
+    def save(self, summary: pd.DataFrame, diffs: List[pd.DataFrame], file_path: str = SIMULATION_FILE):
+        """
+        시뮬레이션 결과를 Excel 파일로 저장 (요약 + 설정별 시트)
+
+        Args:
+            summary: run() 요약
+            diffs: run() 설정별 변경
+            file_path: 저장 경로
+        """
+        try:
+            with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
+                summary.to_excel(writer, sheet_name="요약", index=False)
+                for i, diff in enumerate(diffs):
+                    sheet = "현재 설정" if i == 0 else f"설정{i}"
+                    diff.to_excel(writer, sheet_name=sheet, index=False)
+
+            self.logger.info(f"시뮬레이션 결과 파일 생성: {file_path}")
+
+        except Exception as e:
+            self.logger.error(f"시뮬레이션 결과 파일 생성 실패: {str(e)}")
+
+    def _production(
+        self, start: date, end: date, journal
+    ) -> Optional[Tuple[List[date], List[List[str]], BatchResult, Optional[np.ndarray]]]:
+        """운영 결정 (실행 날짜, 날짜별 이름, 결과, 기록된 근무 형태 - 기록이 없으면 None)"""
+        records = journal.load(start, end) if journal is not None else np.empty(0)
+
+        if len(records):
+            all_names = journal.names_of(records["employee"])
+            run_days = records["run_date"]
+            run_dates = [d.astype(date) for d in np.unique(run_days)]
+            names = [list(all_names[run_days == np.datetime64(d, "D")]) for d in run_dates]
+            expected = BatchResult(
+                names=list(all_names),
+                check_in=records["check_in"],
+                check_out=records["check_out"],
+                base_date=records["base_date"],
+                pattern=records["pattern"],
+            )
+            return run_dates, names, expected, np.array(records["policy"])
+
+        # 결정 기록이 없으면 현재 설정의 근무일 전체를 운영 결정으로 간주
+        self.logger.warning("결정 기록이 없어 현재 설정의 결과를 기준으로 비교합니다")
+        pattern = _worker["analyzer"].analyze_work_pattern(None, daily_stats=_worker["counts"])
+        run_dates = [day for day in sorted(pattern.work_days) if start <= day <= end]
+        if not run_dates:
+            self.logger.warning("해당 기간의 근무일이 없습니다")
+            return None
+
+        engine = AttendanceEngine(pattern, _worker["logger"], roster=self.roster, policies=self.policies)
+        names = [engine.gather_cube(_worker["cube"], day)["names"] for day in run_dates]
+
+        _, expected = _simulate(dict(DEFAULTS), run_dates, names)
+        return run_dates, names, expected, None
+
+
+def _init_worker(cube_path: str, roster, policies: ShiftPolicyResolver):
+    """작업 프로세스 초기화 (큐브 memmap, 날짜별 출근 인원은 프로세스당 한 번)"""
+    logger = QuietLogger()
+    cube = AttendanceCube.load(cube_path)
+    _worker.update(
+        cube=cube,
+        counts=cube.daily_counts(),
+        roster=roster,
+        policies=policies,
+        logger=logger,
+        analyzer=DataAnalyzer(logger),
+    )
+
+
+def _simulate(
+    params: dict,
+    run_dates: List[date],
+    names: List[List[str]],
+    policy: Optional[np.ndarray] = None
+) -> Tuple[WorkPattern, BatchResult]:
+    """
+    설정 하나로 전체 기간 다시 실행
+
+    패턴 분석은 설정별로 한 번, 엔진은 전체 날짜를 모아 한 번에 계산한다.
+    policy(결정 기록의 근무 형태)가 있으면 운영 때의 근무 형태로 판단 (--raw 없이도 부서별 설정 반영).
+    """
+    pattern = _worker["analyzer"].analyze_work_pattern(
+        None,
+        holiday_threshold=params["holiday_threshold"],
+        min_attendance=params["min_attendance"],
+        daily_stats=_worker["counts"],
+    )
+    engine = AttendanceEngine(
+        pattern, _worker["logger"],
+        roster=_worker["roster"],
+        night_cutoff_hour=params["night_cutoff_hour"],
+        policies=_worker["policies"],
+    )
+    parts = [engine.gather_cube(_worker["cube"], day, day_names) for day, day_names in zip(run_dates, names)]
+
+    inputs = {"names": [name for part in parts for name in part["names"]]}
+    for key in ("cin_today", "cout_today", "cin_yest", "cout_yest", "today_date", "yest_date", "policy"):
+        inputs[key] = np.concatenate([part[key] for part in parts]) if parts else np.empty(0)
+    if policy is not None:
+        inputs["policy"] = policy
+
+    return pattern, engine.decide_batch(**inputs)
+
+
+def _compare(expected: BatchResult, result: BatchResult) -> pd.DataFrame:
+    """운영 결정과 시뮬레이션 결과의 차이"""
+    changed = (
+        (result.pattern != expected.pattern)
+        | (result.check_in != expected.check_in)
+        | (result.check_out != expected.check_out)
+        | (result.base_date.astype("i8") != expected.base_date.astype("i8"))
+    )
+    rows = np.flatnonzero(changed)
+    patterns = np.array(PATTERNS, dtype=object)
+
+    return pd.DataFrame({
+        "이름": np.array(result.names, dtype=object)[rows],
+        "기존_날짜": expected.base_date[rows],
+        "기존_패턴": patterns[expected.pattern[rows]],
+        "기존_출근": MINUTE_STRING_ARRAY[expected.check_in[rows]],
+        "기존_퇴근": MINUTE_STRING_ARRAY[expected.check_out[rows]],
+        "변경_날짜": result.base_date[rows],
+        "변경_패턴": patterns[result.pattern[rows]],
+        "변경_출근": MINUTE_STRING_ARRAY[result.check_in[rows]],
+        "변경_퇴근": MINUTE_STRING_ARRAY[result.check_out[rows]],
+    })
+
+
+def _describe(params: dict) -> str:
+    """설정 → 표시 문자열 (현재 값과 다른 항목만)"""
+    changed = [f"{key}={value}" for key, value in params.items() if DEFAULTS[key] != value]
+    return ", ".join(changed) if changed else "현재 설정"
+
+
+def _parse_set(text: str) -> Dict[str, float]:
+    """"a=1,b=0.5" → {"a": 1, "b": 0.5}"""
+    params = {}
+    for item in text.split(","):
+        key, _, value = item.partition("=")
+        key = key.strip()
+        if key not in DEFAULTS:
+            raise ValueError(f"알 수 없는 설정: {key}")
+        params[key] = type(DEFAULTS[key])(value.strip())
+    return params
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    import argparse
+    from datetime import datetime
+    from logger import Logger
+    from decision_journal import DecisionJournal
+
+    parser = argparse.ArgumentParser(description="규칙 변경 시뮬레이션")
+    parser.add_argument("start")
+    parser.add_argument("end")
+    parser.add_argument("--set", dest="sets", action="append", default=[],
+                        help=f"설정 (예: night_cutoff_hour=11,min_attendance=3) - 가능: {', '.join(DEFAULTS)}")
+    parser.add_argument("--cube", default=CUBE_DIR, help="출퇴근 큐브 폴더 (프로그램 실행 때 갱신됨)")
+    parser.add_argument("--raw", help="원시 데이터 파일 (지정하면 큐브를 다시 생성)")
+    parser.add_argument("--roster", help="근무표 파일")
+    parser.add_argument("--workers", type=int, default=SIMULATION_WORKERS)
+    parser.add_argument("--output", default=SIMULATION_FILE)
+    args = parser.parse_args()
+
+    logger = Logger()
+    policies = None
+    if args.raw:
+        engine_name = "xlrd" if args.raw.lower().endswith(".xls") else "openpyxl"
+        raw = pd.read_excel(args.raw, engine=engine_name)
+        history = DataAnalyzer(logger).normalize_history(raw)
+        AttendanceCube.from_history(history).save(args.cube)
+        policies = ShiftPolicyResolver.from_history(history)
+
+    roster = None
+    if args.roster:
+        from roster import ShiftRoster
+        roster = ShiftRoster.load(args.roster, logger)
+
+    simulator = RuleSimulator(logger, args.cube, roster, args.workers, policies)
+    summary, diffs = simulator.run(
+        datetime.strptime(args.start, "%Y-%m-%d").date(),
+        datetime.strptime(args.end, "%Y-%m-%d").date(),
+        [_parse_set(text) for text in args.sets],
+        DecisionJournal(logger),
+    )
+    if not summary.empty:
+        print(summary.to_string(index=False))
+        simulator.save(summary, diffs, args.output)
@@ -0,0 +1,186 @@
+"""
+근태 자동 입력 v3.0 - 근태표 동시 처리
+근태표(여주, SMC ...)는 서로 다른 파일이므로 근태표마다 작업 프로세스 하나가
+자기 Excel(COM 아파트)을 열어 시트 추가/입력/저장을 동시에 한다.
+
+작업 프로세스의 로그는 모아 두었다가 끝나면 결과와 함께 돌려주고,
+메인 프로세스에서 근태표 순서대로 출력한 뒤 시간/단계별 통계를 합쳐서 출력.
+
+저장은 근태표마다 따로 한다 (한 근태표가 실패해도 다른 근태표는 저장됨 - SiteResult.saved).
+모두 저장하거나 모두 저장하지 않아야 하면 ComWorker 경로(SITE_PROCESSES = False)를 쓴다.
+"""
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait as wait_futures
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+from logger import BufferedLogger, LogLevel, replay_messages
+from excel_com import ExcelSession
+from models import DecisionSet
+from config import SITE_WORKERS
+
+
+@dataclass
+class SiteJob:
+    """근태표 하나의 입력 작업"""
+    name: str           # 근태표 이름 (로그용)
+    file_path: str      # 근태표 파일
+    blocks: list        # (이름, 출근, 퇴근) 블록 리스트
+    clear_ranges: list  # 시트 준비 때 지울 범위
+
+
+@dataclass
+class SiteResult:
+    """근태표 하나의 처리 결과 (작업 프로세스 → 메인 프로세스)"""
+    name: str
+    logs: List[Tuple[LogLevel, str]] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)  # Excel 단계별 시간 (초)
+    started: float = 0.0   # time.time() (프로세스끼리 비교 가능)
+    finished: float = 0.0
+    sheets: int = 0
+    changes: int = 0  # 바뀐 셀 수
+    saved: bool = False  # 근태표를 저장했는지 (바뀐 셀이 없거나 실패하면 저장 안 함)
+    error: Optional[str] = None
+
+    @property
+    def seconds(self) -> float:
+        return self.finished - self.started
+
+
+def write_site(job: SiteJob, decisions: Dict[date, DecisionSet], application=None) -> SiteResult:
+    """
+    근태표 하나 처리 (작업 프로세스 - Excel 시작부터 종료까지)
+
+    Args:
+        job: 근태표 작업
+        decisions: {기준 날짜: 출퇴근 결정 결과}
+        application: Excel.Application 대신 쓸 객체 (fake_com.FakeExcel 등, None이면 win32com)
+
+    Returns:
+        SiteResult (실패해도 예외 대신 error에 기록 - 로그를 함께 돌려주기 위해)
+    """
+    log = BufferedLogger()
+    result = SiteResult(job.name, started=time.time())
+
+    log.separator()
+    log.info(f"[{job.name} 근태표 처리]")
+    log.info(f"파일: {job.file_path}")
+
+    try:
+        # 쓰는 동안 화면 갱신/자동 계산/이벤트 끔 (끝나면 바뀐 시트를 계산하고 되돌림)
+        # 모든 날짜를 입력하고 설정을 되돌린 뒤 한 번만 저장, 도중 실패하면 저장하지 않고 닫음
+        with ExcelSession(log, application) as session, session.open(job.file_path) as excel:
+            with excel.transaction(), excel.performance() as perf:
+                # 모든 기준 날짜의 셀 변경을 먼저 계산한 뒤 (시트는 읽기만) 한 번에 적용
+                changeset = excel.plan(job.blocks, job.clear_ranges, decisions)
+                result.changes = excel.apply(changeset)
+                result.sheets = len(changeset.plans)
+            result.timings = dict(perf.timings)
+            result.saved = result.changes > 0  # transaction()은 바뀐 셀이 있을 때만 저장
+
+    except Exception as e:
+        result.error = str(e)
+
+    result.finished = time.time()
+    result.logs = log.drain()
+    return result
+
+
+class SitePool:
+    """근태표별 작업 프로세스"""
+
+    def __init__(self, logger, sites: int, workers: Optional[int] = SITE_WORKERS, application=None):
+        """
+        초기화
+
+        Args:
+            logger: 로거
+            sites: 근태표 수
+            workers: 동시에 처리할 근태표 수 (None이면 근태표 수 - Excel을 기다리는 작업이라 CPU 수와 무관)
+            application: 작업 프로세스에서 Excel.Application 대신 쓸 객체 (피클 가능해야 함)
+        """
+        self.logger = logger
+        self.workers = max(1, min(workers or sites, sites))
+        self.application = application
+        self.results: List[SiteResult] = []
+        self._pool = None
+        self._futures: List[Future] = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """프로세스 풀 준비 (프로세스는 작업을 넣을 때 필요한 만큼 뜸)"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def submit(self, job: SiteJob, decisions: Dict[date, DecisionSet]) -> Future:
+        """
+        근태표 작업 넣기
+
+        Returns:
+            Future[SiteResult] - wait()로 대기
+        """
+        future = self._pool.submit(write_site, job, decisions, self.application)
+        self._futures.append(future)
+        return future
+
+    def wait(self, future: Future, pump: Optional[Callable] = None) -> SiteResult:
+        """
+        근태표 작업 대기 (끝나면 그 근태표의 로그를 출력, pump로 GUI 갱신)
+
+        Raises:
+            RuntimeError: 근태표 처리 실패
+        """
+        while not future.done():
+            wait_futures([future], timeout=0.05)
+            if pump:
+                pump()
+
+        result = future.result()
+        if all(result is not done for done in self.results):
+            self.results.append(result)
+            replay_messages(result.logs, self.logger)
+            if len(self.results) == len(self._futures):
+                self._log_summary()
+
+        if result.error:
+            raise RuntimeError(result.error)
+        return result
+
+    def stop(self, pump: Optional[Callable] = None):
+        """남은 작업을 마치고 프로세스 정리"""
+        if self._pool is None:
+            return
+
+        try:
+            for future in self._futures:
+                try:
+                    self.wait(future, pump)
+                except Exception:
+                    pass  # 실패는 이미 기다린 쪽에서 처리 (여기서는 로그만 출력)
+        finally:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _log_summary(self):
+        """근태표별 시간과 단계별 시간 합계 (모든 근태표가 끝났을 때)"""
+        elapsed = max(r.finished for r in self.results) - min(r.started for r in self.results)
+        self.logger.separator()
+        self.logger.info("근태표 동시 처리: " + ", ".join(
+            f"{result.name} {result.seconds:.2f}초 ({result.sheets}시트, {result.changes}셀)" for result in self.results
+        ) + f" → 전체 {elapsed:.2f}초")
+
+        timings: Dict[str, float] = {}
+        for result in self.results:
+            for name, seconds in result.timings.items():
+                timings[name] = timings.get(name, 0.0) + seconds
+        if timings:
+            self.logger.info("Excel 단계별 시간 합계: " + ", ".join(
+                f"{name} {seconds:.2f}초" for name, seconds in timings.items()
+            ))
@@ -0,0 +1,9 @@
+"""
+테스트 공통 설정 (모듈이 attendance_v3 폴더에 바로 있으므로 import 경로에 추가)
+
+    cd attendance_v3 && python -m pytest -q
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,140 @@
+"""
+출퇴근 큐브 - 이전 근무일 구간 (월요일의 전일, N일 구간), 맵 기반 결정과 같은 결과
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from attendance_cube import AttendanceCube
+from attendance_engine import AttendanceEngine
+from config import COL_NAME, COL_DATE, COL_IN_TIME, COL_OUT_TIME
+from logger import QuietLogger
+from models import AttendanceRecord, WorkPattern
+from shift_policy import ShiftPolicyResolver
+
+FRIDAY = date(2025, 10, 31)
+SATURDAY = date(2025, 11, 1)
+MONDAY = date(2025, 11, 3)
+
+
+def _pattern(first: date, last: date) -> WorkPattern:
+    days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+    return WorkPattern(
+        work_days=[d for d in days if d.weekday() < 5],
+        holidays=[],
+        weekends=[d for d in days if d.weekday() >= 5],
+        avg_attendance=1.0,
+        threshold=0.3,
+    )
+
+
+def _history(rows) -> pd.DataFrame:
+    frame = pd.DataFrame(rows, columns=[COL_NAME, COL_DATE, COL_IN_TIME, COL_OUT_TIME])
+    for col in (COL_DATE, COL_IN_TIME, COL_OUT_TIME):
+        frame[col] = pd.to_datetime(frame[col])
+    return frame
+
+
+def _engine(pattern: WorkPattern, base_date: date) -> AttendanceEngine:
+    policies = ShiftPolicyResolver(by_name={}, by_dept={}, default="flexible")
+    return AttendanceEngine(pattern, QuietLogger(), base_date, night_cutoff_hour=12, policies=policies)
+
+
+def test_monday_previous_day_is_friday():
+    """토요일 특근 기록이 있어도 월요일의 전일 기록은 금요일 (LOOKBACK_WORKDAYS=1 기본)"""
+    cube = AttendanceCube.from_history(_history([
+        ("홍길동", "2025-10-31", "2025-10-31 08:00", "2025-10-31 17:00"),
+        ("홍길동", "2025-11-01", "2025-11-01 09:00", "2025-11-01 12:00"),
+        ("홍길동", "2025-11-03", "2025-11-03 08:00", None),
+    ]))
+    pattern = _pattern(FRIDAY, MONDAY)
+
+    assert cube.window(MONDAY, pattern, 1) == [cube.day_index(FRIDAY)]
+    assert cube.window(MONDAY, pattern, 1, include_off_days=True) == [
+        cube.day_index(date(2025, 11, 2)), cube.day_index(SATURDAY), cube.day_index(FRIDAY),
+    ]
+
+    decision = _engine(pattern, MONDAY).decide_cube(cube).get("홍길동")
+    assert decision.pattern == "today_checkin_with_prev_checkout"
+    assert (decision.check_in, decision.check_out, decision.base_date) == ("08:00", "17:00", FRIDAY)
+
+
+def _day_map(history: pd.DataFrame, day: date) -> dict:
+    """이력 → 날짜별 맵 (DataAnalyzer.create_maps와 같은 모양)"""
+    rows = history[history[COL_DATE].dt.date == day]
+    return {
+        row[COL_NAME]: AttendanceRecord(
+            name=row[COL_NAME],
+            date=day,
+            check_in=None if pd.isna(row[COL_IN_TIME]) else row[COL_IN_TIME].to_pydatetime(),
+            check_out=None if pd.isna(row[COL_OUT_TIME]) else row[COL_OUT_TIME].to_pydatetime(),
+        )
+        for _, row in rows.iterrows()
+    }
+
+
+def test_decide_cube_matches_decide_all_and_decide_times():
+    """같은 이력에서 큐브 일괄 결정 = 맵 일괄 결정 = 한 명씩 결정"""
+    tuesday, wednesday = date(2025, 11, 4), date(2025, 11, 5)
+    history = _history([
+        ("주간", "2025-11-04", "2025-11-04 08:00", "2025-11-04 17:00"),
+        ("주간", "2025-11-05", "2025-11-05 08:10", "2025-11-05 17:30"),
+        ("야간", "2025-11-04", "2025-11-04 22:00", None),
+        ("야간", "2025-11-05", None, "2025-11-05 06:00"),
+        ("출근만", "2025-11-05", "2025-11-05 09:00", None),
+        ("퇴근만", "2025-11-05", None, "2025-11-05 18:00"),
+        ("전일만", "2025-11-04", "2025-11-04 08:00", "2025-11-04 17:00"),
+        ("야간연속", "2025-11-04", "2025-11-04 22:00", "2025-11-04 06:00"),
+        ("야간연속", "2025-11-05", "2025-11-05 21:50", "2025-11-05 06:05"),
+    ])
+    pattern = _pattern(date(2025, 11, 3), wednesday)
+    engine = _engine(pattern, wednesday)
+
+    today_map = _day_map(history, wednesday)
+    yesterday_map = engine.build_previous_map([_day_map(history, tuesday)])
+
+    by_cube = engine.decide_cube(AttendanceCube.from_history(history))
+    by_map = engine.decide_all(today_map, yesterday_map)
+
+    names = sorted(set(history[COL_NAME]))
+    assert sorted(by_cube.batch.names) == sorted(by_map.batch.names) == names
+
+    def fields(result):
+        return result.check_in, result.check_out, result.base_date, result.pattern
+
+    for name in names:
+        expected = fields(engine.decide_times(name, today_map, yesterday_map))
+        assert fields(by_cube.get(name)) == fields(by_map.get(name)) == expected, name
+
+
+def test_multi_day_lookback_matches_previous_map():
+    """이전 근무일 3일 구간: 가장 가까운 기록 우선, 퇴근만 있으면 더 이전의 짝 출근 (build_previous_map과 같은 규칙)"""
+    thursday = date(2025, 11, 6)
+    history = _history([
+        ("휴가후", "2025-11-03", "2025-11-03 08:00", "2025-11-03 17:00"),
+        ("휴가후", "2025-11-06", "2025-11-06 08:00", None),
+        ("야간", "2025-11-03", "2025-11-03 22:00", None),
+        ("야간", "2025-11-04", None, "2025-11-04 06:00"),
+        ("가까운", "2025-11-04", "2025-11-04 07:00", "2025-11-04 16:00"),
+        ("가까운", "2025-11-05", "2025-11-05 09:00", "2025-11-05 18:00"),
+        ("가까운", "2025-11-06", "2025-11-06 09:00", "2025-11-06 18:00"),
+    ])
+    cube = AttendanceCube.from_history(history)
+    engine = _engine(_pattern(MONDAY, thursday), thursday)
+
+    window = [_day_map(history, date(2025, 11, day)) for day in (5, 4, 3)]
+    previous = engine.build_previous_map(window)
+    names = ["휴가후", "야간", "가까운"]
+
+    by_cube = engine.gather_cube(cube, thursday, names, workdays=3)
+    by_map = engine.gather(names, _day_map(history, thursday), previous)
+    for key in ("cin_yest", "cout_yest", "yest_date", "cin_today", "cout_today"):
+        np.testing.assert_array_equal(by_cube[key], by_map[key], err_msg=key)
+
+    assert list(by_cube["yest_date"]) == list(np.array(["2025-11-03", "2025-11-03", "2025-11-05"], dtype="datetime64[D]"))
+    assert by_cube["cin_yest"][1] == np.datetime64("2025-11-03T22:00")
+
+    # 1일 구간(기본)이면 수요일 기록만 - 휴가후/야간은 전일 기록 없음
+    nearest = engine.gather_cube(cube, thursday, names, workdays=1)
+    assert list(np.isnat(nearest["yest_date"])) == [True, True, False]
@@ -0,0 +1,80 @@
+"""
+개인별 기준선 - 자정 전후 출퇴근은 가까운 시각으로 (원형 중앙값/거리), 이전 날짜 재실행
+"""
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from baseline import PunchBaseline, _RollingStats
+from config import COL_NAME, COL_DATE, COL_IN_TIME, COL_OUT_TIME
+from logger import QuietLogger
+
+# 23:40 ~ 00:20 사이 출근 (자정 걸침)
+AROUND_MIDNIGHT = [23 * 60 + 40, 23 * 60 + 50, 23 * 60 + 55, 0, 5, 10, 20, 23 * 60 + 45, 15, 23 * 60 + 58, 2, 8]
+
+
+def _baseline(tmp_path, minutes) -> PunchBaseline:
+    baseline = PunchBaseline(QuietLogger(), str(tmp_path / "baseline.json"))
+    for minute in minutes:
+        baseline._get("야간 근무자")["in"].add(minute)
+    return baseline
+
+
+def _at(hour: int, minute: int) -> datetime:
+    return datetime(2025, 11, 5, hour, minute)
+
+
+def test_median_and_mad_wrap_around_midnight():
+    stats = _RollingStats(60, AROUND_MIDNIGHT)
+    assert stats.median() in (0, 1, 2)
+    assert stats.mad() < 15
+
+
+def test_punches_around_midnight_are_not_flagged(tmp_path):
+    baseline = _baseline(tmp_path, AROUND_MIDNIGHT)
+    assert baseline.check("야간근무자", "in", _at(23, 52)) is None
+    assert baseline.check("야간근무자", "in", _at(0, 12)) is None
+
+    usual, deviation = baseline.check("야간근무자", "in", _at(12, 0))
+    assert usual in (0, 1, 2)
+    assert deviation > 700
+
+
+def test_daytime_baseline_is_unchanged(tmp_path):
+    # 08:50 ~ 09:05 출근
+    baseline = _baseline(tmp_path, [530, 535, 538, 540, 542, 545, 537, 539, 543, 541])
+    stats = baseline.stats["야간근무자"]["in"]
+    assert stats.unwrapped() == stats.sorted
+    assert stats.median() == 539.5
+
+    assert baseline.check("야간근무자", "in", _at(9, 5)) is None
+    assert baseline.check("야간근무자", "in", _at(11, 0)) == (539, 120)
+
+
+def test_earlier_base_date_uses_only_earlier_samples(tmp_path):
+    """11월 1~10일 08시대 출근, 11일부터 13시 출근 → 11월 11일 재실행은 10일까지의 기록만으로 판단"""
+    days = [date(2025, 11, 1) + timedelta(days=i) for i in range(30)]
+    history = pd.DataFrame({
+        COL_NAME: "홍길동",
+        COL_DATE: pd.to_datetime(days),
+        COL_IN_TIME: [datetime.combine(day, datetime.min.time()) + timedelta(hours=8 if day.day <= 10 else 13, minutes=day.day % 7) for day in days],
+        COL_OUT_TIME: pd.NaT,
+    })
+    path = str(tmp_path / "baseline.json")
+
+    baseline = PunchBaseline(QuietLogger(), path)
+    baseline.ingest(history, date(2025, 12, 1))
+    baseline.save()
+    assert baseline.check("홍길동", "in", datetime(2025, 11, 11, 8, 30)) is not None
+
+    rerun = PunchBaseline(QuietLogger(), path)
+    rerun.load()
+    assert rerun.ingest(history, date(2025, 11, 11)) == 10
+    assert rerun.check("홍길동", "in", datetime(2025, 11, 11, 8, 30)) is None
+    assert rerun.check("홍길동", "in", datetime(2025, 11, 11, 13, 0)) is not None
+
+    # 재계산한 기준선은 저장하지 않음 (다음 정상 실행은 이어서 반영)
+    rerun.save()
+    stored = PunchBaseline(QuietLogger(), path)
+    stored.load()
+    assert stored.last_date == date(2025, 11, 30)
@@ -0,0 +1,81 @@
+"""
+근태표 변경 계획 - 쓰기 전에 모든 셀 변경 계산, 같은 날짜 다시 실행 (fake_com.FakeExcel)
+"""
+from datetime import date
+
+import numpy as np
+
+from changeset import FORMULA, VALUE
+from excel_com import ExcelSession
+from fake_com import FakeExcel, sample_workbook
+from logger import QuietLogger
+from models import BatchResult, DecisionSet, normalize_name
+from config import YEOJU_BLOCKS, CLEAR_RANGES_YEOJU
+
+PATH = "여주_근태표.xlsx"
+NAMES = [f"직원{i}" for i in range(60)]
+DATES = [date(2025, 11, 5), date(2025, 11, 6)]
+WRITES = ("Copy", "ClearContents", "Formula.set", "Value.set", "Save")
+
+
+def _decisions(*days: date) -> dict:
+    n = len(NAMES)
+    decisions = {}
+    for day in days:
+        batch = BatchResult(
+            names=NAMES,
+            check_in=np.full(n, 8 * 60, dtype=np.int16),
+            check_out=np.full(n, 17 * 60 + 30, dtype=np.int16),
+            base_date=np.full(n, np.datetime64(day), dtype="datetime64[D]"),
+            pattern=np.zeros(n, dtype=np.int8),
+        )
+        decisions[day] = DecisionSet(batch, {normalize_name(name): i for i, name in enumerate(NAMES)}, day)
+    return decisions
+
+
+def _writes(app: FakeExcel) -> int:
+    return sum(app.calls[kind] for kind in WRITES)
+
+
+def _run(app: FakeExcel, apply: bool = True):
+    with ExcelSession(QuietLogger(), application=app) as session, session.open(PATH) as excel:
+        with excel.transaction(), excel.performance():
+            changeset = excel.plan(YEOJU_BLOCKS, CLEAR_RANGES_YEOJU, _decisions(*DATES))
+            writes = _writes(app)
+            if apply:
+                excel.apply(changeset)
+    return changeset, writes
+
+
+def test_plan_computes_changes_without_writing():
+    app = FakeExcel({PATH: sample_workbook(YEOJU_BLOCKS, NAMES)}, coerce=True)
+    changeset, writes = _run(app, apply=False)
+
+    assert writes == 0
+    assert app.calls["Save"] == 0
+
+    # 새 시트는 날짜 순서대로 마지막 시트의 복사본 (앞 날짜의 계획 결과를 이어 씀)
+    assert [(plan.sheet, plan.source) for plan in changeset.plans] == [("25.11.05", "25.11.04"), ("25.11.06", "25.11.05")]
+
+    summary = changeset.summary()
+    assert summary[VALUE] > 0 and summary[FORMULA] > 0
+    assert len(changeset) == sum(summary.values())
+
+    d9 = next(change for change in changeset.plans[0].changes if change.address == "D9")
+    assert (d9.old, d9.new, d9.kind) == ("", "'08:00", VALUE)
+    assert list(changeset.to_frame().columns) == ["파일", "시트", "복사 원본", "셀", "이전 값", "새 값", "종류"]
+
+
+
+def test_unchanged_rerun_plans_nothing_and_skips_save():
+    app = FakeExcel({PATH: sample_workbook(YEOJU_BLOCKS, NAMES)}, coerce=True)
+    _run(app)
+    assert app.calls["Save"] == 1
+    before = _writes(app)
+
+    changeset, _ = _run(app)
+
+    assert len(changeset) == 0
+    assert [(plan.sheet, plan.source) for plan in changeset.plans] == [("25.11.05", None), ("25.11.06", None)]
+    assert _writes(app) == before  # 시트 복사/지우기/쓰기/저장 모두 없음
+    assert app.calls["Save"] == 1
@@ -0,0 +1,107 @@
+"""
+Excel COM 전용 스레드 - 명령 순서, 실패한 워크북 건너뛰기, 재입력 (fake_com.FakeExcel)
+"""
+import os
+from datetime import date
+
+import pytest
+
+from com_worker import ComWorker
+from fake_com import FakeExcel, sample_workbook
+from logger import QuietLogger
+from main import AttendanceProcessor
+from config import YEOJU_BLOCKS, SMC_BLOCKS
+
+PATH = "여주_근태표.xlsx"
+NAMES = [f"직원{i}" for i in range(60)]
+BASE_DATE = date(2025, 11, 4)
+
+
+def _saved_sheet(app: FakeExcel, name: str = "25.11.04"):
+    return next(workbook for path, workbook in app.files.items() if path.endswith(PATH)).sheet(name)
+
+
+def test_correct_runs_on_worker_and_saves_once():
+    app = FakeExcel({PATH: sample_workbook(YEOJU_BLOCKS, NAMES)})
+    corrections = {BASE_DATE: {"직원3": ("직원3", "07:50", "18:10"), "없는사람": ("없는사람", "09:00", "")}}
+
+    with ComWorker(QuietLogger(), application=app) as worker:
+        book = worker.open(PATH)
+        worker.performance(book)
+        filled = worker.correct(book, YEOJU_BLOCKS, corrections, {})
+        saved = worker.commit(book)
+        worker.close(book)
+
+        assert worker.wait(filled) == 2
+        assert worker.wait(saved) is True
+
+    assert [name for name, _ in worker.history] == ["start", "open", "performance", "correct", "commit", "close"]
+    assert app.calls["Save"] == 1
+    sheet = _saved_sheet(app)
+    assert (sheet.value("K9"), sheet.value("L9")) == ("07:50", "18:10")  # 직원3 = 개발팀 첫 줄
+    assert app.ScreenUpdating is True and app.Calculation == -4105
+
+
+def test_failed_site_cancels_other_commits():
+    """한 근태표가 실패하면 다른 근태표도 저장하지 않고 닫음 (근태표별 저장 여부를 예외 메시지로)"""
+    app = FakeExcel({PATH: sample_workbook(YEOJU_BLOCKS, NAMES)})
+    processor = AttendanceProcessor()
+    processor.logger = QuietLogger()
+    corrections = {BASE_DATE: {"직원3": ("직원3", "07:50", "18:10")}}
+
+    with ComWorker(processor.logger, application=app) as worker:
+        books = {"여주": worker.open(PATH), "SMC": worker.open("없는_근태표.xlsx")}
+        processor._retry_file(worker, books["여주"], "여주", YEOJU_BLOCKS, corrections)
+        processor._retry_file(worker, books["SMC"], "SMC", SMC_BLOCKS, corrections)
+
+        with pytest.raises(RuntimeError) as error:
+            processor._finish_files(worker, processor._commit_files(worker, books))
+
+    assert "여주: 저장 안 함" in str(error.value) and "SMC: 저장 안 함" in str(error.value)
+    assert app.calls["Save"] == 0
+    assert _saved_sheet(app).value("K9") is None
+    assert [name for name, path in worker.history if path.endswith(PATH)] == [
+        "open", "performance", "correct", "commit", "close",
+    ]
+
+
+def test_commands_run_in_order_and_failed_workbook_is_skipped():
+    """실패한 워크북의 이후 명령은 실행하지 않지만 close는 실행 (변경 취소 후 닫음), 다른 워크북은 그대로"""
+    other = "SMC_근태표.xlsx"
+    app = FakeExcel({PATH: sample_workbook(YEOJU_BLOCKS, NAMES), other: sample_workbook(SMC_BLOCKS, NAMES)})
+
+    def fail(session, excel):
+        raise ValueError("입력 실패")
+
+    with ComWorker(QuietLogger(), application=app) as worker:
+        book, other_book = worker.open(PATH), worker.open(other)
+        worker.performance(book)
+        worker.copy_sheet(book, "25.11.05")
+        failed = worker.submit("fail", fail, book, workbook=book)
+        cleared = worker.clear(book, ["D9:D11"])
+        saved = worker.commit(book)
+        closed = worker.close(book)
+        worker.copy_sheet(other_book, "25.11.05")
+        other_saved = worker.commit(other_book)
+        worker.close(other_book)
+
+        with pytest.raises(ValueError):
+            worker.wait(failed)
+        for future in (cleared, saved):
+            with pytest.raises(RuntimeError, match="앞 명령이 실패해서"):
+                worker.wait(future)
+        assert worker.wait(closed) is None
+        assert worker.wait(other_saved) is True
+
+    assert worker.history == [
+        ("start", ""),
+        ("open", PATH), ("open", other),
+        ("performance", os.path.abspath(PATH)), ("copy_sheet", os.path.abspath(PATH)), ("fail", os.path.abspath(PATH)),
+        ("close", os.path.abspath(PATH)),
+        ("copy_sheet", os.path.abspath(other)), ("commit", os.path.abspath(other)), ("close", os.path.abspath(other)),
+    ]
+    assert app.calls["Save"] == 1
+    assert [sheet.Name for sheet in app.files[os.path.abspath(PATH)].sheets] == ["25.11.04"]
+    assert [sheet.Name for sheet in app.files[os.path.abspath(other)].sheets] == ["25.11.04", "25.11.05"]
+    assert app.calls["Close"] == 2
+    assert app.ScreenUpdating is True and app.Calculation == -4105
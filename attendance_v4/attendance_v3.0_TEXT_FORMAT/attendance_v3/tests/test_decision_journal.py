@@ -0,0 +1,46 @@
+"""
+결정 기록 - 근무 형태(부서별 설정)를 기록해서 다시 실행해도 차이가 없는지
+"""
+from datetime import date, datetime
+
+from attendance_engine import AttendanceEngine
+from decision_journal import DecisionJournal
+from logger import QuietLogger
+from models import AttendanceRecord
+from shift_policy import ShiftPolicyResolver
+
+TODAY = date(2025, 11, 5)
+YESTERDAY = date(2025, 11, 4)
+
+
+def _maps():
+    """14시 출근만 있는 직원 (유연: 야간 / 주간 고정: 주간) + 전일 퇴근"""
+    names = ["야간1", "야간2", "주간1", "주간2"]
+    today = {name: AttendanceRecord(name, TODAY, check_in=datetime(2025, 11, 5, 14, 0)) for name in names}
+    yesterday = {name: AttendanceRecord(name, YESTERDAY, check_out=datetime(2025, 11, 4, 23, 0)) for name in names}
+    return today, yesterday
+
+
+def _production_engine() -> AttendanceEngine:
+    """운영 실행처럼 부서별 설정이 반영된 엔진 (생산팀은 주간 고정)"""
+    policies = ShiftPolicyResolver(
+        by_name={}, by_dept={"생산팀": "day"}, default="flexible",
+        departments={"주간1": "생산팀", "주간2": "생산팀"},
+    )
+    return AttendanceEngine(None, QuietLogger(), TODAY, policies=policies)
+
+
+def _default_engine() -> AttendanceEngine:
+    """다시 실행 (부서 정보 없이 기본 설정만)"""
+    return AttendanceEngine(None, QuietLogger(), TODAY, policies=ShiftPolicyResolver(by_name={}, by_dept={}, default="flexible"))
+
+
+def test_replay_uses_recorded_policy(tmp_path):
+    journal = DecisionJournal(QuietLogger(), str(tmp_path / "journal.bin"))
+    decisions = _production_engine().decide_all(*_maps())
+    assert decisions.get("주간1").pattern == "today_checkin_with_prev_checkout"
+    assert decisions.get("야간1").pattern == "night_shift"
+    journal.append(decisions)
+
+    assert journal.replay(TODAY, TODAY, _default_engine()).empty
+
@@ -0,0 +1,188 @@
+"""
+출퇴근 결정표 ↔ 원래 분기 로직 동치 확인
+
+_branchy_decide는 결정표(decision_table.RULES) 이전의 AttendanceEngine.decide_times를 그대로 옮긴 것.
+    - 64가지 조건 비트 전부: 분기 로직의 선택(패턴/출처)과 결정표 칸이 같은지
+    - 무작위 맵(고정 시드): 근무표 유무 × 주간/야간 출근에서 엔진 결과가 분기 로직과 같은지
+"""
+import random
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from attendance_engine import AttendanceEngine
+from decision_table import (
+    SRC_NONE, SRC_TODAY_IN, SRC_TODAY_OUT, SRC_YEST_IN, SRC_YEST_OUT,
+    DATE_NONE, DATE_TODAY, DATE_YEST, DATE_YEST_OUT,
+    TABLE_PATTERN, TABLE_IN, TABLE_OUT, TABLE_DATE, pack_mask,
+)
+from logger import QuietLogger
+from models import AttendanceRecord, PATTERNS
+from roster import ShiftRoster
+from shift_policy import ShiftPolicyResolver
+from config import ROSTER_COL_NAME, ROSTER_COL_DATE, ROSTER_COL_START, ROSTER_COL_END
+
+SEED = 20251105
+TODAY = date(2025, 11, 5)
+YESTERDAY = date(2025, 11, 4)
+
+
+def _branchy_choice(in_t, out_t, night_t, in_y, out_y, night_y):
+    """원래 분기 로직의 선택 (패턴, 출근 출처, 퇴근 출처, 날짜 출처) - 조건 비트로"""
+    if in_t and out_t:
+        return "today_complete", SRC_TODAY_IN, SRC_TODAY_OUT, DATE_TODAY
+    if in_t and not out_t:
+        if not night_t:
+            if out_y:
+                return "today_checkin_with_prev_checkout", SRC_TODAY_IN, SRC_YEST_OUT, DATE_YEST_OUT
+            return "today_checkin_only", SRC_TODAY_IN, SRC_NONE, DATE_TODAY
+        if out_y:
+            return "night_shift", SRC_TODAY_IN, SRC_YEST_OUT, DATE_YEST_OUT
+        return "night_shift_no_checkout", SRC_TODAY_IN, SRC_NONE, DATE_TODAY
+    if not in_t and out_t:
+        if in_y:
+            return "prev_night_shift", SRC_YEST_IN, SRC_TODAY_OUT, DATE_YEST
+        return "checkout_only", SRC_NONE, SRC_TODAY_OUT, DATE_TODAY
+    if in_y and out_y:
+        if night_y:
+            return "prev_night_shift_complete", SRC_YEST_IN, SRC_YEST_OUT, DATE_YEST_OUT
+        return "absent_with_prev_checkout", SRC_NONE, SRC_YEST_OUT, DATE_YEST_OUT
+    if in_y and not out_y:
+        return "prev_checkin_only_no_data", SRC_NONE, SRC_NONE, DATE_NONE
+    return "no_data", SRC_NONE, SRC_NONE, DATE_NONE
+
+
+def _branchy_decide(name, today_map, yesterday_map, roster=None):
+    """원래 decide_times (근무표 → 12시 기준 야간 판단) → (출근, 퇴근, 기준 날짜, 패턴)"""
+    def is_night(check_in):
+        if roster:
+            night = roster.is_night_shift(name, check_in)
+            if night is not None:
+                return night
+        return check_in.hour >= 12
+
+    key = name.replace(" ", "").lower()
+    today = next((v for k, v in today_map.items() if k.replace(" ", "").lower() == key), None)
+    yesterday = next((v for k, v in yesterday_map.items() if k.replace(" ", "").lower() == key), None)
+
+    cin_today = today.check_in if today else None
+    cout_today = today.check_out if today else None
+    cin_yest = yesterday.check_in if yesterday else None
+    cout_yest = yesterday.check_out if yesterday else None
+    dout_yest = cout_yest.date() if cout_yest else (yesterday.date if yesterday else None)
+
+    hm = lambda t: t.strftime("%H:%M") if t else ""
+
+    if cin_today and cout_today:
+        return hm(cin_today), hm(cout_today), today.date, "today_complete"
+    if cin_today and not cout_today:
+        if not is_night(cin_today):
+            if cout_yest:
+                return hm(cin_today), hm(cout_yest), dout_yest, "today_checkin_with_prev_checkout"
+            return hm(cin_today), "", today.date, "today_checkin_only"
+        if cout_yest:
+            return hm(cin_today), hm(cout_yest), dout_yest, "night_shift"
+        return hm(cin_today), "", today.date, "night_shift_no_checkout"
+    if not cin_today and cout_today:
+        if cin_yest:
+            return hm(cin_yest), hm(cout_today), yesterday.date, "prev_night_shift"
+        return "", hm(cout_today), today.date, "checkout_only"
+    if cin_yest and cout_yest:
+        if is_night(cin_yest):
+            return hm(cin_yest), hm(cout_yest), dout_yest, "prev_night_shift_complete"
+        return "", hm(cout_yest), dout_yest, "absent_with_prev_checkout"
+    if cin_yest and not cout_yest:
+        return "", "", None, "prev_checkin_only_no_data"
+    return "", "", None, "no_data"
+
+
+@pytest.mark.parametrize("index", range(64))
+def test_table_matches_branches_for_every_mask(index):
+    bits = [bool(index >> shift & 1) for shift in range(5, -1, -1)]
+    assert int(pack_mask(*bits)) == index
+
+    pattern, src_in, src_out, src_date = _branchy_choice(*bits)
+    assert PATTERNS[TABLE_PATTERN[index]] == pattern
+    assert (TABLE_IN[index], TABLE_OUT[index], TABLE_DATE[index]) == (src_in, src_out, src_date)
+
+
+def _random_time(rng: random.Random, day: date, night: bool) -> datetime:
+    hour = rng.randrange(12, 24) if night else rng.randrange(0, 12)
+    return datetime.combine(day, datetime.min.time()) + timedelta(hours=hour, minutes=rng.randrange(60))
+
+
+def _random_record(rng: random.Random, name: str, day: date):
+    """출근/퇴근 유무, 주간/야간 출근, 자정 넘긴 퇴근을 골고루"""
+    if rng.random() < 0.15:
+        return None
+    night = rng.random() < 0.5
+    check_in = _random_time(rng, day, night) if rng.random() < 0.7 else None
+    check_out = None
+    if rng.random() < 0.7:
+        check_out = _random_time(rng, day + timedelta(days=1) if night and rng.random() < 0.6 else day, not night)
+    return AttendanceRecord(name=name, date=day, check_in=check_in, check_out=check_out)
+
+
+def _random_roster(rng: random.Random, names) -> ShiftRoster:
+    """절반의 직원에게 주간(08~17)/오후(14~22)/야간(22~06) 예정 근무"""
+    shifts = [("08:00", "17:00"), ("14:00", "22:00"), ("22:00", "06:00")]
+    rows = []
+    for name in names:
+        if rng.random() < 0.5:
+            continue
+        for day in (YESTERDAY, TODAY):
+            start, end = rng.choice(shifts)
+            rows.append({ROSTER_COL_NAME: name, ROSTER_COL_DATE: day, ROSTER_COL_START: start, ROSTER_COL_END: end})
+    return ShiftRoster(ShiftRoster._build_index(pd.DataFrame(rows)))
+
+
+def _engine(roster=None) -> AttendanceEngine:
+    """원래 로직과 같은 야간 판단 (근무표 → 12시 이후 출근) - 설정 파일과 무관하게 고정"""
+    policies = ShiftPolicyResolver(by_name={}, by_dept={}, default="flexible")
+    return AttendanceEngine(None, QuietLogger(), TODAY, roster=roster, night_cutoff_hour=12, policies=policies)
+
+
+@pytest.mark.parametrize("with_roster", [False, True])
+def test_engine_matches_branches_on_random_maps(with_roster):
+    rng = random.Random(SEED + with_roster)
+    cases = 0
+
+    for _ in range(30):
+        names = [f"직원 {i}" if i % 3 == 0 else f"직원{i}" for i in range(300)]
+        today_map = {}
+        yesterday_map = {}
+        for name in names:
+            record = _random_record(rng, name, TODAY)
+            if record:
+                today_map[name] = record
+            record = _random_record(rng, name.replace(" ", ""), YESTERDAY)
+            if record:
+                yesterday_map[record.name] = record
+
+        roster = _random_roster(rng, names) if with_roster else None
+        decisions = _engine(roster).decide_all(today_map, yesterday_map)
+
+        for name in names:
+            result = decisions.get(name)
+            if result is None:
+                continue
+            expected = _branchy_decide(name, today_map, yesterday_map, roster)
+            assert (result.check_in, result.check_out, result.base_date, result.pattern) == expected, name
+            cases += 1
+
+    assert cases > 8000
+
+
+def test_decide_times_matches_branches():
+    rng = random.Random(SEED)
+    names = [f"직원{i}" for i in range(200)]
+    today_map = {name: r for name in names if (r := _random_record(rng, name, TODAY))}
+    yesterday_map = {name: r for name in names if (r := _random_record(rng, name, YESTERDAY))}
+    roster = _random_roster(rng, names)
+    engine = _engine(roster)
+
+    for name in names:
+        result = engine.decide_times(name, today_map, yesterday_map)
+        expected = _branchy_decide(name, today_map, yesterday_map, roster)
+        assert (result.check_in, result.check_out, result.base_date, result.pattern) == expected, name
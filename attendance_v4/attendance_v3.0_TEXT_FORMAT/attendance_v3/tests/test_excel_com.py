@@ -0,0 +1,119 @@
+"""
+Excel COM 핸들러 - 속도 설정 되돌리기, 한 번 저장/변경 취소, Excel 공유 (fake_com.FakeExcel)
+"""
+import pytest
+
+from excel_com import ExcelSession, PerformanceMode
+from fake_com import FakeExcel, FakeWorkbook
+from logger import QuietLogger
+
+XL_CALCULATION_SEMIAUTOMATIC = 2
+PATH = "여주_근태표.xlsx"
+
+
+def _settings(app: FakeExcel) -> dict:
+    return {key: getattr(app, key) for key in PerformanceMode.SETTINGS}
+
+
+def _app(files: dict = None) -> FakeExcel:
+    app = FakeExcel(files)
+    app.Calculation = XL_CALCULATION_SEMIAUTOMATIC  # 기본값이 아니어도 원래 값으로 되돌리는지
+    return app
+
+
+def test_performance_mode_restores_every_setting():
+    app = _app()
+    before = _settings(app)
+    sheet = FakeWorkbook({"25.11.04": {}}).sheets[0]
+    sheet.workbook.attach(app, "근태표.xlsx")
+
+    with PerformanceMode(app, QuietLogger()) as perf:
+        assert _settings(app) == PerformanceMode.SETTINGS
+        perf.touch(sheet)
+        perf.touch(sheet)
+
+    assert _settings(app) == before
+    assert app.calls["Calculate"] == 1  # 바뀐 시트만 한 번
+
+
+def test_performance_mode_restores_on_exception():
+    app = _app()
+    before = _settings(app)
+    sheet = FakeWorkbook({"25.11.04": {}}).sheets[0]
+    sheet.workbook.attach(app, "근태표.xlsx")
+
+    with pytest.raises(ValueError):
+        with PerformanceMode(app, QuietLogger()) as perf:
+            perf.touch(sheet)
+            raise ValueError("입력 실패")
+
+    assert _settings(app) == before
+    assert app.calls["Calculate"] == 0  # 실패하면 계산 없이 설정만 되돌림
+
+
+def _saved(app: FakeExcel) -> FakeWorkbook:
+    return next(workbook for path, workbook in app.files.items() if path.endswith(PATH))
+
+
+def test_transaction_saves_once():
+    app = FakeExcel({PATH: FakeWorkbook({"25.11.04": {"D9": "08:00", "F10": "메모"}})})
+
+    with ExcelSession(QuietLogger(), application=app) as session, session.open(PATH) as excel:
+        with excel.transaction(), excel.performance():
+            excel.prepare_sheet("25.11.05", ["D9:D11"])
+            assert app.calls["Save"] == 0  # 복사/지우기 뒤에 저장하지 않음
+
+    assert app.calls["Save"] == 1
+    assert [sheet.Name for sheet in _saved(app).sheets] == ["25.11.04", "25.11.05"]
+    assert _saved(app).sheet("25.11.05").value("D9") is None
+
+
+def test_transaction_rollback_leaves_file_unchanged():
+    app = _app({PATH: FakeWorkbook({"25.11.04": {"D9": "08:00"}})})
+    before = _settings(app)
+
+    with ExcelSession(QuietLogger(), application=app) as session:
+        with pytest.raises(RuntimeError):
+            with session.open(PATH) as excel, excel.transaction(), excel.performance():
+                excel.prepare_sheet("25.11.05", ["D9:D11"])
+                raise RuntimeError("입력 실패")
+
+        assert excel.rolled_back and excel.workbook is None
+        with pytest.raises(RuntimeError):
+            excel.save()  # 취소한 워크북은 저장 불가
+
+    assert app.calls["Save"] == 0
+    assert [sheet.Name for sheet in _saved(app).sheets] == ["25.11.04"]
+    assert _saved(app).sheet("25.11.04").value("D9") == "08:00"
+    assert _settings(app) == before
+
+
+def test_commit_skips_save_without_changes():
+    app = FakeExcel({PATH: FakeWorkbook({"25.11.05": {}})})
+
+    with ExcelSession(QuietLogger(), application=app) as session, session.open(PATH) as excel:
+        with excel.transaction():
+            excel.copy_sheet("25.11.05")  # 이미 있는 시트 - 변경 없음
+
+    assert not excel.dirty
+    assert app.calls["Save"] == 0
+
+
+def test_session_shares_one_application():
+    other = "SMC_근태표.xlsx"
+    app = FakeExcel({PATH: FakeWorkbook({"25.11.04": {}}), other: FakeWorkbook({"25.11.04": {}})})
+
+    with ExcelSession(QuietLogger(), application=app) as session:
+        with session.open(PATH) as first:
+            assert first.excel is app
+        assert app.calls["Quit"] == 0  # 워크북만 닫힘
+
+        second = session.open(other)
+        assert second.excel is app and second.session is session
+        assert session.workbooks == [second.workbook]
+
+    # 남은 워크북은 세션이 닫을 때 저장하지 않고 닫고, Excel은 한 번만 종료
+    assert app.calls["Workbooks.Open"] == 2
+    assert app.calls["Close"] == 2 and app.calls["Save"] == 0
+    assert app.calls["Quit"] == 1
+    assert session.workbooks == []
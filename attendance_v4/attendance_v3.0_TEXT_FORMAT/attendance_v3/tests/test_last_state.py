@@ -0,0 +1,93 @@
+"""
+마지막 실행 상태 - 이전 근무일 구간 보충 (간격 1~7일), 오래된 상태, 원시 데이터와 다른 상태
+"""
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from config import COL_NAME, COL_DATE, COL_IN_TIME, COL_OUT_TIME
+from last_state import LastStateStore
+from logger import BufferedLogger, LogLevel
+from models import WorkPattern
+
+STATE_DATE = date(2025, 11, 4)
+STATE_ROWS = [
+    ("주간", "2025-11-03", "2025-11-03 08:00", "2025-11-03 17:00"),
+    ("주간", "2025-11-04", "2025-11-04 08:05", "2025-11-04 17:10"),
+    ("야간", "2025-11-04", "2025-11-04 22:00", None),  # 다음 날 퇴근 - 열린 야간 근무
+]
+
+
+def _history(rows) -> pd.DataFrame:
+    frame = pd.DataFrame(rows, columns=[COL_NAME, COL_DATE, COL_IN_TIME, COL_OUT_TIME])
+    for col in (COL_DATE, COL_IN_TIME, COL_OUT_TIME):
+        frame[col] = pd.to_datetime(frame[col])
+    return frame
+
+
+def _store(tmp_path, logger=None) -> LastStateStore:
+    """지난 실행(기준 날짜 11/4, 이전 근무일 2일)의 상태를 저장했다가 다시 불러온 저장소"""
+    days = [date(2025, 11, 3), STATE_DATE]
+    pattern = WorkPattern(work_days=days, holidays=[], weekends=[], avg_attendance=2.0, threshold=0.6)
+
+    previous = LastStateStore(BufferedLogger(), str(tmp_path / "state.json"))
+    previous.update(_history(STATE_ROWS), pattern, STATE_DATE, workdays=2)
+    previous.save()
+
+    store = LastStateStore(logger or BufferedLogger(), previous.path)
+    store.load()
+    return store
+
+
+def _today(day: date) -> pd.DataFrame:
+    """이번 실행의 원시 데이터 (기준 날짜 하루만)"""
+    text = day.isoformat()
+    return _history([
+        ("주간", text, f"{text} 08:00", f"{text} 17:00"),
+        ("야간", text, None, f"{text} 06:00"),
+    ])
+
+
+@pytest.mark.parametrize("gap", range(1, LastStateStore.MAX_GAP_DAYS + 1))
+def test_fill_history_adds_state_rows_within_gap(tmp_path, gap):
+    store = _store(tmp_path)
+    assert store.base_date == STATE_DATE and store.open_night_shifts() == 1
+
+    history = _today(STATE_DATE + timedelta(days=gap))
+    filled = store.fill_history(history, STATE_DATE + timedelta(days=gap))
+
+    assert len(filled) == len(history) + len(STATE_ROWS)
+    assert list(filled[COL_DATE]) == sorted(filled[COL_DATE])
+    night = filled[(filled[COL_NAME] == "야간") & (filled[COL_DATE] == pd.Timestamp(STATE_DATE))]
+    assert list(night[COL_IN_TIME]) == [pd.Timestamp("2025-11-04 22:00")]
+
+
+@pytest.mark.parametrize("gap", [0, -1, LastStateStore.MAX_GAP_DAYS + 1, 30])
+def test_fill_history_ignores_stale_or_future_state(tmp_path, gap):
+    store = _store(tmp_path)
+    history = _today(STATE_DATE + timedelta(days=gap))
+
+    assert store.fill_history(history, STATE_DATE + timedelta(days=gap)) is history
+
+
+def test_fill_history_adds_only_days_missing_from_raw_data(tmp_path):
+    """원시 데이터에 같은 날짜가 있고 내용도 같으면 없는 날짜만 보충"""
+    store = _store(tmp_path)
+    history = pd.concat([_history(STATE_ROWS[1:]), _today(date(2025, 11, 5))], ignore_index=True)
+
+    filled = store.fill_history(history, date(2025, 11, 5))
+
+    assert len(filled) == len(history) + 1
+    assert set(filled[COL_DATE].dt.date) == {date(2025, 11, 3), STATE_DATE, date(2025, 11, 5)}
+
+
+def test_fill_history_rejects_state_that_differs_from_raw_data(tmp_path):
+    """원시 데이터가 수정되었으면 (겹치는 날짜의 출퇴근이 다름) 상태를 쓰지 않음"""
+    logger = BufferedLogger()
+    store = _store(tmp_path, logger)
+    edited = [STATE_ROWS[1], ("야간", "2025-11-04", "2025-11-04 21:30", None)]
+    history = pd.concat([_history(edited), _today(date(2025, 11, 5))], ignore_index=True)
+
+    assert store.fill_history(history, date(2025, 11, 5)) is history
+    assert any(level == LogLevel.WARNING and "다릅니다" in message for level, message in logger.drain())
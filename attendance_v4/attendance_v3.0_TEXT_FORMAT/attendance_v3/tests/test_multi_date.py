@@ -0,0 +1,68 @@
+"""
+여러 기준 날짜 일괄 처리 - 공유 메모리 작업 프로세스 결과 = 한 프로세스 결과
+"""
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from attendance_cube import AttendanceCube
+from config import COL_NAME, COL_DATE, COL_IN_TIME, COL_OUT_TIME
+from logger import QuietLogger
+from models import WorkPattern
+from multi_date import MultiDateProcessor
+from shift_policy import ShiftPolicyResolver
+
+FIRST = date(2025, 11, 3)
+DAYS = [FIRST + timedelta(days=i) for i in range(14)]
+
+
+def _history() -> pd.DataFrame:
+    """주간/야간/결근이 섞인 2주 이력 (고정 시드)"""
+    rng = np.random.default_rng(7)
+    rows = []
+    for i in range(30):
+        name = f"직원{i}"
+        night = i % 5 == 0
+        for day in DAYS:
+            if day.weekday() >= 5 or rng.random() < 0.1:
+                continue
+            start = datetime.combine(day, datetime.min.time()) + timedelta(
+                hours=22 if night else 8, minutes=int(rng.integers(-20, 20))
+            )
+            end = start + timedelta(hours=8, minutes=int(rng.integers(0, 60)))
+            if night:
+                rows.append((name, day, start, None))
+                rows.append((name, end.date(), None, end))
+            else:
+                rows.append((name, day, start, None if rng.random() < 0.1 else end))
+
+    frame = pd.DataFrame(rows, columns=[COL_NAME, COL_DATE, COL_IN_TIME, COL_OUT_TIME])
+    for col in (COL_DATE, COL_IN_TIME, COL_OUT_TIME):
+        frame[col] = pd.to_datetime(frame[col])
+    return frame
+
+
+def test_shared_cube_workers_match_single_process():
+    cube = AttendanceCube.from_history(_history())
+    pattern = WorkPattern(
+        work_days=[d for d in DAYS if d.weekday() < 5],
+        holidays=[],
+        weekends=[d for d in DAYS if d.weekday() >= 5],
+        avg_attendance=27.0,
+        threshold=8.1,
+    )
+    policies = ShiftPolicyResolver(by_name={}, by_dept={}, default="flexible")
+    base_dates = [d for d in DAYS[1:] if d.weekday() < 5]
+
+    serial = MultiDateProcessor(QuietLogger(), workers=1).decide(cube, pattern, base_dates, policies=policies)
+    parallel = MultiDateProcessor(QuietLogger(), workers=2).decide(cube, pattern, base_dates, policies=policies)
+
+    assert list(serial) == list(parallel) == base_dates
+    for day in base_dates:
+        expected, actual = serial[day].batch, parallel[day].batch
+        assert len(expected.names) > 0
+        assert list(actual.names) == list(expected.names), day
+        for key in ("check_in", "check_out", "base_date", "pattern"):
+            np.testing.assert_array_equal(getattr(actual, key), getattr(expected, key), err_msg=f"{day} {key}")
+        assert parallel[day].base_date == day
@@ -0,0 +1,34 @@
+"""
+근무표 - 시작/종료 시각을 읽을 수 없는 줄은 24시간 근무가 아니라 제외 + 경고
+"""
+from datetime import datetime
+
+from logger import BufferedLogger, LogLevel
+from roster import ShiftRoster
+from config import ROSTER_COL_NAME, ROSTER_COL_DATE, ROSTER_COL_START, ROSTER_COL_END
+
+
+def test_unreadable_times_are_skipped_with_warning(tmp_path):
+    path = tmp_path / "roster.csv"
+    path.write_text(
+        f"{ROSTER_COL_NAME},{ROSTER_COL_DATE},{ROSTER_COL_START},{ROSTER_COL_END}\n"
+        "홍길동,2025-11-05,22:00,06:00\n"
+        "김철수,2025-11-05,,17:00\n"
+        "이영희,2025-11-05,오전,17:00\n"
+        "박민수,2025-11-05,08:00,25:30\n"
+        "최지우,2025-11-05,08:00,17:00\n",
+        encoding="utf-8",
+    )
+    logger = BufferedLogger()
+    roster = ShiftRoster.load(str(path), logger, cache_path=str(tmp_path / "roster.cache"))
+
+    assert sorted(roster.index) == ["최지우", "홍길동"]
+    assert roster.is_night_shift("홍길동", datetime(2025, 11, 5, 21, 50)) is True
+    assert roster.is_night_shift("최지우", datetime(2025, 11, 5, 8, 0)) is False
+    assert roster.find_shift("김철수", datetime(2025, 11, 5, 12, 0)) is None
+
+    warnings = [message for level, message in logger.drain() if level == LogLevel.WARNING]
+    assert len(warnings) == 3
+    assert "3행" in warnings[0] and "김철수" in warnings[0]
+    assert "4행" in warnings[1] and "이영희" in warnings[1]
+    assert "5행" in warnings[2] and "박민수" in warnings[2]
@@ -0,0 +1,154 @@
+"""
+근태표 블록 쓰기 - 합친 사각형 안팎의 블록 밖 셀 보존 (fake_com.FakeExcel(coerce=True)로 Excel의 텍스트 변환 흉내)
+"""
+from datetime import date
+
+import numpy as np
+
+from fake_com import FakeExcel, sample_workbook
+from excel_com import ExcelSession
+from logger import QuietLogger
+from models import BatchResult, DecisionSet, normalize_name
+from sheet_layout import BlockLayout, area_address, parse_area
+from config import YEOJU_BLOCKS, CLEAR_RANGES_YEOJU
+
+PATH = "여주_근태표.xlsx"
+NAMES = [f"직원{i}" for i in range(60)]
+BASE_DATE = date(2025, 11, 5)
+
+# 블록 밖 텍스트 셀 (숫자/시간/날짜처럼 보임) - D13, K19, E27은 합친 쓰기 사각형 안 (블록 사이 행)
+OUTSIDE_TEXT = {"F10": "08:30", "D13": "1-2", "H20": "001", "M9": "17:45", "K19": "12:00", "E27": "0930"}
+# 합친 쓰기 사각형 안의 숫자/수식 셀
+OUTSIDE_VALUES = {"E13": 42, "L20": 0.5}
+OUTSIDE_FORMULAS = {"D14": "=E13*2"}
+
+
+def _decisions() -> dict:
+    n = len(NAMES)
+    batch = BatchResult(
+        names=NAMES,
+        check_in=np.full(n, 8 * 60, dtype=np.int16),
+        check_out=np.full(n, 17 * 60 + 30, dtype=np.int16),
+        base_date=np.full(n, np.datetime64(BASE_DATE), dtype="datetime64[D]"),
+        pattern=np.zeros(n, dtype=np.int8),
+    )
+    return {BASE_DATE: DecisionSet(batch, {normalize_name(name): i for i, name in enumerate(NAMES)}, BASE_DATE)}
+
+
+def _workbook(merged=()):
+    workbook = sample_workbook(YEOJU_BLOCKS, NAMES)
+    sheet = workbook.sheets[0]
+    for address, value in {**OUTSIDE_TEXT, **OUTSIDE_VALUES}.items():
+        sheet.cells[parse_area(address)[:2]] = value
+    for address, formula in OUTSIDE_FORMULAS.items():
+        sheet.formulas[parse_area(address)[:2]] = formula
+    sheet.merged = [parse_area(address) for address in merged]
+    return workbook
+
+
+def _assert_outside_kept(sheet):
+    for address, value in {**OUTSIDE_TEXT, **OUTSIDE_VALUES}.items():
+        assert sheet.value(address) == value, address
+    for address, formula in OUTSIDE_FORMULAS.items():
+        assert sheet.formula(address) == formula, address
+
+
+def _assert_targets_written(sheet):
+    layout = BlockLayout(YEOJU_BLOCKS)
+    for row, _, in_col, out_col in layout.slots:
+        assert sheet.cells[(row, in_col)] == "08:00"
+        assert sheet.cells[(row, out_col)] == "17:30"
+
+
+def _run(app: FakeExcel):
+    with ExcelSession(QuietLogger(), application=app) as session, session.open(PATH) as excel:
+        with excel.transaction(), excel.performance():
+            return excel.apply(excel.plan(YEOJU_BLOCKS, CLEAR_RANGES_YEOJU, _decisions()))
+
+
+def _saved_sheet(app: FakeExcel, name: str):
+    return next(workbook for path, workbook in app.files.items() if path.endswith(PATH)).sheet(name)
+
+
+def test_default_layout_merges_block_columns():
+    assert [area_address(area) for area in BlockLayout(YEOJU_BLOCKS).write_areas] == ["D9:E29", "K9:L30", "R9:S22", "Y9:Z23"]
+
+    layout = BlockLayout(YEOJU_BLOCKS, merge_gap=0)
+    covered = {
+        (r, c) for r1, c1, r2, c2 in layout.write_areas
+        for r in range(r1, r2 + 1) for c in range(c1, c2 + 1)
+    }
+    assert covered == layout.targets
+
+
+def test_apply_keeps_cells_outside_blocks():
+    app = FakeExcel({PATH: _workbook()}, coerce=True)
+    assert _run(app) > 0
+
+    sheet = _saved_sheet(app, "25.11.05")
+    _assert_outside_kept(sheet)
+
+    # 출퇴근은 텍스트 그대로 ("'HH:MM"), 기준일은 Excel 날짜
+    _assert_targets_written(sheet)
+    assert sheet.value("A3") == (BASE_DATE - date(1899, 12, 30)).days
+
+    # 블록 쓰기는 블록 열마다 1회 (여주 4개) + 블록 밖 참조 셀
+    assert app.calls["Formula.set"] <= 4 + 2
+
+
+def test_rerun_writes_nothing():
+    app = FakeExcel({PATH: _workbook()}, coerce=True)
+    _run(app)
+    saves = app.calls["Save"]
+    writes = app.calls["Formula.set"] + app.calls["Value.set"] + app.calls["ClearContents"]
+
+    assert _run(app) == 0
+    assert app.calls["Save"] == saves
+    assert app.calls["Formula.set"] + app.calls["Value.set"] + app.calls["ClearContents"] == writes
+
+
+def test_merged_cells_fall_back_to_changed_cells():
+    """병합 셀(C13:D13)이 쓰기 사각형 D9:E29에 일부만 걸치면 그 사각형은 바뀐 셀만 씀"""
+    app = FakeExcel({PATH: _workbook(merged=["C13:D13"])}, coerce=True)
+    assert _run(app) > 0
+
+    sheet = _saved_sheet(app, "25.11.05")
+    _assert_outside_kept(sheet)
+    _assert_targets_written(sheet)
+
+
+def test_layout_write_keeps_passthrough_text():
+    """한 사각형(D9:Z30)으로 합쳐도 사이 셀 텍스트/값/수식은 그대로 (재입력 경로: layout.read/write)"""
+    app = FakeExcel({PATH: _workbook()}, coerce=True)
+    layout = BlockLayout(YEOJU_BLOCKS, merge_gap=5)
+    assert [area_address(area) for area in layout.write_areas] == ["D9:Z30"]
+
+    with ExcelSession(QuietLogger(), application=app) as session, session.open(PATH) as excel:
+        excel.sheet = excel.workbook.Worksheets(1)
+        grid = layout.read(excel.sheet)
+        row, _, in_col, _ = layout.slots[0]
+        grid.set(row, in_col, "'09:00")
+        assert layout.write(excel.sheet, grid) == 1
+        _assert_outside_kept(excel.sheet)
+        assert excel.sheet.cells[(row, in_col)] == "09:00"
+
+
+def test_layout_reads_and_writes_blocks_in_bulk():
+    """블록 전체를 Range 하나로 읽고 (Formula + Value 1회씩), 바뀐 쓰기 사각형만 Range.Formula 1회씩 씀"""
+    app = FakeExcel({PATH: _workbook()}, coerce=True)
+    layout = BlockLayout(YEOJU_BLOCKS)
+
+    with ExcelSession(QuietLogger(), application=app) as session, session.open(PATH) as excel:
+        sheet = excel.workbook.Worksheets(1)
+        app.calls.clear()
+        grid = layout.read(sheet)
+        assert (app.calls["Range"], app.calls["Formula.get"], app.calls["Value.get"]) == (1, 1, 1)
+
+        # 둘째 블록(K9:L30)만 바꾸면 그 사각형만
+        changed = [(row, in_col) for row, _, in_col, _ in layout.slots if in_col == 11]
+        for row, col in changed:
+            grid.set(row, col, "'09:00")
+        app.calls.clear()
+        assert layout.write(sheet, grid) == 1
+        assert dict(app.calls) == {"Range": 1, "Formula.set": 1}
+        assert all(sheet.cells[cell] == "09:00" for cell in changed)
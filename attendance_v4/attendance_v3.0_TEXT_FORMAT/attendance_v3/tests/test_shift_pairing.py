@@ -0,0 +1,23 @@
+"""
+출퇴근 페어링 - 띄어쓰기/대소문자만 다른 이름은 같은 사람 (AttendanceCube와 같은 정규화)
+"""
+import pandas as pd
+
+from config import COL_NAME, COL_DATE, COL_IN_TIME, COL_OUT_TIME
+from logger import QuietLogger
+from shift_pairing import ShiftPairer
+
+
+def test_names_are_paired_by_normalized_key():
+    history = pd.DataFrame({
+        COL_NAME: ["홍 길동", "홍길동", "Kim", "kim "],
+        COL_DATE: pd.to_datetime(["2025-11-04", "2025-11-05", "2025-11-04", "2025-11-04"]),
+        COL_IN_TIME: pd.to_datetime(["2025-11-04 22:00", None, "2025-11-04 08:00", None]),
+        COL_OUT_TIME: pd.to_datetime([None, "2025-11-05 06:00", None, "2025-11-04 17:00"]),
+    })
+
+    shifts = ShiftPairer(QuietLogger()).pair(history)
+
+    assert list(shifts[COL_NAME]) == ["Kim", "홍 길동"]
+    assert shifts[COL_IN_TIME].notna().all() and shifts[COL_OUT_TIME].notna().all()
+    assert list(shifts[COL_OUT_TIME]) == list(pd.to_datetime(["2025-11-04 17:00", "2025-11-05 06:00"]))
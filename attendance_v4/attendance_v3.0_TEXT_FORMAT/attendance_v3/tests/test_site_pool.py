@@ -0,0 +1,58 @@
+"""
+근태표 동시 처리 - 작업 프로세스 로그 합치기, 실패 보고 (fake_com.FakeExcel을 작업 프로세스로 넘김)
+"""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from fake_com import FakeExcel, sample_workbook
+from logger import BufferedLogger
+from models import BatchResult, DecisionSet, normalize_name
+from site_pool import SiteJob, SitePool
+from config import YEOJU_BLOCKS, CLEAR_RANGES_YEOJU, SMC_BLOCKS, CLEAR_RANGES_SMC
+
+PATH = "여주_근태표.xlsx"
+NAMES = [f"직원{i}" for i in range(60)]
+BASE_DATE = date(2025, 11, 5)
+
+
+def _decisions() -> dict:
+    n = len(NAMES)
+    batch = BatchResult(
+        names=NAMES,
+        check_in=np.full(n, 8 * 60, dtype=np.int16),
+        check_out=np.full(n, 17 * 60 + 30, dtype=np.int16),
+        base_date=np.full(n, np.datetime64(BASE_DATE), dtype="datetime64[D]"),
+        pattern=np.zeros(n, dtype=np.int8),
+    )
+    return {BASE_DATE: DecisionSet(batch, {normalize_name(name): i for i, name in enumerate(NAMES)}, BASE_DATE)}
+
+
+def test_site_logs_are_merged_and_failure_is_reported():
+    logger = BufferedLogger()
+    app = FakeExcel({PATH: sample_workbook(YEOJU_BLOCKS, NAMES)}, coerce=True)
+    jobs = [
+        SiteJob("여주", PATH, YEOJU_BLOCKS, CLEAR_RANGES_YEOJU),
+        SiteJob("SMC", "없는_근태표.xlsx", SMC_BLOCKS, CLEAR_RANGES_SMC),
+    ]
+
+    pool = SitePool(logger, len(jobs), application=app).start()
+    try:
+        yeoju, smc = [pool.submit(job, _decisions()) for job in jobs]
+
+        result = pool.wait(yeoju)
+        assert result.error is None and result.saved and result.changes > 0
+        with pytest.raises(RuntimeError, match="없는_근태표"):
+            pool.wait(smc)
+        assert pool.results[1].saved is False
+    finally:
+        pool.stop()
+
+    messages = [message for _, message in logger.drain()]
+    # 작업 프로세스 로그는 근태표 순서대로 한 묶음씩, 모두 끝나면 합친 통계
+    assert messages.index("[여주 근태표 처리]") < messages.index("[SMC 근태표 처리]")
+    assert any(message.startswith("변경 적용 완료") for message in messages[:messages.index("[SMC 근태표 처리]")])
+    assert messages[-2].startswith("근태표 동시 처리: 여주") and "SMC" in messages[-2]
+    assert messages[-1].startswith("Excel 단계별 시간 합계")
+
@@ -0,0 +1,43 @@
+"""
+근태 자동 입력 v3.0 - 시간 표시
+하루 1,440분의 "HH:MM" 문자열을 미리 만들어 두고 분(0~1439)으로 조회 (strftime 호출 없음)
+"""
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+MINUTES_PER_DAY = 24 * 60
+NO_MINUTE = -1  # 시간 없음
+
+# 분 → "HH:MM"
+MINUTE_STRINGS = tuple(f"{m // 60:02d}:{m % 60:02d}" for m in range(MINUTES_PER_DAY))
+
+# 분 → "'HH:MM" (Excel에 텍스트 형식으로 강제 입력)
+MINUTE_TEXTS = tuple("'" + s for s in MINUTE_STRINGS)
+
+# 배열 조회용 (마지막 칸이 빈 문자열이라 NO_MINUTE(-1) 인덱스가 그대로 "")
+MINUTE_STRING_ARRAY = np.array(MINUTE_STRINGS + ("",), dtype=object)
+MINUTE_TEXT_ARRAY = np.array(MINUTE_TEXTS + ("",), dtype=object)
+
+
+def minute_of_day(value: Optional[datetime]) -> int:
+    """datetime → 분 (None은 NO_MINUTE)"""
+    if value is None:
+        return NO_MINUTE
+    return value.hour * 60 + value.minute
+
+
+def format_minute(minute: int) -> str:
+    """분 → "HH:MM" (없으면 빈 문자열)"""
+    return MINUTE_STRING_ARRAY[minute]
+
+
+def format_text(minute: int) -> str:
+    """분 → "'HH:MM" (없으면 빈 문자열)"""
+    return MINUTE_TEXT_ARRAY[minute]
+
+
+def format_time(value: Optional[datetime]) -> str:
+    """datetime → "HH:MM" (None은 빈 문자열)"""
+    return MINUTE_STRING_ARRAY[minute_of_day(value)]
@@ -0,0 +1,155 @@
+"""
+근태 자동 입력 v3.0 - 근무시간 집계
+페어링된 근무 기록으로 근무/야간/연장 시간(분)을 NumPy로 일괄 계산하고
+월별·부서별로 집계
+"""
+import numpy as np
+import pandas as pd
+from config import (
+    COL_DATE, COL_NAME, COL_DEPT, COL_IN_TIME, COL_OUT_TIME,
+    REGULAR_WORK_MINUTES, NIGHT_START_HOUR, NIGHT_END_HOUR,
+)
+
+# 집계 컬럼
+COL_WORK_MIN = '근무분'
+COL_NIGHT_MIN = '야간분'
+COL_OVERTIME_MIN = '연장분'
+COL_MONTH = '월'
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class WorkHoursCalculator:
+    """근무시간 계산기"""
+
+    def __init__(self, logger):
+        """
+        초기화
+
+        Args:
+            logger: 로거
+        """
+        self.logger = logger
+
+    def compute_daily(self, shifts: pd.DataFrame, history: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        (직원, 근무일)별 근무/야간/연장 시간
+
+        Args:
+            shifts: ShiftPairer.pair() 결과
+            history: 정규화된 이력 (부서 컬럼이 있으면 부서 정보 사용)
+
+        Returns:
+            DataFrame[이름, 부서, 근무일자, 근무분, 야간분, 연장분]
+        """
+        complete = shifts[shifts[COL_IN_TIME].notna() & shifts[COL_OUT_TIME].notna()]
+
+        # 분 단위 정수 (epoch 기준, 자정 정렬)
+        cin = self._to_minutes(complete[COL_IN_TIME])
+        cout = self._to_minutes(complete[COL_OUT_TIME])
+
+        worked = cout - cin
+        night = self._night_minutes_until(cout) - self._night_minutes_until(cin)
+
+        # (직원, 근무일) 정수 키 - 같은 날 여러 번 근무하면 합산
+        codes, names = pd.factorize(complete[COL_NAME])
+        days = complete[COL_DATE].to_numpy(dtype='datetime64[D]').astype(np.int64)
+        first_day = days.min() if len(days) else 0
+        span = days.max() - first_day + 1 if len(days) else 1
+        keys, inverse = np.unique(codes * span + (days - first_day), return_inverse=True)
+
+        worked = np.bincount(inverse, weights=worked, minlength=len(keys)).astype(np.int64)
+        night = np.bincount(inverse, weights=night, minlength=len(keys)).astype(np.int64)
+        key_codes, key_days = np.divmod(keys, span)
+
+        daily = pd.DataFrame({
+            COL_NAME: pd.Categorical.from_codes(key_codes, names),
+            COL_DATE: (key_days + first_day).astype('datetime64[D]').astype('datetime64[ns]'),
+            COL_WORK_MIN: worked,
+            COL_NIGHT_MIN: night,
+            COL_OVERTIME_MIN: np.maximum(worked - REGULAR_WORK_MINUTES, 0),
+        })
+
+        departments = pd.Series(names).map(self._departments(history)).fillna('미지정')
+        daily[COL_DEPT] = pd.Categorical(departments.to_numpy()[key_codes])
+
+        return daily[[COL_NAME, COL_DEPT, COL_DATE, COL_WORK_MIN, COL_NIGHT_MIN, COL_OVERTIME_MIN]]
+
+    def aggregate_monthly(self, daily: pd.DataFrame) -> pd.DataFrame:
+        """
+        월별·부서별 집계
+
+        Args:
+            daily: compute_daily() 결과
+
+        Returns:
+            DataFrame[월, 부서, 인원, 근무일수, 근무분, 야간분, 연장분]
+        """
+        # 월 단위 절삭 후 집계 (문자열 변환은 집계된 행에만)
+        monthly = daily.assign(**{COL_MONTH: daily[COL_DATE].to_numpy(dtype='datetime64[M]')})
+
+        monthly = (
+            monthly.groupby([COL_MONTH, COL_DEPT], observed=True)
+            .agg(**{
+                '인원': (COL_NAME, 'nunique'),
+                '근무일수': (COL_DATE, 'size'),
+                COL_WORK_MIN: (COL_WORK_MIN, 'sum'),
+                COL_NIGHT_MIN: (COL_NIGHT_MIN, 'sum'),
+                COL_OVERTIME_MIN: (COL_OVERTIME_MIN, 'sum'),
+            })
+            .reset_index()
+        )
+        monthly[COL_MONTH] = monthly[COL_MONTH].dt.strftime('%Y-%m')
+
+        return monthly
+
+    def save(self, daily: pd.DataFrame, monthly: pd.DataFrame, file_path: str):
+        """
+        집계 결과를 Excel 파일로 저장 (일별/월별 시트)
+
+        Args:
+            daily: compute_daily() 결과
+            monthly: aggregate_monthly() 결과
+            file_path: 저장 경로
+        """
+        try:
+            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+                out = daily.assign(**{COL_DATE: daily[COL_DATE].dt.strftime('%Y-%m-%d')})
+                out.to_excel(writer, sheet_name='일별', index=False)
+                monthly.to_excel(writer, sheet_name='월별', index=False)
+
+            self.logger.info(f"근무시간 집계 파일 생성: {file_path}")
+
+        except Exception as e:
+            self.logger.error(f"근무시간 집계 파일 생성 실패: {str(e)}")
+
+    @staticmethod
+    def _to_minutes(values: pd.Series) -> np.ndarray:
+        """datetime64 → epoch 기준 분 (int64)"""
+        return values.to_numpy(dtype='datetime64[m]').astype(np.int64)
+
+    @staticmethod
+    def _night_minutes_until(minutes: np.ndarray) -> np.ndarray:
+        """
+        epoch부터 해당 시각까지의 누적 야간 분
+
+        하루의 야간 구간은 [0시, NIGHT_END_HOUR) + [NIGHT_START_HOUR, 24시).
+        두 시각의 누적값 차이가 그 사이의 야간 근무 분이다.
+        """
+        days, minute_of_day = np.divmod(minutes, MINUTES_PER_DAY)
+        night_start = NIGHT_START_HOUR * 60
+        night_end = NIGHT_END_HOUR * 60
+        per_day = night_end + (MINUTES_PER_DAY - night_start)
+
+        return (
+            days * per_day
+            + np.minimum(minute_of_day, night_end)
+            + np.maximum(minute_of_day - night_start, 0)
+        )
+
+    @staticmethod
+    def _departments(history: pd.DataFrame) -> dict:
+        """이름 → 부서 (마지막 기록 기준)"""
+        if history is None or COL_DEPT not in history.columns:
+            return {}
+        return history.dropna(subset=[COL_DEPT]).groupby(COL_NAME)[COL_DEPT].last().to_dict()